@@ -1,10 +1,12 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useMemo, useRef } from 'react'
+import dynamic from 'next/dynamic'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs'
 import { Badge } from '@/components/ui/badge.jsx'
+import { Checkbox } from '@/components/ui/checkbox'
 import { 
   Building2, 
   FileText, 
@@ -20,16 +22,76 @@ import {
   Phone,
   Mail
 } from 'lucide-react'
-import CompanyModal from '@/components/CompanyModal'
-import QuoteModal from '@/components/QuoteModal'
-import PurchaseOrderModal from '@/components/PurchaseOrderModal'
-import PDFGenerator from '@/components/PDFGenerator'
+import VirtualList from '@/components/VirtualList'
+import { useChangeFeed } from '@/hooks/use-change-feed'
+import { formatMoney } from '@/lib/money'
+
+// The modals and the PDF preview, with the form controls only they use, are
+// split out of the dashboard bundle and fetched the first time one opens.
+// Hovering or focusing a button that opens one starts the fetch early.
+const lazyModules = {
+  company: () => import('@/components/CompanyModal'),
+  quote: () => import('@/components/QuoteModal'),
+  purchaseOrder: () => import('@/components/PurchaseOrderModal'),
+  pdf: () => import('@/components/PDFGenerator')
+}
+
+const CompanyModal = dynamic(lazyModules.company, { ssr: false })
+const QuoteModal = dynamic(lazyModules.quote, { ssr: false })
+const PurchaseOrderModal = dynamic(lazyModules.purchaseOrder, { ssr: false })
+const PDFGenerator = dynamic(lazyModules.pdf, { ssr: false })
+
+const prefetch = (name) => ({ onMouseEnter: lazyModules[name], onFocus: lazyModules[name] })
+
+const emptyPage = { data: [], nextCursor: null }
+
+const TABLES = { companies: 'companies', quotes: 'quotes', 'purchase-orders': 'purchase_orders' }
+
+// Query parameters of each list's pages; the companies list also feeds the
+// modals' company pickers, so it loads in large pages
+const LIST_PARAMS = {
+  companies: { limit: '500', withCounts: 'true' },
+  quotes: {},
+  'purchase-orders': {}
+}
+
+const listUrl = (type, cursor) => {
+  const params = new URLSearchParams(LIST_PARAMS[type])
+  if (cursor) params.set('after', cursor)
+  return `/api/${type}?${params}`
+}
+
+// Typical row heights of the virtualized lists, in px; rows are measured
+// once rendered, so wrapped content makes its row taller
+const DOCUMENT_ROW_HEIGHT = 152
+const COMPANY_ROW_HEIGHT = 272
+
+// Apply one change to a list: inserts go first (lists are newest first),
+// updates merge into a loaded row and deletes drop it
+const patchRows = (rows, { op, id, row }) => {
+  const index = rows.findIndex(item => item.id === id)
+  if (op === 'delete') return index === -1 ? rows : rows.filter(item => item.id !== id)
+  if (index === -1) return op === 'insert' ? [row, ...rows] : rows
+  const next = [...rows]
+  next[index] = { ...rows[index], ...row }
+  return next
+}
+
+// The company fields a quote or purchase order row embeds
+const companyRef = (company) => {
+  return company ? { id: company.id, name: company.name, logoHash: company.logoHash, logoUrl: company.logoUrl } : null
+}
 
 export default function App() {
   const [companies, setCompanies] = useState([])
   const [quotes, setQuotes] = useState([])
   const [purchaseOrders, setPurchaseOrders] = useState([])
+  const [cursors, setCursors] = useState({ companies: null, quotes: null, 'purchase-orders': null })
+  const [loadingMore, setLoadingMore] = useState({ companies: false, quotes: false, 'purchase-orders': false })
   const [loading, setLoading] = useState(true)
+  const [listsLoading, setListsLoading] = useState(true)
+  const [summary, setSummary] = useState(null)
+  const [selected, setSelected] = useState({ quotes: [], 'purchase-orders': [] })
   
   // Modals state
   const [companyModal, setCompanyModal] = useState({ open: false, data: null })
@@ -37,49 +99,153 @@ export default function App() {
   const [poModal, setPOModal] = useState({ open: false, data: null })
   const [pdfModal, setPdfModal] = useState({ open: false, data: null, type: null })
 
+  const companiesRef = useRef(companies)
+  companiesRef.current = companies
+  const summaryTimer = useRef(null)
+  const pendingPages = useRef(new Set())
+  const setters = { companies: setCompanies, quotes: setQuotes, 'purchase-orders': setPurchaseOrders }
+
   useEffect(() => {
     fetchData()
   }, [])
 
+  // Other tabs' and users' writes arrive as row-level changes
+  useChangeFeed(change => applyChange(change), () => fetchData())
+
+  // First paint waits only for the small summary request; lists fill in after
   const fetchData = async () => {
+    await Promise.all([
+      fetchSummary().finally(() => setLoading(false)),
+      fetchLists()
+    ])
+  }
+
+  const fetchSummary = async () => {
     try {
-      setLoading(true)
+      const response = await fetch('/api/dashboard/summary')
+      if (response.ok) setSummary(await response.json())
+    } catch (error) {
+      console.error('Dashboard summary failed:', error)
+    }
+  }
+
+  const fetchLists = async () => {
+    try {
+      setListsLoading(true)
       console.log('Fetching data from APIs...')
       
       // Try to fetch with error handling for each API
       const [companiesRes, quotesRes, poRes] = await Promise.all([
-        fetch('/api/companies').catch(err => {
+        fetch(listUrl('companies')).catch(err => {
           console.error('Companies API failed:', err)
-          return { ok: false, json: () => Promise.resolve([]) }
+          return { ok: false, json: () => Promise.resolve(emptyPage) }
         }),
-        fetch('/api/quotes').catch(err => {
+        fetch(listUrl('quotes')).catch(err => {
           console.error('Quotes API failed:', err)
-          return { ok: false, json: () => Promise.resolve([]) }
+          return { ok: false, json: () => Promise.resolve(emptyPage) }
         }),
-        fetch('/api/purchase-orders').catch(err => {
+        fetch(listUrl('purchase-orders')).catch(err => {
           console.error('Purchase Orders API failed:', err)
-          return { ok: false, json: () => Promise.resolve([]) }
+          return { ok: false, json: () => Promise.resolve(emptyPage) }
         })
       ])
 
-      // Handle successful responses or fallback to empty arrays
-      const companiesData = companiesRes.ok ? await companiesRes.json() : []
-      const quotesData = quotesRes.ok ? await quotesRes.json() : []
-      const poData = poRes.ok ? await poRes.json() : []
+      // Handle successful responses or fallback to empty pages
+      const companiesPage = companiesRes.ok ? await companiesRes.json() : emptyPage
+      const quotesPage = quotesRes.ok ? await quotesRes.json() : emptyPage
+      const poPage = poRes.ok ? await poRes.json() : emptyPage
 
-      console.log('Fetched data:', { companies: companiesData.length, quotes: quotesData.length, pos: poData.length })
+      console.log('Fetched data:', { companies: companiesPage.data.length, quotes: quotesPage.data.length, pos: poPage.data.length })
 
-      setCompanies(companiesData || [])
-      setQuotes(quotesData || [])
-      setPurchaseOrders(poData || [])
+      setCompanies(companiesPage.data || [])
+      setQuotes(quotesPage.data || [])
+      setPurchaseOrders(poPage.data || [])
+      setCursors({
+        companies: companiesPage.nextCursor,
+        quotes: quotesPage.nextCursor,
+        'purchase-orders': poPage.nextCursor
+      })
     } catch (error) {
       console.error('Error fetching data:', error)
       // Set empty arrays as fallback
       setCompanies([])
       setQuotes([])
       setPurchaseOrders([])
+      setCursors({ companies: null, quotes: null, 'purchase-orders': null })
+    } finally {
+      setListsLoading(false)
+    }
+  }
+
+  // A burst of changes refreshes the summary once
+  const scheduleSummary = () => {
+    clearTimeout(summaryTimer.current)
+    summaryTimer.current = setTimeout(fetchSummary, 250)
+  }
+
+  // Patch the lists in place from one change (lib/changes.js). The API
+  // responses to this tab's own writes are applied the same way, so the
+  // feed's copy of them is a no-op.
+  const applyChange = (change) => {
+    const { table, op, id, row } = change
+    if (op === 'reload') return fetchData()
+    scheduleSummary()
+
+    if (table === 'companies') {
+      setCompanies(prev => patchRows(prev, change))
+      if (op === 'delete') {
+        // Their quotes and purchase orders are deleted with them
+        setQuotes(prev => prev.filter(doc => doc.companyId !== id))
+        setPurchaseOrders(prev => prev.filter(doc => doc.companyId !== id))
+      } else if (op === 'update') {
+        const relink = doc => doc.companyId === id ? { ...doc, companies: { ...doc.companies, ...companyRef(row) } } : doc
+        setQuotes(prev => prev.map(relink))
+        setPurchaseOrders(prev => prev.map(relink))
+      }
+      return
+    }
+
+    const linked = row && 'companyId' in row
+      ? { ...row, companies: companyRef(companiesRef.current.find(company => company.id === row.companyId)) }
+      : row
+    const patch = { ...change, row: linked }
+    if (table === 'quotes') {
+      setQuotes(prev => patchRows(prev, patch))
+      if (op === 'delete') setPurchaseOrders(prev => prev.map(po => po.quoteId === id ? { ...po, quoteId: null } : po))
+    } else if (table === 'purchase_orders') {
+      setPurchaseOrders(prev => patchRows(prev, patch))
+    }
+  }
+
+  // Modal saves: the saved row from the API response
+  const saved = (type, editing) => (row) => {
+    applyChange({ table: TABLES[type], op: editing ? 'update' : 'insert', id: row.id, row })
+  }
+
+  // The next page of a list, fetched as its view nears the end of the rows
+  // loaded so far
+  const loadMore = async (type) => {
+    const cursor = cursors[type]
+    if (!cursor || pendingPages.current.has(type)) return
+
+    try {
+      pendingPages.current.add(type)
+      setLoadingMore(prev => ({ ...prev, [type]: true }))
+      const response = await fetch(listUrl(type, cursor))
+      if (!response.ok) return
+
+      const page = await response.json()
+      // Rows the change feed has already added are not repeated
+      setters[type](prev => {
+        const loaded = new Set(prev.map(row => row.id))
+        return [...prev, ...page.data.filter(row => !loaded.has(row.id))]
+      })
+      setCursors(prev => ({ ...prev, [type]: page.nextCursor }))
+    } catch (error) {
+      console.error('Error loading more:', error)
     } finally {
-      setLoading(false)
+      pendingPages.current.delete(type)
+      setLoadingMore(prev => ({ ...prev, [type]: false }))
     }
   }
 
@@ -87,54 +253,328 @@ export default function App() {
     if (!confirm('Are you sure you want to delete this item?')) return
     
     try {
-      await fetch(`/api/${type}/${id}`, { method: 'DELETE' })
-      fetchData()
+      const response = await fetch(`/api/${type}/${id}`, { method: 'DELETE' })
+      if (response.ok) applyChange({ table: TABLES[type], op: 'delete', id })
     } catch (error) {
       console.error('Error deleting:', error)
     }
   }
 
-  const convertToPurchaseOrder = async (quote) => {
-    try {
-      const poData = {
-        companyId: quote.companyId,
-        quoteId: quote.id,
-        poNumber: `PO-${Date.now()}`,
-        quoteNumber: quote.quoteNumber,
-        billTo: quote.billTo,
-        billToAddress: quote.billToAddress,
-        billToContact: quote.billToContact,
-        items: JSON.parse(quote.items || '[]'),
-        subtotal: quote.subtotal,
-        vatRate: quote.vatRate,
-        vatAmount: quote.vatAmount,
-        totalAmount: quote.totalAmount,
-        notes: quote.notes
-      }
+  const toggleSelected = (type, id) => {
+    setSelected(prev => ({
+      ...prev,
+      [type]: prev[type].includes(id) ? prev[type].filter(item => item !== id) : [...prev[type], id]
+    }))
+  }
 
-      await fetch('/api/purchase-orders', {
+  // Apply one batch request to the selected rows of a list
+  const runBatch = async (type, batch) => {
+    try {
+      const response = await fetch(`/api/${type}/batch`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(poData)
+        body: JSON.stringify(batch)
       })
-      
-      fetchData()
+      const result = await response.json()
+      if (result.failed) console.error('Batch failures:', [...result.update, ...result.delete].filter(r => r.status === 'error'))
+      setSelected(prev => ({ ...prev, [type]: [] }))
+
+      const table = TABLES[type]
+      const updates = new Map((batch.update || []).map(update => [update.id, update]))
+      for (const entry of result.update || []) {
+        if (entry.status === 'updated') applyChange({ table, op: 'update', id: entry.id, row: updates.get(entry.id) })
+      }
+      for (const entry of result.delete || []) {
+        if (entry.status === 'deleted') applyChange({ table, op: 'delete', id: entry.id })
+      }
     } catch (error) {
-      console.error('Error converting to PO:', error)
+      console.error('Error running batch:', error)
     }
   }
 
-  const formatCurrency = (amount) => {
-    return new Intl.NumberFormat('en-US', {
-      style: 'currency',
-      currency: 'USD'
-    }).format(amount)
+  const deleteSelected = (type) => {
+    if (!confirm(`Delete ${selected[type].length} selected items?`)) return
+    runBatch(type, { delete: selected[type] })
+  }
+
+  const completeSelectedOrders = () => {
+    runBatch('purchase-orders', { update: selected['purchase-orders'].map(id => ({ id, status: 'completed' })) })
+  }
+
+  // The server copies the quote; converting twice returns the same order
+  const convertToPurchaseOrder = async (quote) => {
+    try {
+      const response = await fetch(`/api/quotes/${quote.id}/convert`, { method: 'POST' })
+      if (!response.ok) return
+
+      const order = await response.json()
+      applyChange({ table: 'purchase_orders', op: 'insert', id: order.id, row: order })
+    } catch (error) {
+      console.error('Error converting to PO:', error)
+    }
   }
 
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString()
   }
 
+  // Per-company counts follow the summary, which is refreshed after changes
+  const companyCounts = useMemo(() => {
+    return new Map((summary?.companies || []).map(company => [company.id, company]))
+  }, [summary])
+
+  const selectedIds = useMemo(() => ({
+    quotes: new Set(selected.quotes),
+    'purchase-orders': new Set(selected['purchase-orders'])
+  }), [selected])
+
+  // Rows of the virtualized lists
+  const renderQuote = (quote) => (
+    <Card className="h-full border border-border hover:shadow-md transition-shadow">
+      <CardContent className="p-6">
+        <div className="flex items-start justify-between">
+          <div className="space-y-3 flex-1">
+            <div className="flex items-center space-x-4">
+              <Checkbox
+                checked={selectedIds.quotes.has(quote.id)}
+                onCheckedChange={() => toggleSelected('quotes', quote.id)}
+                aria-label={`Select quote ${quote.quoteNumber}`}
+              />
+              <Badge variant="outline" className="font-mono">
+                {quote.quoteNumber}
+              </Badge>
+              {quote.poNumber && (
+                <Badge variant="secondary" className="font-mono">
+                  PO: {quote.poNumber}
+                </Badge>
+              )}
+            </div>
+
+            <div className="grid grid-cols-2 gap-4 text-sm">
+              <div className="flex items-center space-x-2">
+                <Building2 className="h-4 w-4 text-muted-foreground" />
+                <span className="text-foreground">{quote.companies?.name || 'No Company'}</span>
+              </div>
+              <div className="flex items-center space-x-2">
+                <Calendar className="h-4 w-4 text-muted-foreground" />
+                <span className="text-foreground">{formatDate(quote.createdAt)}</span>
+              </div>
+            </div>
+
+            <div className="flex items-center space-x-2">
+              <span className="text-sm text-muted-foreground">Bill To:</span>
+              <span className="text-sm font-medium text-foreground">{quote.billTo || 'Not specified'}</span>
+            </div>
+          </div>
+
+          <div className="text-right space-y-3">
+            <div className="space-y-1">
+              <p className="text-2xl font-bold text-primary">
+                {formatMoney(quote.totalAmount)}
+              </p>
+              <p className="text-xs text-muted-foreground">
+                Subtotal: {formatMoney(quote.subtotal)} + VAT ({quote.vatRate}%)
+              </p>
+            </div>
+
+            <div className="flex items-center space-x-2">
+              <Button
+                size="sm"
+                variant="outline"
+                {...prefetch('pdf')}
+                onClick={() => setPdfModal({ open: true, data: quote, type: 'quote' })}
+              >
+                <Download className="h-4 w-4 mr-1" />
+                PDF
+              </Button>
+              <Button
+                size="sm"
+                variant="outline"
+                {...prefetch('quote')}
+                onClick={() => setQuoteModal({ open: true, data: quote })}
+              >
+                <Edit className="h-4 w-4" />
+              </Button>
+              <Button
+                size="sm"
+                variant="outline"
+                onClick={() => convertToPurchaseOrder(quote)}
+              >
+                <ArrowRight className="h-4 w-4 mr-1" />
+                To PO
+              </Button>
+              <Button
+                size="sm"
+                variant="outline"
+                onClick={() => handleDelete('quotes', quote.id)}
+              >
+                <Trash2 className="h-4 w-4" />
+              </Button>
+            </div>
+          </div>
+        </div>
+      </CardContent>
+    </Card>
+  )
+
+  const renderCompany = (company) => (
+    <Card className="h-full border border-border hover:shadow-md transition-shadow">
+      <CardContent className="p-6">
+        <div className="space-y-4">
+          <div className="flex items-start space-x-3">
+            {company.logoUrl ? (
+              <img 
+                src={company.logoUrl} 
+                alt={`${company.name} logo`}
+                className="w-12 h-12 rounded-lg object-cover"
+              />
+            ) : (
+              <div className="w-12 h-12 bg-primary/10 rounded-lg flex items-center justify-center">
+                <Building2 className="h-6 w-6 text-primary" />
+              </div>
+            )}
+            <div className="flex-1 min-w-0">
+              <h3 className="font-semibold text-foreground break-words">{company.name}</h3>
+              <p className="text-xs text-muted-foreground">
+                Created {formatDate(company.createdAt)}
+              </p>
+            </div>
+          </div>
+
+          {company.address && (
+            <p className="text-sm text-muted-foreground line-clamp-2">
+              {company.address}
+            </p>
+          )}
+
+          <div className="space-y-1">
+            {company.phone && (
+              <div className="flex items-center space-x-2 text-sm">
+                <Phone className="h-3 w-3 text-muted-foreground" />
+                <span className="text-foreground">{company.phone}</span>
+              </div>
+            )}
+            {company.email && (
+              <div className="flex items-center space-x-2 text-sm">
+                <Mail className="h-3 w-3 text-muted-foreground" />
+                <span className="text-foreground break-all">{company.email}</span>
+              </div>
+            )}
+          </div>
+
+          <div className="flex items-center justify-between pt-2">
+            <Badge variant="secondary" className="text-xs">
+              {companyCounts.get(company.id)?.quoteCount ?? company.quoteCount ?? 0} Quotes
+            </Badge>
+            <div className="flex space-x-1">
+              <Button
+                size="sm"
+                variant="outline"
+                {...prefetch('company')}
+                onClick={() => setCompanyModal({ open: true, data: company })}
+              >
+                <Edit className="h-3 w-3" />
+              </Button>
+              <Button
+                size="sm"
+                variant="outline"
+                onClick={() => handleDelete('companies', company.id)}
+              >
+                <Trash2 className="h-3 w-3" />
+              </Button>
+            </div>
+          </div>
+        </div>
+      </CardContent>
+    </Card>
+  )
+
+  const renderPurchaseOrder = (po) => (
+    <Card className="h-full border border-border hover:shadow-md transition-shadow">
+      <CardContent className="p-6">
+        <div className="flex items-start justify-between">
+          <div className="space-y-3 flex-1">
+            <div className="flex items-center space-x-4">
+              <Checkbox
+                checked={selectedIds['purchase-orders'].has(po.id)}
+                onCheckedChange={() => toggleSelected('purchase-orders', po.id)}
+                aria-label={`Select purchase order ${po.poNumber}`}
+              />
+              <Badge variant="outline" className="font-mono">
+                {po.poNumber}
+              </Badge>
+              {po.quoteNumber && (
+                <Badge variant="secondary" className="font-mono">
+                  From Quote: {po.quoteNumber}
+                </Badge>
+              )}
+              <Badge 
+                variant={po.status === 'completed' ? 'default' : 'outline'}
+                className="capitalize"
+              >
+                {po.status}
+              </Badge>
+            </div>
+
+            <div className="grid grid-cols-2 gap-4 text-sm">
+              <div className="flex items-center space-x-2">
+                <Building2 className="h-4 w-4 text-muted-foreground" />
+                <span className="text-foreground">{po.companies?.name || 'No Company'}</span>
+              </div>
+              <div className="flex items-center space-x-2">
+                <Calendar className="h-4 w-4 text-muted-foreground" />
+                <span className="text-foreground">{formatDate(po.createdAt)}</span>
+              </div>
+            </div>
+
+            <div className="flex items-center space-x-2">
+              <span className="text-sm text-muted-foreground">Bill To:</span>
+              <span className="text-sm font-medium text-foreground">{po.billTo || 'Not specified'}</span>
+            </div>
+          </div>
+
+          <div className="text-right space-y-3">
+            <div className="space-y-1">
+              <p className="text-2xl font-bold text-primary">
+                {formatMoney(po.totalAmount)}
+              </p>
+              <p className="text-xs text-muted-foreground">
+                Subtotal: {formatMoney(po.subtotal)} + VAT ({po.vatRate}%)
+              </p>
+            </div>
+
+            <div className="flex items-center space-x-2">
+              <Button
+                size="sm"
+                variant="outline"
+                {...prefetch('pdf')}
+                onClick={() => setPdfModal({ open: true, data: po, type: 'purchase-order' })}
+              >
+                <Download className="h-4 w-4 mr-1" />
+                PDF
+              </Button>
+              <Button
+                size="sm"
+                variant="outline"
+                {...prefetch('purchaseOrder')}
+                onClick={() => setPOModal({ open: true, data: po })}
+              >
+                <Edit className="h-4 w-4" />
+              </Button>
+              <Button
+                size="sm"
+                variant="outline"
+                onClick={() => handleDelete('purchase-orders', po.id)}
+              >
+                <Trash2 className="h-4 w-4" />
+              </Button>
+            </div>
+          </div>
+        </div>
+      </CardContent>
+    </Card>
+  )
+
   if (loading) {
     return (
       <div className="min-h-screen bg-background flex items-center justify-center">
@@ -163,13 +603,13 @@ export default function App() {
             </div>
             <div className="flex items-center space-x-2">
               <Badge variant="outline" className="text-xs">
-                {companies.length} Companies
+                {summary ? summary.totals.companies : `${companies.length}${cursors.companies ? '+' : ''}`} Companies
               </Badge>
               <Badge variant="outline" className="text-xs">
-                {quotes.length} Quotes
+                {summary ? summary.totals.quotes : `${quotes.length}${cursors.quotes ? '+' : ''}`} Quotes
               </Badge>
               <Badge variant="outline" className="text-xs">
-                {purchaseOrders.length} Purchase Orders
+                {summary ? summary.totals.purchaseOrders : `${purchaseOrders.length}${cursors['purchase-orders'] ? '+' : ''}`} Purchase Orders
               </Badge>
             </div>
           </div>
@@ -178,6 +618,43 @@ export default function App() {
 
       {/* Main Content */}
       <main className="container mx-auto px-4 py-8">
+        {summary && (
+          <div className="grid gap-4 md:grid-cols-3 mb-6">
+            <Card>
+              <CardContent className="pt-6">
+                <div className="flex items-center space-x-2 text-sm text-muted-foreground">
+                  <DollarSign className="h-4 w-4" />
+                  <span>Quoted</span>
+                </div>
+                <p className="text-2xl font-bold text-foreground">{formatMoney(summary.quotes.totalAmount)}</p>
+                <p className="text-xs text-muted-foreground">VAT {formatMoney(summary.quotes.vatAmount)}</p>
+              </CardContent>
+            </Card>
+            <Card>
+              <CardContent className="pt-6">
+                <div className="flex items-center space-x-2 text-sm text-muted-foreground">
+                  <ShoppingCart className="h-4 w-4" />
+                  <span>Ordered</span>
+                </div>
+                <p className="text-2xl font-bold text-foreground">{formatMoney(summary.purchaseOrders.totalAmount)}</p>
+                <p className="text-xs text-muted-foreground">VAT {formatMoney(summary.purchaseOrders.vatAmount)}</p>
+              </CardContent>
+            </Card>
+            <Card>
+              <CardContent className="pt-6">
+                <div className="text-sm text-muted-foreground mb-2">Purchase orders by status</div>
+                <div className="flex flex-wrap gap-2">
+                  {Object.entries(summary.purchaseOrders.byStatus).map(([status, count]) => (
+                    <Badge key={status} variant="outline" className="text-xs">
+                      {count} {status}
+                    </Badge>
+                  ))}
+                </div>
+              </CardContent>
+            </Card>
+          </div>
+        )}
+
         <Tabs defaultValue="quotes" className="space-y-6">
           <TabsList className="grid w-full grid-cols-3">
             <TabsTrigger value="quotes" className="flex items-center space-x-2">
@@ -199,108 +676,46 @@ export default function App() {
             <Card>
               <CardHeader className="flex flex-row items-center justify-between">
                 <CardTitle className="text-xl">Quotes Management</CardTitle>
-                <Button 
-                  onClick={() => setQuoteModal({ open: true, data: null })}
-                  className="flex items-center space-x-2"
-                >
-                  <Plus className="h-4 w-4" />
-                  <span>Create Quote</span>
-                </Button>
+                <div className="flex items-center space-x-2">
+                  {selected.quotes.length > 0 && (
+                    <Button variant="outline" onClick={() => deleteSelected('quotes')} className="flex items-center space-x-2">
+                      <Trash2 className="h-4 w-4" />
+                      <span>Delete {selected.quotes.length}</span>
+                    </Button>
+                  )}
+                  <Button 
+                    {...prefetch('quote')}
+                    onClick={() => setQuoteModal({ open: true, data: null })}
+                    className="flex items-center space-x-2"
+                  >
+                    <Plus className="h-4 w-4" />
+                    <span>Create Quote</span>
+                  </Button>
+                </div>
               </CardHeader>
               <CardContent>
-                {quotes.length === 0 ? (
+                {listsLoading && quotes.length === 0 ? (
+                  <p className="text-center py-12 text-muted-foreground">Loading quotes...</p>
+                ) : quotes.length === 0 ? (
                   <div className="text-center py-12">
                     <FileText className="h-16 w-16 text-muted-foreground/50 mx-auto mb-4" />
                     <h3 className="text-lg font-medium text-foreground mb-2">No quotes yet</h3>
                     <p className="text-muted-foreground mb-6">Create your first quote to get started</p>
-                    <Button onClick={() => setQuoteModal({ open: true, data: null })}>
+                    <Button {...prefetch('quote')} onClick={() => setQuoteModal({ open: true, data: null })}>
                       <Plus className="h-4 w-4 mr-2" />
                       Create Quote
                     </Button>
                   </div>
                 ) : (
-                  <div className="grid gap-4">
-                    {quotes.map((quote) => (
-                      <Card key={quote.id} className="border border-border hover:shadow-md transition-shadow">
-                        <CardContent className="p-6">
-                          <div className="flex items-start justify-between">
-                            <div className="space-y-3 flex-1">
-                              <div className="flex items-center space-x-4">
-                                <Badge variant="outline" className="font-mono">
-                                  {quote.quoteNumber}
-                                </Badge>
-                                {quote.poNumber && (
-                                  <Badge variant="secondary" className="font-mono">
-                                    PO: {quote.poNumber}
-                                  </Badge>
-                                )}
-                              </div>
-                              
-                              <div className="grid grid-cols-2 gap-4 text-sm">
-                                <div className="flex items-center space-x-2">
-                                  <Building2 className="h-4 w-4 text-muted-foreground" />
-                                  <span className="text-foreground">{quote.companies?.name || 'No Company'}</span>
-                                </div>
-                                <div className="flex items-center space-x-2">
-                                  <Calendar className="h-4 w-4 text-muted-foreground" />
-                                  <span className="text-foreground">{formatDate(quote.createdAt)}</span>
-                                </div>
-                              </div>
-
-                              <div className="flex items-center space-x-2">
-                                <span className="text-sm text-muted-foreground">Bill To:</span>
-                                <span className="text-sm font-medium text-foreground">{quote.billTo || 'Not specified'}</span>
-                              </div>
-                            </div>
-
-                            <div className="text-right space-y-3">
-                              <div className="space-y-1">
-                                <p className="text-2xl font-bold text-primary">
-                                  {formatCurrency(quote.totalAmount)}
-                                </p>
-                                <p className="text-xs text-muted-foreground">
-                                  Subtotal: {formatCurrency(quote.subtotal)} + VAT ({quote.vatRate}%)
-                                </p>
-                              </div>
-
-                              <div className="flex items-center space-x-2">
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => setPdfModal({ open: true, data: quote, type: 'quote' })}
-                                >
-                                  <Download className="h-4 w-4 mr-1" />
-                                  PDF
-                                </Button>
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => setQuoteModal({ open: true, data: quote })}
-                                >
-                                  <Edit className="h-4 w-4" />
-                                </Button>
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => convertToPurchaseOrder(quote)}
-                                >
-                                  <ArrowRight className="h-4 w-4 mr-1" />
-                                  To PO
-                                </Button>
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => handleDelete('quotes', quote.id)}
-                                >
-                                  <Trash2 className="h-4 w-4" />
-                                </Button>
-                              </div>
-                            </div>
-                          </div>
-                        </CardContent>
-                      </Card>
-                    ))}
-                  </div>
+                  <VirtualList
+                    name="quotes"
+                    items={quotes}
+                    estimatedRowHeight={DOCUMENT_ROW_HEIGHT}
+                    renderItem={renderQuote}
+                    hasMore={Boolean(cursors.quotes)}
+                    loading={loadingMore.quotes}
+                    onEndReached={() => loadMore('quotes')}
+                  />
                 )}
               </CardContent>
             </Card>
@@ -312,6 +727,7 @@ export default function App() {
               <CardHeader className="flex flex-row items-center justify-between">
                 <CardTitle className="text-xl">Companies Management</CardTitle>
                 <Button 
+                  {...prefetch('company')}
                   onClick={() => setCompanyModal({ open: true, data: null })}
                   className="flex items-center space-x-2"
                 >
@@ -320,89 +736,29 @@ export default function App() {
                 </Button>
               </CardHeader>
               <CardContent>
-                {companies.length === 0 ? (
+                {listsLoading && companies.length === 0 ? (
+                  <p className="text-center py-12 text-muted-foreground">Loading companies...</p>
+                ) : companies.length === 0 ? (
                   <div className="text-center py-12">
                     <Building2 className="h-16 w-16 text-muted-foreground/50 mx-auto mb-4" />
                     <h3 className="text-lg font-medium text-foreground mb-2">No companies yet</h3>
                     <p className="text-muted-foreground mb-6">Add your first company to start creating quotes</p>
-                    <Button onClick={() => setCompanyModal({ open: true, data: null })}>
+                    <Button {...prefetch('company')} onClick={() => setCompanyModal({ open: true, data: null })}>
                       <Plus className="h-4 w-4 mr-2" />
                       Add Company
                     </Button>
                   </div>
                 ) : (
-                  <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-3">
-                    {companies.map((company) => (
-                      <Card key={company.id} className="border border-border hover:shadow-md transition-shadow">
-                        <CardContent className="p-6">
-                          <div className="space-y-4">
-                            <div className="flex items-start space-x-3">
-                              {company.logo ? (
-                                <img 
-                                  src={company.logo} 
-                                  alt={`${company.name} logo`}
-                                  className="w-12 h-12 rounded-lg object-cover"
-                                />
-                              ) : (
-                                <div className="w-12 h-12 bg-primary/10 rounded-lg flex items-center justify-center">
-                                  <Building2 className="h-6 w-6 text-primary" />
-                                </div>
-                              )}
-                              <div className="flex-1">
-                                <h3 className="font-semibold text-foreground">{company.name}</h3>
-                                <p className="text-xs text-muted-foreground">
-                                  Created {formatDate(company.createdAt)}
-                                </p>
-                              </div>
-                            </div>
-
-                            {company.address && (
-                              <p className="text-sm text-muted-foreground line-clamp-2">
-                                {company.address}
-                              </p>
-                            )}
-
-                            <div className="space-y-1">
-                              {company.phone && (
-                                <div className="flex items-center space-x-2 text-sm">
-                                  <Phone className="h-3 w-3 text-muted-foreground" />
-                                  <span className="text-foreground">{company.phone}</span>
-                                </div>
-                              )}
-                              {company.email && (
-                                <div className="flex items-center space-x-2 text-sm">
-                                  <Mail className="h-3 w-3 text-muted-foreground" />
-                                  <span className="text-foreground">{company.email}</span>
-                                </div>
-                              )}
-                            </div>
-
-                            <div className="flex items-center justify-between pt-2">
-                              <Badge variant="secondary" className="text-xs">
-                                {quotes.filter(q => q.companyId === company.id).length} Quotes
-                              </Badge>
-                              <div className="flex space-x-1">
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => setCompanyModal({ open: true, data: company })}
-                                >
-                                  <Edit className="h-3 w-3" />
-                                </Button>
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => handleDelete('companies', company.id)}
-                                >
-                                  <Trash2 className="h-3 w-3" />
-                                </Button>
-                              </div>
-                            </div>
-                          </div>
-                        </CardContent>
-                      </Card>
-                    ))}
-                  </div>
+                  <VirtualList
+                    name="companies"
+                    items={companies}
+                    estimatedRowHeight={COMPANY_ROW_HEIGHT}
+                    minColumnWidth={320}
+                    renderItem={renderCompany}
+                    hasMore={Boolean(cursors.companies)}
+                    loading={loadingMore.companies}
+                    onEndReached={() => loadMore('companies')}
+                  />
                 )}
               </CardContent>
             </Card>
@@ -413,106 +769,51 @@ export default function App() {
             <Card>
               <CardHeader className="flex flex-row items-center justify-between">
                 <CardTitle className="text-xl">Purchase Orders</CardTitle>
-                <Button 
-                  onClick={() => setPOModal({ open: true, data: null })}
-                  className="flex items-center space-x-2"
-                >
-                  <Plus className="h-4 w-4" />
-                  <span>Create Purchase Order</span>
-                </Button>
+                <div className="flex items-center space-x-2">
+                  {selected['purchase-orders'].length > 0 && (
+                    <>
+                      <Button variant="outline" onClick={completeSelectedOrders}>
+                        Mark {selected['purchase-orders'].length} completed
+                      </Button>
+                      <Button variant="outline" onClick={() => deleteSelected('purchase-orders')} className="flex items-center space-x-2">
+                        <Trash2 className="h-4 w-4" />
+                        <span>Delete {selected['purchase-orders'].length}</span>
+                      </Button>
+                    </>
+                  )}
+                  <Button 
+                    {...prefetch('purchaseOrder')}
+                    onClick={() => setPOModal({ open: true, data: null })}
+                    className="flex items-center space-x-2"
+                  >
+                    <Plus className="h-4 w-4" />
+                    <span>Create Purchase Order</span>
+                  </Button>
+                </div>
               </CardHeader>
               <CardContent>
-                {purchaseOrders.length === 0 ? (
+                {listsLoading && purchaseOrders.length === 0 ? (
+                  <p className="text-center py-12 text-muted-foreground">Loading purchase orders...</p>
+                ) : purchaseOrders.length === 0 ? (
                   <div className="text-center py-12">
                     <ShoppingCart className="h-16 w-16 text-muted-foreground/50 mx-auto mb-4" />
                     <h3 className="text-lg font-medium text-foreground mb-2">No purchase orders yet</h3>
                     <p className="text-muted-foreground mb-6">Convert quotes or create purchase orders directly</p>
-                    <Button onClick={() => setPOModal({ open: true, data: null })}>
+                    <Button {...prefetch('purchaseOrder')} onClick={() => setPOModal({ open: true, data: null })}>
                       <Plus className="h-4 w-4 mr-2" />
                       Create Purchase Order
                     </Button>
                   </div>
                 ) : (
-                  <div className="grid gap-4">
-                    {purchaseOrders.map((po) => (
-                      <Card key={po.id} className="border border-border hover:shadow-md transition-shadow">
-                        <CardContent className="p-6">
-                          <div className="flex items-start justify-between">
-                            <div className="space-y-3 flex-1">
-                              <div className="flex items-center space-x-4">
-                                <Badge variant="outline" className="font-mono">
-                                  {po.poNumber}
-                                </Badge>
-                                {po.quoteNumber && (
-                                  <Badge variant="secondary" className="font-mono">
-                                    From Quote: {po.quoteNumber}
-                                  </Badge>
-                                )}
-                                <Badge 
-                                  variant={po.status === 'completed' ? 'default' : 'outline'}
-                                  className="capitalize"
-                                >
-                                  {po.status}
-                                </Badge>
-                              </div>
-                              
-                              <div className="grid grid-cols-2 gap-4 text-sm">
-                                <div className="flex items-center space-x-2">
-                                  <Building2 className="h-4 w-4 text-muted-foreground" />
-                                  <span className="text-foreground">{po.companies?.name || 'No Company'}</span>
-                                </div>
-                                <div className="flex items-center space-x-2">
-                                  <Calendar className="h-4 w-4 text-muted-foreground" />
-                                  <span className="text-foreground">{formatDate(po.createdAt)}</span>
-                                </div>
-                              </div>
-
-                              <div className="flex items-center space-x-2">
-                                <span className="text-sm text-muted-foreground">Bill To:</span>
-                                <span className="text-sm font-medium text-foreground">{po.billTo || 'Not specified'}</span>
-                              </div>
-                            </div>
-
-                            <div className="text-right space-y-3">
-                              <div className="space-y-1">
-                                <p className="text-2xl font-bold text-primary">
-                                  {formatCurrency(po.totalAmount)}
-                                </p>
-                                <p className="text-xs text-muted-foreground">
-                                  Subtotal: {formatCurrency(po.subtotal)} + VAT ({po.vatRate}%)
-                                </p>
-                              </div>
-
-                              <div className="flex items-center space-x-2">
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => setPdfModal({ open: true, data: po, type: 'purchase-order' })}
-                                >
-                                  <Download className="h-4 w-4 mr-1" />
-                                  PDF
-                                </Button>
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => setPOModal({ open: true, data: po })}
-                                >
-                                  <Edit className="h-4 w-4" />
-                                </Button>
-                                <Button
-                                  size="sm"
-                                  variant="outline"
-                                  onClick={() => handleDelete('purchase-orders', po.id)}
-                                >
-                                  <Trash2 className="h-4 w-4" />
-                                </Button>
-                              </div>
-                            </div>
-                          </div>
-                        </CardContent>
-                      </Card>
-                    ))}
-                  </div>
+                  <VirtualList
+                    name="purchase-orders"
+                    items={purchaseOrders}
+                    estimatedRowHeight={DOCUMENT_ROW_HEIGHT}
+                    renderItem={renderPurchaseOrder}
+                    hasMore={Boolean(cursors['purchase-orders'])}
+                    loading={loadingMore['purchase-orders']}
+                    onEndReached={() => loadMore('purchase-orders')}
+                  />
                 )}
               </CardContent>
             </Card>
@@ -520,36 +821,36 @@ export default function App() {
         </Tabs>
       </main>
 
-      {/* Modals */}
-      <CompanyModal
+      {/* Modals are only mounted while open, so none is fetched until used */}
+      {companyModal.open && <CompanyModal
         open={companyModal.open}
         onClose={() => setCompanyModal({ open: false, data: null })}
         data={companyModal.data}
-        onSuccess={fetchData}
-      />
+        onSuccess={saved('companies', Boolean(companyModal.data))}
+      />}
 
-      <QuoteModal
+      {quoteModal.open && <QuoteModal
         open={quoteModal.open}
         onClose={() => setQuoteModal({ open: false, data: null })}
         data={quoteModal.data}
         companies={companies}
-        onSuccess={fetchData}
-      />
+        onSuccess={saved('quotes', Boolean(quoteModal.data))}
+      />}
 
-      <PurchaseOrderModal
+      {poModal.open && <PurchaseOrderModal
         open={poModal.open}
         onClose={() => setPOModal({ open: false, data: null })}
         data={poModal.data}
         companies={companies}
-        onSuccess={fetchData}
-      />
+        onSuccess={saved('purchase-orders', Boolean(poModal.data))}
+      />}
 
-      <PDFGenerator
+      {pdfModal.open && <PDFGenerator
         open={pdfModal.open}
         onClose={() => setPdfModal({ open: false, data: null, type: null })}
         data={pdfModal.data}
         type={pdfModal.type}
-      />
+      />}
     </div>
   )
 }
\ No newline at end of file
@@ -1,587 +1,652 @@
 #!/usr/bin/env python3
 """
 Backend API Testing for Quote Generator Application
-Tests Companies, Quotes, and Purchase Orders APIs with Supabase integration
+
+The functional tests live in the pytest suite under tests/api; this script
+runs them and holds the load and benchmark modes.
+
+Usage:
+    python backend_test.py                      # functional API tests (pytest tests/api)
+    python backend_test.py --server-timing      # ... with a per-route Server-Timing breakdown
+    python backend_test.py --load --concurrency 200 --duration 60s
+                                                # load mode (requires httpx)
+
+The Python dependencies are in requirements-dev.txt.
+    python backend_test.py --bench-list --sizes 100,1000,10000
+                                                # list latency vs table size
+    python backend_test.py --bench-pdf --items 5,50,500
+                                                # server-side PDF render time and size
+    python backend_test.py --bench-export --documents 1000
+                                                # bulk PDF export job, end to end
 """
 
 import requests
 import json
 import os
 import sys
-from datetime import datetime
-import base64
-
-# Get base URL from environment
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://a017fc05-72ae-46e0-8737-e0fa7a88504b.preview.emergentagent.com')
-API_BASE = f"{BASE_URL}/api"
-
-# Test data
-SAMPLE_LOGO_BASE64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
-
-def log_test_result(test_name, success, details=""):
-    """Log test results with timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    status = "✅ PASS" if success else "❌ FAIL"
-    print(f"[{timestamp}] {status} - {test_name}")
-    if details:
-        print(f"    Details: {details}")
-    print()
-
-def test_companies_api():
-    """Test all Companies API endpoints"""
-    print("=" * 60)
-    print("TESTING COMPANIES API")
-    print("=" * 60)
-    
-    created_company_id = None
-    
-    try:
-        # Test 1: GET all companies (should work even if empty)
-        print("1. Testing GET /api/companies")
-        response = requests.get(f"{API_BASE}/companies", timeout=10)
-        if response.status_code == 200:
-            companies = response.json()
-            log_test_result("GET /api/companies", True, f"Retrieved {len(companies)} companies")
-        else:
-            log_test_result("GET /api/companies", False, f"Status: {response.status_code}, Response: {response.text}")
-            return False
-        
-        # Test 2: POST create new company
-        print("2. Testing POST /api/companies")
-        company_data = {
-            "name": "Acme Corporation Ltd",
-            "logo": SAMPLE_LOGO_BASE64,
-            "address": "123 Business Street, Corporate City, CC 12345",
-            "phone": "+1-555-123-4567",
-            "email": "contact@acmecorp.com",
-            "signature": "John Smith, CEO",
-            "seal": "Official Company Seal"
-        }
-        
-        response = requests.post(f"{API_BASE}/companies", json=company_data, timeout=10)
-        if response.status_code == 200:
-            created_company = response.json()
-            created_company_id = created_company.get('id')
-            log_test_result("POST /api/companies", True, f"Created company with ID: {created_company_id}")
-        else:
-            log_test_result("POST /api/companies", False, f"Status: {response.status_code}, Response: {response.text}")
-            return False
-        
-        # Test 3: GET specific company
-        print("3. Testing GET /api/companies/{id}")
-        if created_company_id:
-            response = requests.get(f"{API_BASE}/companies/{created_company_id}", timeout=10)
-            if response.status_code == 200:
-                company = response.json()
-                log_test_result("GET /api/companies/{id}", True, f"Retrieved company: {company.get('name')}")
-            else:
-                log_test_result("GET /api/companies/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Test 4: PUT update company
-        print("4. Testing PUT /api/companies/{id}")
-        if created_company_id:
-            update_data = {
-                "name": "Acme Corporation Ltd - Updated",
-                "phone": "+1-555-987-6543",
-                "email": "updated@acmecorp.com"
-            }
-            response = requests.put(f"{API_BASE}/companies/{created_company_id}", json=update_data, timeout=10)
-            if response.status_code == 200:
-                updated_company = response.json()
-                log_test_result("PUT /api/companies/{id}", True, f"Updated company name: {updated_company.get('name')}")
-            else:
-                log_test_result("PUT /api/companies/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Test 5: DELETE company (we'll do this last)
-        print("5. Testing DELETE /api/companies/{id}")
-        if created_company_id:
-            response = requests.delete(f"{API_BASE}/companies/{created_company_id}", timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                log_test_result("DELETE /api/companies/{id}", True, f"Deleted company successfully: {result}")
-            else:
-                log_test_result("DELETE /api/companies/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        return True
-        
-    except requests.exceptions.RequestException as e:
-        log_test_result("Companies API", False, f"Network error: {str(e)}")
-        return False
-    except Exception as e:
-        log_test_result("Companies API", False, f"Unexpected error: {str(e)}")
-        return False
-
-def test_quotes_api():
-    """Test all Quotes API endpoints"""
-    print("=" * 60)
-    print("TESTING QUOTES API")
-    print("=" * 60)
+import time
+import random
+import asyncio
+import argparse
+import importlib.util
+import io
+import zipfile
+import re
+
+from tests.api.support import API_BASE, BATCH_SIZE, SAMPLE_LOGO_BASE64, count_pdf_pages, load_items, percentile
+
+def main(server_timing=False):
+    """Run the functional API suite, across every core when pytest-xdist is installed"""
+    import pytest
     
-    created_company_id = None
-    created_quote_id = None
+    print("🚀 Starting Backend API Tests for Quote Generator")
+    print(f"🌐 Testing against: {API_BASE}")
+    print("=" * 80)
     
+    args = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "api")]
+    if importlib.util.find_spec("xdist"):
+        args += ["-n", "auto"]
+    if server_timing:
+        args.append("--server-timing")
+    return pytest.main(args) == 0
+
+# ---------------------------------------------------------------------------
+# Load generation mode
+# ---------------------------------------------------------------------------
+
+DEFAULT_LOAD_WEIGHTS = {"companies": 1, "quotes": 3, "purchase-orders": 2}
+
+def parse_duration(value):
+    """Parse a duration such as '60s', '2m', '500ms' or '30' into seconds"""
+    value = str(value).strip().lower()
+    units = (("ms", 0.001), ("s", 1), ("m", 60), ("h", 3600))
+    for suffix, factor in units:
+        if value.endswith(suffix) and value[:-len(suffix)].replace('.', '', 1).isdigit():
+            return float(value[:-len(suffix)]) * factor
+    return float(value)
+
+def parse_weights(value):
+    """Parse 'companies=1,quotes=3' into a weights dict"""
+    weights = {}
+    for part in value.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_LOAD_WEIGHTS:
+            raise argparse.ArgumentTypeError(f"Unknown workload: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+class LoadStats:
+    """Collects per-route latency samples and error counts"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    def record(self, method, route, elapsed, ok):
+        key = (method, route)
+        self.samples.setdefault(key, []).append(elapsed)
+        if not ok:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def report(self, wall_time):
+        print("=" * 80)
+        print("📊 LOAD TEST SUMMARY")
+        print("=" * 80)
+        header = f"{'METHOD':<7} {'ROUTE':<32} {'REQS':>7} {'ERR':>5} {'RPS':>8} {'P50 ms':>8} {'P95 ms':>8} {'P99 ms':>8}"
+        print(header)
+        print("-" * len(header))
+        total = 0
+        total_errors = 0
+        for (method, route), values in sorted(self.samples.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+            values = sorted(values)
+            errors = self.errors.get((method, route), 0)
+            total += len(values)
+            total_errors += errors
+            print(
+                f"{method:<7} {route:<32} {len(values):>7} {errors:>5} {len(values) / wall_time:>8.1f} "
+                f"{percentile(values, 50) * 1000:>8.1f} {percentile(values, 95) * 1000:>8.1f} "
+                f"{percentile(values, 99) * 1000:>8.1f}"
+            )
+        print("-" * len(header))
+        print(f"Total: {total} requests, {total_errors} errors in {wall_time:.1f}s ({total / wall_time:.1f} req/s)")
+        return total_errors == 0
+
+async def timed_request(client, stats, method, url, route, **kwargs):
+    """Issue one request through the pooled client and record its latency"""
+    started = time.perf_counter()
     try:
-        # First create a company for the quote
-        print("0. Creating test company for quotes")
-        company_data = {
-            "name": "Test Company for Quotes",
-            "address": "456 Quote Street, Business City, BC 67890",
-            "phone": "+1-555-234-5678",
-            "email": "quotes@testcompany.com"
-        }
-        
-        response = requests.post(f"{API_BASE}/companies", json=company_data, timeout=10)
-        if response.status_code == 200:
-            created_company = response.json()
-            created_company_id = created_company.get('id')
-            log_test_result("Create test company", True, f"Company ID: {created_company_id}")
-        else:
-            log_test_result("Create test company", False, f"Status: {response.status_code}")
-            return False
-        
-        # Test 1: GET all quotes
-        print("1. Testing GET /api/quotes")
-        response = requests.get(f"{API_BASE}/quotes", timeout=10)
-        if response.status_code == 200:
-            quotes = response.json()
-            log_test_result("GET /api/quotes", True, f"Retrieved {len(quotes)} quotes")
-        else:
-            log_test_result("GET /api/quotes", False, f"Status: {response.status_code}, Response: {response.text}")
-            return False
-        
-        # Test 2: POST create new quote
-        print("2. Testing POST /api/quotes")
-        quote_data = {
-            "companyId": created_company_id,
-            "quoteNumber": f"Q-{datetime.now().strftime('%Y%m%d')}-001",
-            "poNumber": "PO-REF-12345",
-            "billTo": "ABC Manufacturing Ltd",
-            "billToAddress": "789 Industrial Ave, Manufacturing City, MC 11111",
-            "billToContact": "Jane Doe, Procurement Manager",
-            "items": [
-                {
-                    "description": "Premium Widget Model A",
-                    "quantity": 10,
-                    "unitPrice": 150.00,
-                    "total": 1500.00
-                },
-                {
-                    "description": "Standard Widget Model B", 
-                    "quantity": 25,
-                    "unitPrice": 75.50,
-                    "total": 1887.50
-                }
-            ],
-            "subtotal": 3387.50,
-            "vatRate": 5,
-            "vatAmount": 169.38,
-            "totalAmount": 3556.88,
-            "notes": "Payment terms: Net 30 days. Delivery within 2 weeks."
-        }
-        
-        response = requests.post(f"{API_BASE}/quotes", json=quote_data, timeout=10)
-        if response.status_code == 200:
-            created_quote = response.json()
-            created_quote_id = created_quote.get('id')
-            log_test_result("POST /api/quotes", True, f"Created quote with ID: {created_quote_id}")
-        else:
-            log_test_result("POST /api/quotes", False, f"Status: {response.status_code}, Response: {response.text}")
-            return False
-        
-        # Test 3: GET specific quote
-        print("3. Testing GET /api/quotes/{id}")
-        if created_quote_id:
-            response = requests.get(f"{API_BASE}/quotes/{created_quote_id}", timeout=10)
-            if response.status_code == 200:
-                quote = response.json()
-                log_test_result("GET /api/quotes/{id}", True, f"Retrieved quote: {quote.get('quoteNumber')}")
-                # Verify company relation
-                if 'companies' in quote and quote['companies']:
-                    log_test_result("Quote-Company relation", True, f"Company: {quote['companies']['name']}")
-                else:
-                    log_test_result("Quote-Company relation", False, "Company relation not found")
-            else:
-                log_test_result("GET /api/quotes/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Test 4: PUT update quote
-        print("4. Testing PUT /api/quotes/{id}")
-        if created_quote_id:
-            update_data = {
-                "billTo": "ABC Manufacturing Ltd - Updated",
-                "totalAmount": 3750.00,
-                "notes": "Updated payment terms: Net 15 days."
-            }
-            response = requests.put(f"{API_BASE}/quotes/{created_quote_id}", json=update_data, timeout=10)
-            if response.status_code == 200:
-                updated_quote = response.json()
-                log_test_result("PUT /api/quotes/{id}", True, f"Updated quote total: ${updated_quote.get('totalAmount')}")
-            else:
-                log_test_result("PUT /api/quotes/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Test 5: DELETE quote
-        print("5. Testing DELETE /api/quotes/{id}")
-        if created_quote_id:
-            response = requests.delete(f"{API_BASE}/quotes/{created_quote_id}", timeout=10)
-            if response.status_code == 200:
-                result = response.json()
-                log_test_result("DELETE /api/quotes/{id}", True, f"Deleted quote successfully: {result}")
-            else:
-                log_test_result("DELETE /api/quotes/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Cleanup: Delete test company
-        if created_company_id:
-            requests.delete(f"{API_BASE}/companies/{created_company_id}", timeout=10)
-        
-        return True
-        
-    except requests.exceptions.RequestException as e:
-        log_test_result("Quotes API", False, f"Network error: {str(e)}")
-        return False
-    except Exception as e:
-        log_test_result("Quotes API", False, f"Unexpected error: {str(e)}")
-        return False
-
-def test_purchase_orders_api():
-    """Test all Purchase Orders API endpoints"""
-    print("=" * 60)
-    print("TESTING PURCHASE ORDERS API")
-    print("=" * 60)
-    
-    created_company_id = None
-    created_po_id = None
-    
+        response = await client.request(method, url, **kwargs)
+        ok = response.status_code == 200
+    except Exception:
+        response = None
+        ok = False
+    stats.record(method, route, time.perf_counter() - started, ok)
+    return response if ok else None
+
+async def companies_workload(client, stats, context):
+    """Same CRUD sequence as test_companies_crud (tests/api/test_crud.py)"""
+    await timed_request(client, stats, "GET", f"{API_BASE}/companies", "/api/companies")
+    company_data = {
+        "name": "Load Test Company",
+        "logo": SAMPLE_LOGO_BASE64,
+        "address": "123 Business Street, Corporate City, CC 12345",
+        "phone": "+1-555-123-4567",
+        "email": "load@acmecorp.com"
+    }
+    response = await timed_request(client, stats, "POST", f"{API_BASE}/companies", "/api/companies", json=company_data)
+    if response is None:
+        return
+    company_id = response.json().get('id')
+    await timed_request(client, stats, "GET", f"{API_BASE}/companies/{company_id}", "/api/companies/{id}")
+    await timed_request(client, stats, "PUT", f"{API_BASE}/companies/{company_id}", "/api/companies/{id}",
+                        json={"phone": "+1-555-987-6543"})
+    await timed_request(client, stats, "DELETE", f"{API_BASE}/companies/{company_id}", "/api/companies/{id}")
+
+async def quotes_workload(client, stats, context):
+    """Same CRUD sequence as test_quotes_crud against the shared load company"""
+    await timed_request(client, stats, "GET", f"{API_BASE}/quotes", "/api/quotes")
+    quote_data = {
+        "companyId": context["company_id"],
+        "billTo": "ABC Manufacturing Ltd",
+        "items": load_items(),
+        "subtotal": 3387.50,
+        "vatRate": 5,
+        "vatAmount": 169.38,
+        "totalAmount": 3556.88
+    }
+    response = await timed_request(client, stats, "POST", f"{API_BASE}/quotes", "/api/quotes", json=quote_data)
+    if response is None:
+        return
+    quote_id = response.json().get('id')
+    await timed_request(client, stats, "GET", f"{API_BASE}/quotes/{quote_id}", "/api/quotes/{id}")
+    await timed_request(client, stats, "PUT", f"{API_BASE}/quotes/{quote_id}", "/api/quotes/{id}",
+                        json={"notes": "Updated under load"})
+    await timed_request(client, stats, "DELETE", f"{API_BASE}/quotes/{quote_id}", "/api/quotes/{id}")
+
+async def purchase_orders_workload(client, stats, context):
+    """Same CRUD sequence as test_purchase_orders_crud against the shared load company"""
+    await timed_request(client, stats, "GET", f"{API_BASE}/purchase-orders", "/api/purchase-orders")
+    po_data = {
+        "companyId": context["company_id"],
+        "billTo": "XYZ Services Inc",
+        "items": load_items(),
+        "subtotal": 3387.50,
+        "vatRate": 5,
+        "vatAmount": 169.38,
+        "totalAmount": 3556.88,
+        "status": "pending"
+    }
+    response = await timed_request(client, stats, "POST", f"{API_BASE}/purchase-orders", "/api/purchase-orders", json=po_data)
+    if response is None:
+        return
+    po_id = response.json().get('id')
+    await timed_request(client, stats, "GET", f"{API_BASE}/purchase-orders/{po_id}", "/api/purchase-orders/{id}")
+    await timed_request(client, stats, "PUT", f"{API_BASE}/purchase-orders/{po_id}", "/api/purchase-orders/{id}",
+                        json={"status": "approved"})
+    await timed_request(client, stats, "DELETE", f"{API_BASE}/purchase-orders/{po_id}", "/api/purchase-orders/{id}")
+
+LOAD_WORKLOADS = {
+    "companies": companies_workload,
+    "quotes": quotes_workload,
+    "purchase-orders": purchase_orders_workload
+}
+
+def create_load_client(concurrency):
+    """Async HTTP client with a keep-alive pool sized to the concurrency level"""
     try:
-        # First create a company for the purchase order
-        print("0. Creating test company for purchase orders")
-        company_data = {
-            "name": "Test Company for POs",
-            "address": "321 Purchase Order Blvd, PO City, PC 54321",
-            "phone": "+1-555-345-6789",
-            "email": "po@testcompany.com"
-        }
-        
-        response = requests.post(f"{API_BASE}/companies", json=company_data, timeout=10)
-        if response.status_code == 200:
-            created_company = response.json()
-            created_company_id = created_company.get('id')
-            log_test_result("Create test company", True, f"Company ID: {created_company_id}")
-        else:
-            log_test_result("Create test company", False, f"Status: {response.status_code}")
-            return False
-        
-        # Test 1: GET all purchase orders
-        print("1. Testing GET /api/purchase-orders")
-        response = requests.get(f"{API_BASE}/purchase-orders", timeout=10)
-        if response.status_code == 200:
-            pos = response.json()
-            log_test_result("GET /api/purchase-orders", True, f"Retrieved {len(pos)} purchase orders")
-        else:
-            log_test_result("GET /api/purchase-orders", False, f"Status: {response.status_code}, Response: {response.text}")
-            return False
-        
-        # Test 2: POST create new purchase order
-        print("2. Testing POST /api/purchase-orders")
-        po_data = {
-            "companyId": created_company_id,
-            "poNumber": f"PO-{datetime.now().strftime('%Y%m%d')}-001",
-            "quoteNumber": "Q-REF-67890",
-            "billTo": "XYZ Services Inc",
-            "billToAddress": "987 Service Lane, Service City, SC 22222",
-            "billToContact": "Bob Johnson, Operations Manager",
-            "items": [
-                {
-                    "description": "Professional Service Package A",
-                    "quantity": 5,
-                    "unitPrice": 500.00,
-                    "total": 2500.00
-                },
-                {
-                    "description": "Maintenance Contract - Annual",
-                    "quantity": 1,
-                    "unitPrice": 1200.00,
-                    "total": 1200.00
-                }
-            ],
-            "subtotal": 3700.00,
-            "vatRate": 5,
-            "vatAmount": 185.00,
-            "totalAmount": 3885.00,
-            "status": "pending",
-            "notes": "Service to commence within 30 days of PO approval."
-        }
-        
-        response = requests.post(f"{API_BASE}/purchase-orders", json=po_data, timeout=10)
-        if response.status_code == 200:
-            created_po = response.json()
-            created_po_id = created_po.get('id')
-            log_test_result("POST /api/purchase-orders", True, f"Created PO with ID: {created_po_id}")
-        else:
-            log_test_result("POST /api/purchase-orders", False, f"Status: {response.status_code}, Response: {response.text}")
-            return False
-        
-        # Test 3: GET specific purchase order
-        print("3. Testing GET /api/purchase-orders/{id}")
-        if created_po_id:
-            response = requests.get(f"{API_BASE}/purchase-orders/{created_po_id}", timeout=10)
-            if response.status_code == 200:
-                po = response.json()
-                log_test_result("GET /api/purchase-orders/{id}", True, f"Retrieved PO: {po.get('poNumber')}")
-                # Verify company relation
-                if 'companies' in po and po['companies']:
-                    log_test_result("PO-Company relation", True, f"Company: {po['companies']['name']}")
-                else:
-                    log_test_result("PO-Company relation", False, "Company relation not found")
-            else:
-                log_test_result("GET /api/purchase-orders/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Test 4: PUT update purchase order
-        print("4. Testing PUT /api/purchase-orders/{id}")
-        if created_po_id:
-            update_data = {
-                "status": "approved",
-                "totalAmount": 4000.00,
-                "notes": "PO approved. Service start date confirmed."
-            }
-            response = requests.put(f"{API_BASE}/purchase-orders/{created_po_id}", json=update_data, timeout=10)
-            if response.status_code == 200:
-                updated_po = response.json()
-                log_test_result("PUT /api/purchase-orders/{id}", True, f"Updated PO status: {updated_po.get('status')}")
-            else:
-                log_test_result("PUT /api/purchase-orders/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Test 5: DELETE purchase order
-        print("5. Testing DELETE /api/purchase-orders/{id}")
-        if created_po_id:
-            response = requests.delete(f"{API_BASE}/purchase-orders/{created_po_id}", timeout=10)
+        import httpx
+    except ImportError:
+        sys.exit("The load and benchmark modes need httpx: pip install -r requirements-dev.txt")
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(30.0))
+
+async def run_load(concurrency, duration, weights):
+    """Run weighted CRUD workloads from `concurrency` workers for `duration` seconds"""
+    names = [name for name, weight in weights.items() if weight > 0]
+    workload_weights = [weights[name] for name in names]
+    stats = LoadStats()
+
+    async with create_load_client(concurrency) as client:
+        response = await client.post(f"{API_BASE}/companies", json={"name": "Load Test Shared Company"})
+        response.raise_for_status()
+        context = {"company_id": response.json().get('id')}
+
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = random.choices(names, weights=workload_weights)[0]
+                await LOAD_WORKLOADS[name](client, stats, context)
+
+        # The shared company goes even when a worker fails or the run is
+        # interrupted; deleting it cascades to the documents left under it
+        try:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            wall_time = time.perf_counter() - started
+        finally:
+            await client.delete(f"{API_BASE}/companies/{context['company_id']}")
+
+    return stats.report(wall_time)
+
+# ---------------------------------------------------------------------------
+# List latency benchmark
+# ---------------------------------------------------------------------------
+
+async def seed_quotes(client, company_id, count, concurrency, first=0):
+    """Create `count` quotes for the company in batches, `concurrency` batches at a time.
+    Numbers run from BENCH-`first`, as they are unique per company."""
+    semaphore = asyncio.Semaphore(concurrency)
+    created = []
+
+    async def create(start):
+        async with semaphore:
+            batch = [
+                {"companyId": company_id, "quoteNumber": f"BENCH-{first + index}", "items": load_items()}
+                for index in range(start, min(start + BATCH_SIZE, count))
+            ]
+            response = await client.post(f"{API_BASE}/quotes/batch", json={"create": batch}, timeout=120)
             if response.status_code == 200:
-                result = response.json()
-                log_test_result("DELETE /api/purchase-orders/{id}", True, f"Deleted PO successfully: {result}")
-            else:
-                log_test_result("DELETE /api/purchase-orders/{id}", False, f"Status: {response.status_code}, Response: {response.text}")
-                return False
-        
-        # Cleanup: Delete test company
-        if created_company_id:
-            requests.delete(f"{API_BASE}/companies/{created_company_id}", timeout=10)
-        
-        return True
-        
-    except requests.exceptions.RequestException as e:
-        log_test_result("Purchase Orders API", False, f"Network error: {str(e)}")
-        return False
-    except Exception as e:
-        log_test_result("Purchase Orders API", False, f"Unexpected error: {str(e)}")
-        return False
-
-def test_json_parsing():
-    """Test JSON parsing of items arrays"""
-    print("=" * 60)
-    print("TESTING JSON PARSING & CURRENCY CALCULATIONS")
-    print("=" * 60)
-    
-    try:
-        # Create a company first
-        company_data = {
-            "name": "JSON Test Company",
-            "email": "json@test.com"
-        }
-        
-        response = requests.post(f"{API_BASE}/companies", json=company_data, timeout=10)
-        if response.status_code != 200:
-            log_test_result("JSON Test Setup", False, "Failed to create test company")
-            return False
-        
+                created.extend(result['id'] for result in response.json()['create'] if result['status'] == 'created')
+
+    await asyncio.gather(*(create(start) for start in range(0, count, BATCH_SIZE)))
+    return created
+
+async def delete_batch(client, resource, ids):
+    """Delete `ids` from a resource with batch requests"""
+    for start in range(0, len(ids), BATCH_SIZE):
+        await client.post(f"{API_BASE}/{resource}/batch", json={"delete": ids[start:start + BATCH_SIZE]}, timeout=120)
+
+async def time_list_requests(client, path, samples, pages):
+    """Latency of the first page and of `pages` pages walked via nextCursor"""
+    first_page = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = await client.get(f"{API_BASE}/{path}")
+        first_page.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+    walk = []
+    cursor = None
+    for _ in range(pages):
+        params = {"after": cursor} if cursor else {}
+        started = time.perf_counter()
+        response = await client.get(f"{API_BASE}/{path}", params=params)
+        walk.append(time.perf_counter() - started)
+        cursor = response.json().get('nextCursor')
+        if not cursor:
+            break
+    return sorted(first_page), sorted(walk)
+
+async def run_list_benchmark(sizes, samples, concurrency):
+    """Measure /api/quotes list latency as the table grows through `sizes` rows"""
+    results = []
+    async with create_load_client(concurrency) as client:
+        response = await client.post(f"{API_BASE}/companies", json={"name": "List Benchmark Company"})
+        response.raise_for_status()
         company_id = response.json().get('id')
-        
-        # Test complex items array with currency calculations
-        complex_items = [
-            {
-                "description": "High-end Product with Special Characters: àáâãäåæçèéêë",
-                "quantity": 3,
-                "unitPrice": 1234.56,
-                "total": 3703.68,
-                "category": "premium",
-                "sku": "SKU-001-SPECIAL"
-            },
-            {
-                "description": "Bulk Item with Discount",
-                "quantity": 100,
-                "unitPrice": 9.99,
-                "total": 999.00,
-                "discount": 0.01,
-                "category": "bulk"
-            }
-        ]
-        
-        quote_data = {
-            "companyId": company_id,
-            "quoteNumber": "JSON-TEST-001",
-            "items": complex_items,
-            "subtotal": 4702.68,
-            "vatRate": 7.5,
-            "vatAmount": 352.70,
-            "totalAmount": 5055.38
-        }
-        
-        response = requests.post(f"{API_BASE}/quotes", json=quote_data, timeout=10)
-        if response.status_code == 200:
-            created_quote = response.json()
-            quote_id = created_quote.get('id')
-            log_test_result("JSON Items Storage", True, f"Stored complex items array")
-            
-            # Retrieve and verify JSON parsing
-            response = requests.get(f"{API_BASE}/quotes/{quote_id}", timeout=10)
-            if response.status_code == 200:
-                retrieved_quote = response.json()
-                stored_items = json.loads(retrieved_quote.get('items', '[]'))
-                
-                if len(stored_items) == 2 and stored_items[0]['description'].startswith('High-end'):
-                    log_test_result("JSON Items Retrieval", True, "Complex items correctly parsed")
-                else:
-                    log_test_result("JSON Items Retrieval", False, f"Items parsing issue: {stored_items}")
-            
-            # Cleanup
-            requests.delete(f"{API_BASE}/quotes/{quote_id}", timeout=10)
-        else:
-            log_test_result("JSON Items Storage", False, f"Status: {response.status_code}")
-        
-        # Cleanup company
-        requests.delete(f"{API_BASE}/companies/{company_id}", timeout=10)
-        
-        return True
-        
-    except Exception as e:
-        log_test_result("JSON Parsing Test", False, f"Error: {str(e)}")
-        return False
-
-def test_foreign_key_relationships():
-    """Test foreign key relationships between companies and quotes/POs"""
-    print("=" * 60)
-    print("TESTING FOREIGN KEY RELATIONSHIPS")
-    print("=" * 60)
-    
+        created = []
+        try:
+            for size in sorted(sizes):
+                created += await seed_quotes(client, company_id, size - len(created), concurrency, first=len(created))
+                assert len(created) == size, f"seeded {len(created)} of {size} quotes"
+                first_page, walk = await time_list_requests(client, "quotes", samples, pages=10)
+                results.append((len(created), first_page, walk))
+        finally:
+            await delete_batch(client, "quotes", created)
+            await client.delete(f"{API_BASE}/companies/{company_id}")
+
+    print("=" * 80)
+    print("📊 LIST LATENCY vs TABLE SIZE (GET /api/quotes)")
+    print("=" * 80)
+    header = f"{'ROWS':>8} {'FIRST P50 ms':>13} {'FIRST P95 ms':>13} {'WALK P50 ms':>12} {'WALK P95 ms':>12}"
+    print(header)
+    print("-" * len(header))
+    for rows, first_page, walk in results:
+        print(
+            f"{rows:>8} {percentile(first_page, 50) * 1000:>13.1f} {percentile(first_page, 95) * 1000:>13.1f} "
+            f"{percentile(walk, 50) * 1000:>12.1f} {percentile(walk, 95) * 1000:>12.1f}"
+        )
+    return True
+
+# ---------------------------------------------------------------------------
+# PDF rendering benchmark
+# ---------------------------------------------------------------------------
+
+def run_pdf_benchmark(item_counts, samples, legacy_results=None):
+    """Time server-side PDF rendering (cold and cached) and report file sizes
+
+    The previous path rasterised the DOM with html2canvas in the browser, so it
+    cannot be driven from here; pass --legacy-pdf-results with a JSON object of
+    {"<items>": {"ms": ..., "bytes": ...}} measured in the browser to compare.
+    """
+    legacy = {}
+    if legacy_results:
+        with open(legacy_results) as handle:
+            legacy = {int(k): v for k, v in json.load(handle).items()}
+
+    session = requests.Session()
+    response = session.post(f"{API_BASE}/companies", json={"name": "PDF Benchmark Company", "logo": SAMPLE_LOGO_BASE64}, timeout=10)
+    response.raise_for_status()
+    company_id = response.json().get('id')
+    rows = []
+
     try:
-        # Create a company
-        company_data = {
-            "name": "Relationship Test Company",
-            "email": "relationships@test.com"
-        }
-        
-        response = requests.post(f"{API_BASE}/companies", json=company_data, timeout=10)
-        if response.status_code != 200:
-            log_test_result("FK Test Setup", False, "Failed to create test company")
-            return False
-        
+        for count in item_counts:
+            items = [
+                {"description": f"Line item {index} with a moderately long description to wrap", "quantity": 2,
+                 "unitPrice": 12.5, "total": 25.0}
+                for index in range(count)
+            ]
+            quote_data = {"companyId": company_id, "quoteNumber": f"PDF-BENCH-{count}", "items": items,
+                          "subtotal": 25.0 * count, "vatRate": 5, "notes": "Benchmark quote"}
+            quote_id = session.post(f"{API_BASE}/quotes", json=quote_data, timeout=30).json().get('id')
+
+            started = time.perf_counter()
+            response = session.get(f"{API_BASE}/quotes/{quote_id}/pdf", timeout=120)
+            cold = time.perf_counter() - started
+            response.raise_for_status()
+            content = response.content
+
+            warm = []
+            for _ in range(samples):
+                started = time.perf_counter()
+                session.get(f"{API_BASE}/quotes/{quote_id}/pdf", timeout=30).raise_for_status()
+                warm.append(time.perf_counter() - started)
+
+            rows.append((count, cold, percentile(sorted(warm), 50), len(content), count_pdf_pages(content)))
+            session.delete(f"{API_BASE}/quotes/{quote_id}", timeout=10)
+    finally:
+        session.delete(f"{API_BASE}/companies/{company_id}", timeout=10)
+
+    print("=" * 80)
+    print("📊 PDF RENDERING (GET /api/quotes/{id}/pdf)")
+    print("=" * 80)
+    header = f"{'ITEMS':>6} {'COLD ms':>9} {'CACHED ms':>10} {'BYTES':>9} {'PAGES':>6} {'LEGACY ms':>10} {'LEGACY BYTES':>13}"
+    print(header)
+    print("-" * len(header))
+    for count, cold, cached, size, pages in rows:
+        previous = legacy.get(count, {})
+        legacy_ms = f"{previous['ms']:.1f}" if 'ms' in previous else '-'
+        legacy_bytes = str(previous['bytes']) if 'bytes' in previous else '-'
+        print(f"{count:>6} {cold * 1000:>9.1f} {cached * 1000:>10.1f} {size:>9} {pages:>6} {legacy_ms:>10} {legacy_bytes:>13}")
+    return True
+
+# ---------------------------------------------------------------------------
+# Bulk export benchmark
+# ---------------------------------------------------------------------------
+
+async def poll_export(client, job_id, interval=0.5):
+    """Poll an export job until it finishes, printing progress as it changes"""
+    last = None
+    while True:
+        response = await client.get(f"{API_BASE}/exports/{job_id}")
+        response.raise_for_status()
+        job = response.json()
+        progress = (job['status'], job['completed'], job['failed'])
+        if progress != last:
+            print(f"   {job['status']:<9} {job['completed']}/{job['total'] or '?'} rendered, {job['failed']} failed")
+            last = progress
+        if job['status'] not in ('queued', 'running'):
+            return job
+        await asyncio.sleep(interval)
+
+async def run_export_benchmark(documents, concurrency):
+    """Seed `documents` quotes, export them as one zip and time each phase"""
+    async with create_load_client(concurrency) as client:
+        response = await client.post(f"{API_BASE}/companies", json={"name": "Export Benchmark Company", "logo": SAMPLE_LOGO_BASE64})
+        response.raise_for_status()
         company_id = response.json().get('id')
-        
-        # Create quote with company relationship
-        quote_data = {
-            "companyId": company_id,
-            "quoteNumber": "FK-TEST-Q001",
-            "items": [{"description": "Test Item", "quantity": 1, "unitPrice": 100, "total": 100}],
-            "subtotal": 100,
-            "totalAmount": 100
-        }
-        
-        response = requests.post(f"{API_BASE}/quotes", json=quote_data, timeout=10)
-        if response.status_code == 200:
-            quote_id = response.json().get('id')
-            
-            # Verify relationship in quote retrieval
-            response = requests.get(f"{API_BASE}/quotes/{quote_id}", timeout=10)
-            if response.status_code == 200:
-                quote = response.json()
-                if 'companies' in quote and quote['companies']['name'] == 'Relationship Test Company':
-                    log_test_result("Quote-Company FK", True, "Foreign key relationship working")
-                else:
-                    log_test_result("Quote-Company FK", False, f"FK issue: {quote}")
-            
-            # Create PO with same company
-            po_data = {
-                "companyId": company_id,
-                "poNumber": "FK-TEST-PO001",
-                "items": [{"description": "Test PO Item", "quantity": 2, "unitPrice": 50, "total": 100}],
-                "subtotal": 100,
-                "totalAmount": 100,
-                "status": "pending"
-            }
-            
-            response = requests.post(f"{API_BASE}/purchase-orders", json=po_data, timeout=10)
+        try:
+            started = time.perf_counter()
+            created = await seed_quotes(client, company_id, documents, concurrency)
+            seed_time = time.perf_counter() - started
+            print(f"   seeded {len(created)} quotes in {seed_time:.1f}s")
+
+            started = time.perf_counter()
+            response = await client.post(f"{API_BASE}/exports", json={"companyId": company_id})
+            response.raise_for_status()
+            job = await poll_export(client, response.json()['id'])
+            render_time = time.perf_counter() - started
+
+            if job['status'] != 'complete':
+                print(f"❌ Export {job['status']}: {job.get('error')}")
+                return False
+
+            started = time.perf_counter()
+            response = await client.get(f"{API_BASE}{job['downloadUrl'][len('/api'):]}", timeout=300)
+            response.raise_for_status()
+            download_time = time.perf_counter() - started
+            total_time = render_time + download_time
+
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                names = archive.namelist()
+                broken = archive.testzip()
+            await client.delete(f"{API_BASE}/exports/{job['id']}")
+        finally:
+            # Deleting the company cascades to its quotes
+            await client.delete(f"{API_BASE}/companies/{company_id}")
+
+    print("=" * 80)
+    print("📊 BULK PDF EXPORT (POST /api/exports)")
+    print("=" * 80)
+    print(f"Documents:        {len(created)} seeded, {len(names)} in archive, {job['failed']} failed")
+    print(f"Archive:          {len(response.content) / 1024 / 1024:.1f} MiB")
+    print(f"Render + zip:     {render_time:.1f}s ({len(names) / render_time:.1f} docs/s)")
+    print(f"Download:         {download_time:.1f}s")
+    print(f"End to end:       {total_time:.1f}s")
+    return len(names) == len(created) and broken is None
+
+# ---------------------------------------------------------------------------
+# Id and document-number uniqueness under concurrent creates
+# ---------------------------------------------------------------------------
+
+ULID_PATTERN = re.compile(r"^[0-9A-HJKMNP-TV-Z]{26}$")
+
+async def run_uniqueness_check(creates, concurrency, companies=2):
+    """Fire `creates` parallel quote and PO creates with no numbers across a few
+    companies, then check ids are unique ULIDs and each company's numbers are
+    unique and gapless"""
+    async with create_load_client(concurrency) as client:
+        company_ids = []
+        for index in range(companies):
+            response = await client.post(f"{API_BASE}/companies", json={"name": f"Uniqueness Check Company {index}"})
+            response.raise_for_status()
+            company_ids.append(response.json()['id'])
+
+        semaphore = asyncio.Semaphore(concurrency)
+        created = []
+        errors = []
+
+        async def create(index):
+            resource = "quotes" if index % 2 == 0 else "purchase-orders"
+            company_id = company_ids[index % len(company_ids)]
+            async with semaphore:
+                response = await client.post(f"{API_BASE}/{resource}", json={"companyId": company_id, "items": []})
             if response.status_code == 200:
-                po_id = response.json().get('id')
-                
-                # Verify relationship in PO retrieval
-                response = requests.get(f"{API_BASE}/purchase-orders/{po_id}", timeout=10)
-                if response.status_code == 200:
-                    po = response.json()
-                    if 'companies' in po and po['companies']['name'] == 'Relationship Test Company':
-                        log_test_result("PO-Company FK", True, "Foreign key relationship working")
-                    else:
-                        log_test_result("PO-Company FK", False, f"FK issue: {po}")
-                
-                # Cleanup
-                requests.delete(f"{API_BASE}/purchase-orders/{po_id}", timeout=10)
-            
-            # Cleanup
-            requests.delete(f"{API_BASE}/quotes/{quote_id}", timeout=10)
-        
-        # Cleanup company
-        requests.delete(f"{API_BASE}/companies/{company_id}", timeout=10)
-        
-        return True
-        
-    except Exception as e:
-        log_test_result("Foreign Key Test", False, f"Error: {str(e)}")
-        return False
-
-def main():
-    """Run all backend API tests"""
-    print("🚀 Starting Backend API Tests for Quote Generator")
-    print(f"🌐 Testing against: {API_BASE}")
+                created.append((resource, response.json()))
+            else:
+                errors.append((resource, response.status_code, response.text[:200]))
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(create(index) for index in range(creates)))
+        finally:
+            elapsed = time.perf_counter() - started
+            for company_id in company_ids:
+                await client.delete(f"{API_BASE}/companies/{company_id}", timeout=120)
+
+    ids = [document['id'] for _, document in created]
+    duplicate_ids = len(ids) - len(set(ids))
+    malformed_ids = [value for value in ids if not ULID_PATTERN.match(value)]
+
+    numbers = {}
+    for resource, document in created:
+        column = "quoteNumber" if resource == "quotes" else "poNumber"
+        numbers.setdefault((resource, document['companyId']), []).append(document[column])
+    duplicate_numbers = sum(len(values) - len(set(values)) for values in numbers.values())
+    gaps = 0
+    for values in numbers.values():
+        sequence = sorted(int(value.rsplit('-', 1)[1]) for value in values)
+        gaps += sequence != list(range(1, len(sequence) + 1))
+
     print("=" * 80)
-    
-    test_results = []
-    
-    # Run all tests
-    test_results.append(("Companies API", test_companies_api()))
-    test_results.append(("Quotes API", test_quotes_api()))
-    test_results.append(("Purchase Orders API", test_purchase_orders_api()))
-    test_results.append(("JSON Parsing", test_json_parsing()))
-    test_results.append(("Foreign Key Relationships", test_foreign_key_relationships()))
-    
-    # Summary
+    print(f"📊 ID AND DOCUMENT NUMBER UNIQUENESS ({creates} parallel creates)")
     print("=" * 80)
-    print("📊 TEST SUMMARY")
+    print(f"Created:           {len(created)} in {elapsed:.1f}s ({len(created) / elapsed:.0f}/s), {len(errors)} errors")
+    print(f"Duplicate ids:     {duplicate_ids}, malformed: {len(malformed_ids)}")
+    print(f"Duplicate numbers: {duplicate_numbers}")
+    print(f"Sequences w/ gaps: {gaps} of {len(numbers)}")
+    if errors:
+        print(f"First errors:      {errors[:5]}")
+    return not errors and not duplicate_ids and not malformed_ids and not duplicate_numbers and not gaps
+
+# ---------------------------------------------------------------------------
+# Streaming import/export benchmark
+# ---------------------------------------------------------------------------
+
+async def sample_rss(client, samples, stop):
+    """Record the server's resident set size from /api/metrics until `stop` is set"""
+    while not stop.is_set():
+        try:
+            response = await client.get(f"{API_BASE}/metrics")
+            for line in response.text.splitlines():
+                if line.startswith("process_resident_memory_bytes "):
+                    samples.append(float(line.split()[1]))
+        except Exception:
+            pass
+        await asyncio.sleep(0.25)
+
+async def synthetic_ndjson(company_id, rows, chunk_rows=1000):
+    """Yield `rows` synthetic quotes as NDJSON, `chunk_rows` lines per chunk"""
+    items = load_items()
+    for start in range(0, rows, chunk_rows):
+        yield "".join(
+            json.dumps({"companyId": company_id, "quoteNumber": f"XFER-{index}", "totalAmount": index, "items": items}) + "\n"
+            for index in range(start, min(start + chunk_rows, rows))
+        ).encode()
+
+async def stream_export(client, company_id, export_format):
+    """Download an export, counting rows and bytes without holding the body"""
+    rows = 0
+    size = 0
+    async with client.stream("GET", f"{API_BASE}/quotes/export",
+                             params={"companyId": company_id, "format": export_format}, timeout=600) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            size += len(line) + 1
+            if line:
+                rows += 1
+    # The CSV header is not a record; quoted newlines are not used by the synthetic rows
+    return (rows - 1 if export_format == "csv" else rows), size
+
+async def run_transfer_benchmark(rows, max_rss_growth_mb, min_rows_per_sec):
+    """Import `rows` synthetic quotes as a streamed NDJSON upload, export them
+    as NDJSON and CSV, and check throughput and the server's peak RSS"""
+    async with create_load_client(4) as client:
+        response = await client.post(f"{API_BASE}/companies", json={"name": "Transfer Benchmark Company"})
+        response.raise_for_status()
+        company_id = response.json().get('id')
+
+        rss = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(client, rss, stop))
+        await asyncio.sleep(0.5)
+        baseline = rss[0] if rss else None
+        phases = []
+        try:
+            started = time.perf_counter()
+            response = await client.post(f"{API_BASE}/quotes/import", content=synthetic_ndjson(company_id, rows),
+                                         headers={"Content-Type": "application/x-ndjson"}, timeout=None)
+            response.raise_for_status()
+            summary = response.json()
+            phases.append(("Import (NDJSON)", summary['imported'], time.perf_counter() - started, None))
+
+            for export_format in ("ndjson", "csv"):
+                started = time.perf_counter()
+                count, size = await stream_export(client, company_id, export_format)
+                phases.append((f"Export ({export_format.upper()})", count, time.perf_counter() - started, size))
+        finally:
+            stop.set()
+            await sampler
+            # Deleting the company cascades to its quotes
+            await client.delete(f"{API_BASE}/companies/{company_id}", timeout=600)
+
     print("=" * 80)
-    
-    passed = 0
-    failed = 0
-    
-    for test_name, result in test_results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{status} - {test_name}")
-        if result:
-            passed += 1
-        else:
-            failed += 1
-    
-    print(f"\n📈 Results: {passed} passed, {failed} failed")
-    
-    if failed == 0:
-        print("🎉 All backend API tests passed successfully!")
-        return True
+    print(f"📊 STREAMING IMPORT/EXPORT ({rows} rows)")
+    print("=" * 80)
+    print(f"{'Phase':<18} {'Rows':>8} {'Time (s)':>9} {'Rows/s':>9} {'MiB':>8}")
+    success = summary['failed'] == 0
+    for name, count, elapsed, size in phases:
+        mib = f"{size / 1024 / 1024:.1f}" if size is not None else "-"
+        print(f"{name:<18} {count:>8} {elapsed:>9.1f} {count / elapsed:>9.0f} {mib:>8}")
+        success &= count == rows and count / elapsed >= min_rows_per_sec
+    if baseline is not None:
+        growth = (max(rss) - baseline) / 1024 / 1024
+        print(f"Server RSS:       {baseline / 1024 / 1024:.0f} MiB baseline, {max(rss) / 1024 / 1024:.0f} MiB peak (+{growth:.0f} MiB)")
+        success &= growth <= max_rss_growth_mb
     else:
-        print("⚠️  Some tests failed. Check the details above.")
-        return False
+        print("Server RSS:       unavailable (no process_resident_memory_bytes in /api/metrics)")
+    if summary['failed']:
+        print(f"Import errors:    {summary['errors'][:5]}")
+    return success
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backend API tests and load generator for Quote Generator")
+    parser.add_argument("--load", action="store_true", help="run the concurrent load-generation mode")
+    parser.add_argument("--concurrency", type=int, default=50, help="number of concurrent workers (default: 50)")
+    parser.add_argument("--duration", type=parse_duration, default=parse_duration("60s"),
+                        help="how long to generate load, e.g. 60s or 2m (default: 60s)")
+    parser.add_argument("--weights", type=parse_weights, default=dict(DEFAULT_LOAD_WEIGHTS),
+                        help="workload mix, e.g. companies=1,quotes=3,purchase-orders=2")
+    parser.add_argument("--bench-list", action="store_true", help="benchmark list latency as the quotes table grows")
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(',')], default=[100, 1000, 10000],
+                        help="table sizes for --bench-list (default: 100,1000,10000)")
+    parser.add_argument("--samples", type=int, default=50, help="requests per measurement (default: 50)")
+    parser.add_argument("--bench-pdf", action="store_true", help="benchmark server-side PDF rendering")
+    parser.add_argument("--items", type=lambda v: [int(x) for x in v.split(',')], default=[5, 50, 500],
+                        help="line items per quote for --bench-pdf (default: 5,50,500)")
+    parser.add_argument("--legacy-pdf-results", help="JSON file with browser-measured html2canvas timings to compare")
+    parser.add_argument("--bench-export", action="store_true", help="time a bulk PDF export job end to end")
+    parser.add_argument("--documents", type=int, default=1000, help="quotes to export for --bench-export (default: 1000)")
+    parser.add_argument("--server-timing", action="store_true",
+                        help="report the functional tests' Server-Timing breakdown per route")
+    parser.add_argument("--check-ids", action="store_true",
+                        help="fire parallel creates and check ids and document numbers are unique")
+    parser.add_argument("--creates", type=int, default=5000, help="creates for --check-ids (default: 5000)")
+    parser.add_argument("--bench-transfer", action="store_true", help="benchmark streaming NDJSON/CSV import and export")
+    parser.add_argument("--rows", type=int, default=100000, help="rows for --bench-transfer (default: 100000)")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=256,
+                        help="fail --bench-transfer if server RSS grows more than this (default: 256)")
+    parser.add_argument("--min-rows-per-sec", type=float, default=500,
+                        help="fail --bench-transfer below this throughput (default: 500)")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    success = main()
+    args = parse_args()
+    if args.load:
+        print(f"🚀 Generating load against: {API_BASE}")
+        print(f"   concurrency={args.concurrency} duration={args.duration:.0f}s weights={args.weights}")
+        success = asyncio.run(run_load(args.concurrency, args.duration, args.weights))
+    elif args.check_ids:
+        print(f"🚀 Checking id and document number uniqueness against: {API_BASE}")
+        success = asyncio.run(run_uniqueness_check(args.creates, args.concurrency))
+    elif args.bench_transfer:
+        print(f"🚀 Benchmarking streaming import/export against: {API_BASE}")
+        success = asyncio.run(run_transfer_benchmark(args.rows, args.max_rss_growth_mb, args.min_rows_per_sec))
+    elif args.bench_export:
+        print(f"🚀 Benchmarking bulk PDF export against: {API_BASE}")
+        success = asyncio.run(run_export_benchmark(args.documents, args.concurrency))
+    elif args.bench_pdf:
+        print(f"🚀 Benchmarking PDF rendering against: {API_BASE}")
+        success = run_pdf_benchmark(args.items, args.samples, args.legacy_pdf_results)
+    elif args.bench_list:
+        print(f"🚀 Benchmarking list latency against: {API_BASE}")
+        success = asyncio.run(run_list_benchmark(args.sizes, args.samples, args.concurrency))
+    else:
+        success = main(args.server_timing)
     sys.exit(0 if success else 1)
\ No newline at end of file
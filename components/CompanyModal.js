@@ -28,6 +28,11 @@ export default function CompanyModal({ open, onClose, data, onSuccess }) {
   useEffect(() => {
     if (data) {
       setFormData(data)
+      // List rows leave out the images, so load the full company for editing
+      fetch(`/api/companies/${data.id}`)
+        .then(response => response.ok ? response.json() : null)
+        .then(company => company && setFormData(company))
+        .catch(error => console.error('Error loading company:', error))
     } else {
       setFormData({
         name: '',
@@ -56,7 +61,7 @@ export default function CompanyModal({ open, onClose, data, onSuccess }) {
       })
 
       if (response.ok) {
-        onSuccess()
+        onSuccess(await response.json())
         onClose()
       }
     } catch (error) {
@@ -70,14 +75,23 @@ export default function CompanyModal({ open, onClose, data, onSuccess }) {
     const input = document.createElement('input')
     input.type = 'file'
     input.accept = 'image/*'
-    input.onchange = (e) => {
+    input.onchange = async (e) => {
       const file = e.target.files[0]
-      if (file) {
-        const reader = new FileReader()
-        reader.onload = (e) => {
-          setFormData({ ...formData, [field]: e.target.result })
+      if (!file) return
+
+      // Upload once to the asset store and keep only its URL on the company
+      try {
+        const response = await fetch('/api/assets', {
+          method: 'POST',
+          headers: { 'Content-Type': file.type || 'application/octet-stream' },
+          body: file
+        })
+        if (response.ok) {
+          const asset = await response.json()
+          setFormData(prev => ({ ...prev, [field]: asset.url }))
         }
-        reader.readAsDataURL(file)
+      } catch (error) {
+        console.error('Error uploading image:', error)
       }
     }
     input.click()
@@ -1,6 +1,6 @@
 'use client'
 
-import { useEffect, useRef } from 'react'
+import { useEffect, useState } from 'react'
 import { Button } from '@/components/ui/button'
 import {
   Dialog,
@@ -9,70 +9,53 @@ import {
   DialogTitle,
 } from '@/components/ui/dialog'
 import { Download, Printer } from 'lucide-react'
+import { formatMoney } from '@/lib/money'
 
-export default function PDFGenerator({ open, onClose, data, type }) {
-  const contentRef = useRef(null)
+export default function PDFGenerator({ open, onClose, data: summary, type }) {
+  const [record, setRecord] = useState(null)
+  const [downloading, setDownloading] = useState(false)
 
+  // List rows only carry a projection of the company, so load the full
+  // document (with address, signature and seal) for the preview
   useEffect(() => {
-    if (open && data) {
-      // Dynamically import PDF libraries only when needed
-      const loadPDFLibraries = async () => {
-        try {
-          const [jsPDF, html2canvas] = await Promise.all([
-            import('jspdf').then(mod => mod.default),
-            import('html2canvas').then(mod => mod.default)
-          ])
-          
-          // Store in window for later use
-          window.jsPDF = jsPDF
-          window.html2canvas = html2canvas
-        } catch (error) {
-          console.error('Failed to load PDF libraries:', error)
-        }
-      }
-      
-      loadPDFLibraries()
-    }
-  }, [open, data])
+    setRecord(null)
+    if (!open || !summary) return
+
+    const resource = type === 'quote' ? 'quotes' : 'purchase-orders'
+    fetch(`/api/${resource}/${summary.id}`)
+      .then(response => response.ok ? response.json() : null)
+      .then(setRecord)
+      .catch(error => console.error('Error loading document:', error))
+  }, [open, summary, type])
 
+  const data = record || summary
+
+  // The PDF is rendered on the server as a vector document with real page
+  // breaks; the preview below is only for on-screen viewing and printing
   const generatePDF = async () => {
-    if (!window.jsPDF || !window.html2canvas || !contentRef.current) {
-      console.error('PDF libraries not loaded')
-      return
-    }
+    const resource = type === 'quote' ? 'quotes' : 'purchase-orders'
 
     try {
-      const canvas = await window.html2canvas(contentRef.current, {
-        scale: 1.5,
-        useCORS: true,
-        allowTaint: true,
-        backgroundColor: '#ffffff',
-        width: contentRef.current.scrollWidth,
-        height: contentRef.current.scrollHeight
-      })
+      setDownloading(true)
+      const response = await fetch(`/api/${resource}/${data.id}/pdf`)
+      if (!response.ok) throw new Error(`PDF request failed with status ${response.status}`)
 
-      const imgData = canvas.toDataURL('image/png')
-      const pdf = new window.jsPDF('p', 'mm', 'a4')
-      
-      const imgWidth = 210 // A4 width in mm
-      const imgHeight = (canvas.height * imgWidth) / canvas.width
-      
-      // Try to fit on single page first
-      if (imgHeight <= 295) { // A4 height - margins
-        pdf.addImage(imgData, 'PNG', 0, 0, imgWidth, imgHeight)
-      } else {
-        // If content is too long, scale it down to fit on one page
-        const scaledHeight = 290 // Leave some margin
-        pdf.addImage(imgData, 'PNG', 0, 5, imgWidth, scaledHeight)
-      }
+      const blob = await response.blob()
+      const disposition = response.headers.get('Content-Disposition') || ''
+      const filename = /filename="([^"]+)"/.exec(disposition)?.[1] || `${resource}_${data.id}.pdf`
 
-      const filename = type === 'quote' 
-        ? `Quote_${data.quoteNumber}_${new Date().toISOString().split('T')[0]}.pdf`
-        : `PurchaseOrder_${data.poNumber}_${new Date().toISOString().split('T')[0]}.pdf`
-
-      pdf.save(filename)
+      const href = URL.createObjectURL(blob)
+      const link = document.createElement('a')
+      link.href = href
+      link.download = filename
+      link.click()
+      // Firefox and Safari cancel the download if the URL is revoked before
+      // it has started
+      setTimeout(() => URL.revokeObjectURL(href), 1000)
     } catch (error) {
       console.error('Error generating PDF:', error)
+    } finally {
+      setDownloading(false)
     }
   }
 
@@ -80,13 +63,6 @@ export default function PDFGenerator({ open, onClose, data, type }) {
     window.print()
   }
 
-  const formatCurrency = (amount) => {
-    return new Intl.NumberFormat('en-US', {
-      style: 'currency',
-      currency: 'USD'
-    }).format(amount)
-  }
-
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString('en-US', {
       year: 'numeric',
@@ -97,13 +73,10 @@ export default function PDFGenerator({ open, onClose, data, type }) {
 
   if (!data) return null
 
-  const items = typeof data.items === 'string' ? JSON.parse(data.items || '[]') : data.items || []
+  const items = data.items || []
   const company = data.companies || {}
-  
-  // Debug logging
-  console.log('PDFGenerator - Company data:', company)
-  console.log('PDFGenerator - Has signature:', !!company.signature)
-  console.log('PDFGenerator - Has seal:', !!company.seal)
+  // List rows carry only the logo's asset URL until the full record arrives
+  const logo = company.logo || company.logoUrl
 
   return (
     <Dialog open={open} onOpenChange={onClose}>
@@ -118,21 +91,21 @@ export default function PDFGenerator({ open, onClose, data, type }) {
                 <Printer className="h-4 w-4 mr-2" />
                 Print
               </Button>
-              <Button onClick={generatePDF} size="sm">
+              <Button onClick={generatePDF} size="sm" disabled={downloading}>
                 <Download className="h-4 w-4 mr-2" />
-                Download PDF
+                {downloading ? 'Preparing...' : 'Download PDF'}
               </Button>
             </div>
           </DialogTitle>
         </DialogHeader>
 
-        <div ref={contentRef} className="bg-white p-6 text-black max-w-4xl">
+        <div className="bg-white p-6 text-black max-w-4xl">
           {/* Header */}
           <div className="flex justify-between items-start mb-6">
             <div className="flex items-start space-x-4">
-              {company.logo && (
+              {logo && (
                 <img 
-                  src={company.logo} 
+                  src={logo} 
                   alt={`${company.name} logo`}
                   className="w-16 h-16 object-contain"
                 />
@@ -201,10 +174,10 @@ export default function PDFGenerator({ open, onClose, data, type }) {
                       {item.quantity}
                     </td>
                     <td className="border border-gray-300 px-3 py-2 text-right text-gray-900">
-                      {formatCurrency(item.price)}
+                      {formatMoney(item.price)}
                     </td>
                     <td className="border border-gray-300 px-3 py-2 text-right font-medium text-gray-900">
-                      {formatCurrency(item.total)}
+                      {formatMoney(item.total)}
                     </td>
                   </tr>
                 ))}
@@ -219,16 +192,16 @@ export default function PDFGenerator({ open, onClose, data, type }) {
                 <div className="space-y-1">
                   <div className="flex justify-between">
                     <span className="text-gray-700">Subtotal:</span>
-                    <span className="font-medium text-gray-900">{formatCurrency(data.subtotal)}</span>
+                    <span className="font-medium text-gray-900">{formatMoney(data.subtotal)}</span>
                   </div>
                   <div className="flex justify-between">
                     <span className="text-gray-700">VAT ({data.vatRate}%):</span>
-                    <span className="font-medium text-gray-900">{formatCurrency(data.vatAmount)}</span>
+                    <span className="font-medium text-gray-900">{formatMoney(data.vatAmount)}</span>
                   </div>
                   <div className="border-t border-gray-300 pt-1 mt-1">
                     <div className="flex justify-between">
                       <span className="text-sm font-semibold text-gray-900">Total:</span>
-                      <span className="text-sm font-bold text-gray-900">{formatCurrency(data.totalAmount)}</span>
+                      <span className="text-sm font-bold text-gray-900">{formatMoney(data.totalAmount)}</span>
                     </div>
                   </div>
                 </div>
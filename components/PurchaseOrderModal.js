@@ -14,6 +14,7 @@ import {
   DialogTitle,
 } from '@/components/ui/dialog'
 import { ShoppingCart, Plus, Trash2, Calculator } from 'lucide-react'
+import { computeTotals, formatMoney } from '@/lib/money'
 
 export default function PurchaseOrderModal({ open, onClose, data, companies, onSuccess }) {
   const [formData, setFormData] = useState({
@@ -33,10 +34,12 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
     status: 'pending'
   })
   const [loading, setLoading] = useState(false)
+  // Why the amounts can't be computed from the items as entered, if they can't
+  const [totalsError, setTotalsError] = useState(null)
 
   useEffect(() => {
     if (data) {
-      const items = typeof data.items === 'string' ? JSON.parse(data.items || '[]') : data.items || []
+      const items = data.items || []
       setFormData({
         ...data,
         items
@@ -45,7 +48,7 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
       setFormData({
         companyId: '',
         quoteId: null,
-        poNumber: `PO-${Date.now()}`,
+        poNumber: '',
         quoteNumber: '',
         billTo: '',
         billToAddress: '',
@@ -59,23 +62,23 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
         status: 'pending'
       })
     }
+    setTotalsError(null)
   }, [data, open])
 
+  // Item totals, subtotal and VAT in exact minor units (lib/money.js); the
+  // server recomputes them the same way on save
   const calculateTotals = (items, vatRate) => {
-    const subtotal = items.reduce((sum, item) => sum + (item.total || 0), 0)
-    const vatAmount = (subtotal * vatRate) / 100
-    const totalAmount = subtotal + vatAmount
-    return { subtotal, vatAmount, totalAmount }
+    const totals = computeTotals(items, vatRate)
+    setTotalsError(totals.error || null)
+    return totals.error ? { items } : totals
   }
 
+  // Amounts computed from invalid items would be stale, so none are shown
+  const displayAmount = (amount) => totalsError ? '—' : formatMoney(amount)
+
   const updateItem = (index, field, value) => {
     const newItems = [...formData.items]
-    newItems[index][field] = value
-    
-    // Calculate item total
-    if (field === 'quantity' || field === 'price') {
-      newItems[index].total = (newItems[index].quantity || 0) * (newItems[index].price || 0)
-    }
+    newItems[index] = { ...newItems[index], [field]: value }
     
     const totals = calculateTotals(newItems, formData.vatRate)
     setFormData({
@@ -124,7 +127,7 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
       })
 
       if (response.ok) {
-        onSuccess()
+        onSuccess(await response.json())
         onClose()
       }
     } catch (error) {
@@ -134,13 +137,6 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
     }
   }
 
-  const formatCurrency = (amount) => {
-    return new Intl.NumberFormat('en-US', {
-      style: 'currency',
-      currency: 'USD'
-    }).format(amount)
-  }
-
   const statusOptions = [
     { value: 'pending', label: 'Pending' },
     { value: 'approved', label: 'Approved' },
@@ -187,13 +183,13 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
                 </div>
 
                 <div className="space-y-2">
-                  <Label htmlFor="poNumber">PO Number *</Label>
+                  <Label htmlFor="poNumber">PO Number{data ? ' *' : ''}</Label>
                   <Input
                     id="poNumber"
                     value={formData.poNumber}
                     onChange={(e) => setFormData({ ...formData, poNumber: e.target.value })}
-                    placeholder="PO-12345"
-                    required
+                    placeholder={data ? 'PO-12345' : 'Assigned when saved'}
+                    required={!!data}
                   />
                 </div>
 
@@ -316,7 +312,7 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
                   <div className="col-span-2 space-y-2">
                     <Label>Total</Label>
                     <Input
-                      value={formatCurrency(item.total || 0)}
+                      value={displayAmount(item.total || 0)}
                       readOnly
                       className="bg-muted"
                     />
@@ -352,7 +348,7 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
                 <div className="space-y-2">
                   <Label>Subtotal</Label>
                   <Input
-                    value={formatCurrency(formData.subtotal)}
+                    value={displayAmount(formData.subtotal)}
                     readOnly
                     className="bg-muted text-right font-medium"
                   />
@@ -375,7 +371,7 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
                 <div className="space-y-2">
                   <Label>VAT Amount</Label>
                   <Input
-                    value={formatCurrency(formData.vatAmount)}
+                    value={displayAmount(formData.vatAmount)}
                     readOnly
                     className="bg-muted text-right font-medium"
                   />
@@ -386,9 +382,14 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
                 <div className="flex justify-between items-center">
                   <Label className="text-lg font-semibold">Total Amount</Label>
                   <div className="text-2xl font-bold text-primary">
-                    {formatCurrency(formData.totalAmount)}
+                    {displayAmount(formData.totalAmount)}
                   </div>
                 </div>
+                {totalsError && (
+                  <p className="mt-2 text-sm text-destructive">
+                    Totals can't be computed: {totalsError}
+                  </p>
+                )}
               </div>
             </CardContent>
           </Card>
@@ -420,7 +421,7 @@ export default function PurchaseOrderModal({ open, onClose, data, companies, onS
             </Button>
             <Button
               type="submit"
-              disabled={loading || !formData.companyId || !formData.poNumber.trim()}
+              disabled={loading || Boolean(totalsError) || !formData.companyId || (data && !formData.poNumber.trim())}
               className="min-w-[140px]"
             >
               {loading ? 'Saving...' : data ? 'Update Purchase Order' : 'Create Purchase Order'}
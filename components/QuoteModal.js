@@ -14,6 +14,7 @@ import {
   DialogTitle,
 } from '@/components/ui/dialog'
 import { FileText, Plus, Trash2, Calculator } from 'lucide-react'
+import { computeTotals, formatMoney } from '@/lib/money'
 
 export default function QuoteModal({ open, onClose, data, companies, onSuccess }) {
   const [formData, setFormData] = useState({
@@ -31,10 +32,12 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
     notes: ''
   })
   const [loading, setLoading] = useState(false)
+  // Why the amounts can't be computed from the items as entered, if they can't
+  const [totalsError, setTotalsError] = useState(null)
 
   useEffect(() => {
     if (data) {
-      const items = typeof data.items === 'string' ? JSON.parse(data.items || '[]') : data.items || []
+      const items = data.items || []
       setFormData({
         ...data,
         items
@@ -42,7 +45,7 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
     } else {
       setFormData({
         companyId: '',
-        quoteNumber: `Q-${Date.now()}`,
+        quoteNumber: '',
         poNumber: '',
         billTo: '',
         billToAddress: '',
@@ -55,23 +58,23 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
         notes: ''
       })
     }
+    setTotalsError(null)
   }, [data, open])
 
+  // Item totals, subtotal and VAT in exact minor units (lib/money.js); the
+  // server recomputes them the same way on save
   const calculateTotals = (items, vatRate) => {
-    const subtotal = items.reduce((sum, item) => sum + (item.total || 0), 0)
-    const vatAmount = (subtotal * vatRate) / 100
-    const totalAmount = subtotal + vatAmount
-    return { subtotal, vatAmount, totalAmount }
+    const totals = computeTotals(items, vatRate)
+    setTotalsError(totals.error || null)
+    return totals.error ? { items } : totals
   }
 
+  // Amounts computed from invalid items would be stale, so none are shown
+  const displayAmount = (amount) => totalsError ? '—' : formatMoney(amount)
+
   const updateItem = (index, field, value) => {
     const newItems = [...formData.items]
-    newItems[index][field] = value
-    
-    // Calculate item total
-    if (field === 'quantity' || field === 'price') {
-      newItems[index].total = (newItems[index].quantity || 0) * (newItems[index].price || 0)
-    }
+    newItems[index] = { ...newItems[index], [field]: value }
     
     const totals = calculateTotals(newItems, formData.vatRate)
     setFormData({
@@ -120,7 +123,7 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
       })
 
       if (response.ok) {
-        onSuccess()
+        onSuccess(await response.json())
         onClose()
       }
     } catch (error) {
@@ -130,13 +133,6 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
     }
   }
 
-  const formatCurrency = (amount) => {
-    return new Intl.NumberFormat('en-US', {
-      style: 'currency',
-      currency: 'USD'
-    }).format(amount)
-  }
-
   return (
     <Dialog open={open} onOpenChange={onClose}>
       <DialogContent className="sm:max-w-[900px] max-h-[90vh] overflow-y-auto">
@@ -176,13 +172,13 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
                 </div>
 
                 <div className="space-y-2">
-                  <Label htmlFor="quoteNumber">Quote Number *</Label>
+                  <Label htmlFor="quoteNumber">Quote Number{data ? ' *' : ''}</Label>
                   <Input
                     id="quoteNumber"
                     value={formData.quoteNumber}
                     onChange={(e) => setFormData({ ...formData, quoteNumber: e.target.value })}
-                    placeholder="Q-12345"
-                    required
+                    placeholder={data ? 'Q-12345' : 'Assigned when saved'}
+                    required={!!data}
                   />
                 </div>
 
@@ -286,7 +282,7 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
                   <div className="col-span-2 space-y-2">
                     <Label>Total</Label>
                     <Input
-                      value={formatCurrency(item.total || 0)}
+                      value={displayAmount(item.total || 0)}
                       readOnly
                       className="bg-muted"
                     />
@@ -322,7 +318,7 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
                 <div className="space-y-2">
                   <Label>Subtotal</Label>
                   <Input
-                    value={formatCurrency(formData.subtotal)}
+                    value={displayAmount(formData.subtotal)}
                     readOnly
                     className="bg-muted text-right font-medium"
                   />
@@ -345,7 +341,7 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
                 <div className="space-y-2">
                   <Label>VAT Amount</Label>
                   <Input
-                    value={formatCurrency(formData.vatAmount)}
+                    value={displayAmount(formData.vatAmount)}
                     readOnly
                     className="bg-muted text-right font-medium"
                   />
@@ -356,9 +352,14 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
                 <div className="flex justify-between items-center">
                   <Label className="text-lg font-semibold">Total Amount</Label>
                   <div className="text-2xl font-bold text-primary">
-                    {formatCurrency(formData.totalAmount)}
+                    {displayAmount(formData.totalAmount)}
                   </div>
                 </div>
+                {totalsError && (
+                  <p className="mt-2 text-sm text-destructive">
+                    Totals can't be computed: {totalsError}
+                  </p>
+                )}
               </div>
             </CardContent>
           </Card>
@@ -390,7 +391,7 @@ export default function QuoteModal({ open, onClose, data, companies, onSuccess }
             </Button>
             <Button
               type="submit"
-              disabled={loading || !formData.companyId || !formData.quoteNumber.trim()}
+              disabled={loading || Boolean(totalsError) || !formData.companyId || (data && !formData.quoteNumber.trim())}
               className="min-w-[120px]"
             >
               {loading ? 'Saving...' : data ? 'Update Quote' : 'Create Quote'}
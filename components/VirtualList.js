@@ -0,0 +1,129 @@
+'use client'
+
+import { useCallback, useEffect, useLayoutEffect, useRef, useState } from 'react'
+
+// A mounted row, reporting its rendered height whenever it changes
+function MeasuredRow({ rowKey, onMeasure, children, ...props }) {
+  const ref = useRef(null)
+
+  useLayoutEffect(() => {
+    const node = ref.current
+    onMeasure(rowKey, node.offsetHeight)
+    if (typeof ResizeObserver === 'undefined') return
+    const observer = new ResizeObserver(() => onMeasure(rowKey, node.offsetHeight))
+    observer.observe(node)
+    return () => observer.disconnect()
+  }, [rowKey, onMeasure])
+
+  return <div ref={ref} {...props}>{children}</div>
+}
+
+// Index of the first of the ascending `offsets` above `value`
+const firstAbove = (offsets, value) => {
+  let low = 0
+  let high = offsets.length
+  while (low < high) {
+    const middle = (low + high) >> 1
+    if (offsets[middle] > value) high = middle
+    else low = middle + 1
+  }
+  return low
+}
+
+// Windowed list: only the rows in view, plus `overscan` rows above and
+// below, are mounted, so the DOM stays the same size however many items are
+// loaded. Rows are as tall as their content: each mounted row is measured,
+// and rows not yet rendered count as `estimatedRowHeight`. With
+// `minColumnWidth` the items are laid out in as many columns as fit the
+// container. `onEndReached` is called when the view comes within
+// `endThreshold` rows of the end of the loaded items, to fetch the next page.
+export default function VirtualList({
+  name,
+  items,
+  renderItem,
+  estimatedRowHeight,
+  gap = 16,
+  minColumnWidth,
+  overscan = 3,
+  height = '70vh',
+  hasMore = false,
+  loading = false,
+  onEndReached,
+  endThreshold = 5
+}) {
+  const containerRef = useRef(null)
+  const [viewport, setViewport] = useState({ scrollTop: 0, height: 0, width: 0 })
+  const heights = useRef(new Map())
+  const [, setMeasured] = useState(0)
+
+  const onMeasure = useCallback((key, height) => {
+    if (heights.current.get(key) === height) return
+    heights.current.set(key, height)
+    setMeasured(count => count + 1)
+  }, [])
+
+  useEffect(() => {
+    const container = containerRef.current
+    const measure = () => {
+      setViewport(prev => ({ ...prev, height: container.clientHeight, width: container.clientWidth }))
+    }
+    measure()
+    if (typeof ResizeObserver === 'undefined') return
+    const observer = new ResizeObserver(measure)
+    observer.observe(container)
+    return () => observer.disconnect()
+  }, [])
+
+  const columns = minColumnWidth
+    ? Math.max(1, Math.floor((viewport.width + gap) / (minColumnWidth + gap)))
+    : 1
+  const rowCount = Math.ceil(items.length / columns)
+  // Rows regroup when the column count changes, so heights are kept per
+  // column count and first item
+  const rowKey = (row) => `${columns}:${items[row * columns].id}`
+  const tops = [0]
+  for (let row = 0; row < rowCount; row++) {
+    tops.push(tops[row] + (heights.current.get(rowKey(row)) ?? estimatedRowHeight) + gap)
+  }
+  const first = Math.max(0, firstAbove(tops, viewport.scrollTop) - 1 - overscan)
+  const last = Math.min(rowCount, firstAbove(tops, viewport.scrollTop + viewport.height) + overscan)
+
+  useEffect(() => {
+    if (hasMore && !loading && last >= rowCount - endThreshold) onEndReached?.()
+  }, [hasMore, loading, last, rowCount])
+
+  const rows = []
+  for (let row = first; row < last; row++) {
+    const rowItems = items.slice(row * columns, (row + 1) * columns)
+    rows.push(
+      <MeasuredRow
+        key={rowItems[0].id}
+        rowKey={rowKey(row)}
+        onMeasure={onMeasure}
+        data-row
+        className="absolute inset-x-0 grid"
+        style={{ top: tops[row], gap, gridTemplateColumns: `repeat(${columns}, minmax(0, 1fr))` }}
+      >
+        {rowItems.map(item => <div key={item.id} className="min-w-0">{renderItem(item)}</div>)}
+      </MeasuredRow>
+    )
+  }
+
+  return (
+    <div
+      ref={containerRef}
+      data-virtual-list={name}
+      className="overflow-y-auto"
+      style={{ height }}
+      onScroll={event => {
+        const { scrollTop } = event.currentTarget
+        setViewport(prev => ({ ...prev, scrollTop }))
+      }}
+    >
+      <div className="relative" style={{ height: Math.max(0, tops[rowCount] - gap) }}>
+        {rows}
+      </div>
+      {loading && <p className="text-center py-4 text-sm text-muted-foreground">Loading...</p>}
+    </div>
+  )
+}
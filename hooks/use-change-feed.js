@@ -0,0 +1,20 @@
+'use client'
+
+import { useEffect, useRef } from 'react'
+
+// Subscribe to the API change feed (GET /api/changes). `onChange` receives
+// each row-level change; `onReset` is called when the server cannot replay
+// what was missed while disconnected, and the caller should reload.
+// EventSource reconnects by itself and resumes after the last event it saw.
+export function useChangeFeed(onChange, onReset) {
+  const handlers = useRef({ onChange, onReset })
+  handlers.current = { onChange, onReset }
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return
+    const source = new EventSource('/api/changes')
+    source.onmessage = (event) => handlers.current.onChange(JSON.parse(event.data))
+    source.addEventListener('reset', () => handlers.current.onReset())
+    return () => source.close()
+  }, [])
+}
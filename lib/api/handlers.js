@@ -0,0 +1,374 @@
+import { NextResponse } from 'next/server'
+import { supabase, inChunks } from '../supabase.js'
+import { parsePageParams, paginate, toPage } from '../pagination.js'
+import { COUNT_SELECT, invalidUpdate, listFields, newRow, parseFields, pickWritable, withLogoUrl } from '../fields.js'
+import { parseFilters, applyFilters } from '../filters.js'
+import {
+  ASSET_PREFIX,
+  IMMUTABLE_CACHE_CONTROL,
+  isAssetHash,
+  parseDataUrl,
+  sniffImageType,
+  loadAsset,
+  storeAsset,
+  storeInlineAssets,
+  unsupportedInlineImage
+} from '../assets.js'
+import { isItemList, createDocument, updateDocument } from '../items.js'
+import { parseBatch, runBatch } from '../batch.js'
+import { getDashboardSummary, invalidateDashboardSummary } from '../dashboard.js'
+import { getDocument, invalidateDocument, invalidateDocuments } from '../records.js'
+import { renderMetrics, METRICS_CONTENT_TYPE } from '../metrics.js'
+import { parseExportRequest, createExportJob, getExportJob, exportStatus, deleteExportJob } from '../exports.js'
+import { convertQuote } from '../conversion.js'
+import { affectsTotals, priceDocument, loadPricing } from '../pricing.js'
+import { TRANSFER_FORMATS, parseFormat, exportStream, importStream } from '../transfer.js'
+import { publishChange, changeStream } from '../changes.js'
+import {
+  jsonResponse,
+  databaseError,
+  matchesEtag,
+  documentResponse,
+  pdfResponse,
+  imageResponse,
+  imageBytesResponse,
+  unsupportedImage,
+  exportDownload
+} from './responses.js'
+
+// Route handlers. Each takes { request, url, searchParams, params } and
+// returns a response; the router in lib/api/routes.js picks one per request.
+
+// Called after every successful write to a company, quote or purchase order;
+// without an id, after a batch write to the table
+const afterWrite = (table, id) => {
+  invalidateDashboardSummary()
+  if (table === 'companies') {
+    // Quotes and purchase orders embed their company
+    invalidateDocuments()
+  } else if (id) {
+    invalidateDocument(table, id)
+  } else {
+    invalidateDocuments(table)
+  }
+}
+
+// Written rows as the change feed carries them: shaped like list rows, less
+// the embedded company and image columns (the dashboard has its companies)
+const feedRow = (row, assetColumns = []) => {
+  const { companies, ...rest } = row
+  for (const column of assetColumns) delete rest[column]
+  return rest
+}
+
+// Health check endpoint
+export const health = () => jsonResponse({ status: 'OK', timestamp: new Date().toISOString() })
+
+// Metrics in the Prometheus text format
+export const metrics = () => {
+  return new NextResponse(renderMetrics(), { headers: { 'Content-Type': METRICS_CONTENT_TYPE } })
+}
+
+// Dashboard summary: totals and per-company rollups in one request
+export const dashboardSummary = async () => {
+  const { summary, cached } = await getDashboardSummary()
+  return jsonResponse(summary, { headers: { 'X-Cache': cached ? 'HIT' : 'MISS' } })
+}
+
+// Change feed: row-level changes as Server-Sent Events (lib/changes.js)
+export const changes = ({ request }) => {
+  return new NextResponse(changeStream(request.headers.get('last-event-id'), request.signal), {
+    headers: {
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      'X-Accel-Buffering': 'no'
+    }
+  })
+}
+
+// Exports API: start a bulk PDF export for a company or date range
+export const startExport = async ({ request }) => {
+  const parsed = parseExportRequest(await request.json())
+  if (parsed.error) return jsonResponse({ error: parsed.error }, { status: 400 })
+  return jsonResponse(exportStatus(createExportJob(parsed)), { status: 202 })
+}
+
+// Job progress and archive download
+export const exportProgress = ({ params }) => {
+  const job = getExportJob(params.id)
+  if (!job) return jsonResponse({ error: 'Export not found' }, { status: 404 })
+  return jsonResponse(exportStatus(job))
+}
+
+export const downloadExport = ({ params }) => {
+  const job = getExportJob(params.id)
+  if (!job) return jsonResponse({ error: 'Export not found' }, { status: 404 })
+  return exportDownload(job)
+}
+
+// Cancel a running export or discard a finished one
+export const cancelExport = async ({ params }) => {
+  if (!(await deleteExportJob(params.id))) return jsonResponse({ error: 'Export not found' }, { status: 404 })
+  return jsonResponse({ success: true })
+}
+
+// Assets API (content-addressed, so responses never change)
+export const getAsset = async ({ request, params }) => {
+  const { hash } = params
+  if (!isAssetHash(hash)) return jsonResponse({ error: 'Asset not found' }, { status: 404 })
+
+  const headers = { 'Cache-Control': IMMUTABLE_CACHE_CONTROL, 'ETag': `"${hash}"` }
+  if (matchesEtag(request, headers.ETag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  const asset = await loadAsset(hash)
+  if (!asset) return jsonResponse({ error: 'Asset not found' }, { status: 404 })
+  return imageBytesResponse(asset.bytes, headers)
+}
+
+// Accepts raw image bytes or a JSON { dataUrl }. Only PNG, JPEG, WebP and GIF
+// are stored, whatever type the client claims.
+export const uploadAsset = async ({ request }) => {
+  const contentType = request.headers.get('content-type') || ''
+  const bytes = contentType.startsWith('application/json')
+    ? parseDataUrl((await request.json()).dataUrl)?.bytes
+    : Buffer.from(await request.arrayBuffer())
+  if (!bytes || !bytes.length) return jsonResponse({ error: 'Image data required' }, { status: 400 })
+  if (!sniffImageType(bytes)) return unsupportedImage()
+
+  return jsonResponse(await storeAsset(bytes))
+}
+
+export const missingId = (action) => () => {
+  return jsonResponse({ error: `ID required for ${action}` }, { status: 400 })
+}
+
+// Handlers for one resource of the registry (lib/api/resources.js)
+export const resourceHandlers = (resource) => {
+  const { table } = resource
+  const fields = listFields(resource)
+  const hasItems = resource.jsonFields.includes('items')
+
+  const afterDelete = (id) => {
+    afterWrite(table, id)
+    // Rows that referenced the deleted ones now hold a null reference
+    for (const other of resource.referencedBy || []) invalidateDocuments(other)
+  }
+
+  const announce = (op, row) => {
+    publishChange({ table, op, id: row.id, row: feedRow(resource.present(row), resource.assetColumns) })
+  }
+
+  // Batch results carry only ids, so the written rows are read back for the feed
+  const announceBatch = async (results) => {
+    const ops = new Map()
+    for (const result of results.create) if (result.status === 'created') ops.set(result.id, 'insert')
+    for (const result of results.update) if (result.status === 'updated') ops.set(result.id, 'update')
+    const { data, error } = await inChunks([...ops.keys()], chunk => (
+      supabase.from(table).select(fields.select).in('id', chunk)
+    ))
+    if (error) publishChange({ table, op: 'reload' })
+    else for (const row of data) announce(ops.get(row.id), row)
+    for (const result of results.delete) {
+      if (result.status === 'deleted') publishChange({ table, op: 'delete', id: result.id })
+    }
+  }
+
+  return {
+    // Get a page of rows
+    async list({ searchParams }) {
+      const page = parsePageParams(searchParams)
+      if (page.error) return jsonResponse({ error: page.error }, { status: 400 })
+      const parsed = parseFields(fields, searchParams)
+      if (parsed.error) return jsonResponse({ error: parsed.error }, { status: 400 })
+
+      let select = parsed.select
+      // withCounts=true adds quoteCount and purchaseOrderCount per company
+      if (resource.withCounts && searchParams.get('withCounts') === 'true') select = `${select},${COUNT_SELECT}`
+
+      let query = supabase.from(table).select(select)
+      if (resource.filters) {
+        const filter = parseFilters(table, searchParams)
+        if (filter.error) return jsonResponse({ error: filter.error }, { status: 400 })
+        query = applyFilters(query, filter.filters)
+      }
+
+      const { data, error } = await paginate(query, page)
+      if (error) return databaseError(error)
+      return jsonResponse(toPage((data || []).map(resource.present), page.limit))
+    },
+
+    // Get one row
+    async get({ request, params }) {
+      if (resource.cached) return documentResponse(request, table, params.id)
+
+      const { data, error } = await supabase
+        .from(table)
+        .select('*')
+        .eq('id', params.id)
+        .single()
+
+      if (error) return databaseError(error)
+      return jsonResponse(withLogoUrl(data) || {})
+    },
+
+    // Get an image column: a redirect to the asset store, or legacy data-URL bytes
+    image(column) {
+      return async ({ request, searchParams, params }) => {
+        const { data, error } = await supabase
+          .from(table)
+          .select(column)
+          .eq('id', params.id)
+          .maybeSingle()
+
+        if (error) return databaseError(error)
+        const image = data?.[column]
+        if (image?.startsWith(ASSET_PREFIX)) {
+          return NextResponse.redirect(new URL(image, request.url), 308)
+        }
+        return imageResponse(request, image, searchParams.has('v'))
+      }
+    },
+
+    pdf({ request, params }) {
+      return pdfResponse(request, table, resource.pdf, params.id)
+    },
+
+    async create({ request }) {
+      const body = await request.json()
+      let row = newRow(table, body)
+      if (resource.assetColumns) {
+        if (unsupportedInlineImage(row, resource.assetColumns)) return unsupportedImage()
+        row = await storeInlineAssets(row, resource.assetColumns)
+      }
+
+      let items = body.items || []
+      if (hasItems) {
+        if (!isItemList(items)) return jsonResponse({ error: 'items must be a list of objects' }, { status: 400 })
+        // Amounts are computed from the line items (lib/pricing.js)
+        const priced = priceDocument(row, items)
+        if (priced.error) return jsonResponse({ error: priced.error }, { status: 400 })
+        row = priced.row
+        items = priced.items
+      }
+
+      // A document and its items are inserted together, so a failed item
+      // insert leaves no document behind
+      const { data, error } = hasItems
+        ? await createDocument(table, row, items)
+        : await supabase.from(table).insert([row]).select().single()
+
+      if (error) return databaseError(error)
+      afterWrite(table, data.id)
+      announce('insert', data)
+      return jsonResponse(data)
+    },
+
+    async update({ request, params }) {
+      const body = await request.json()
+      const { id } = params
+      let items = body.items
+      if (hasItems && items !== undefined && !isItemList(items)) {
+        return jsonResponse({ error: 'items must be a list of objects' }, { status: 400 })
+      }
+      let updateData = pickWritable(table, body)
+      const invalid = invalidUpdate(table, updateData)
+      if (invalid) return jsonResponse({ error: invalid }, { status: 400 })
+      if (resource.assetColumns && unsupportedInlineImage(updateData, resource.assetColumns)) {
+        return unsupportedImage()
+      }
+      if (hasItems && affectsTotals(body)) {
+        const current = (await loadPricing(table, [id])).get(id)
+        if (!current) return jsonResponse({ error: 'Not found' }, { status: 404 })
+        const priced = priceDocument({ vatRate: current.vatRate, ...updateData }, items ?? current.items)
+        if (priced.error) return jsonResponse({ error: priced.error }, { status: 400 })
+        updateData = priced.row
+        if (items !== undefined) items = priced.items
+      }
+      if (resource.assetColumns) updateData = await storeInlineAssets(updateData, resource.assetColumns)
+      updateData.updatedAt = new Date().toISOString()
+
+      // The row and its items are written together, so a failed update (a
+      // duplicate document number, say) leaves the old items in place
+      const { data: updated, error } = hasItems
+        ? await updateDocument(table, id, updateData, items)
+        : await supabase.from(table).update(updateData).eq('id', id).select('*').maybeSingle()
+
+      if (error) return databaseError(error)
+      if (!updated) return jsonResponse({ error: 'Not found' }, { status: 404 })
+      afterWrite(table, id)
+      announce('update', updated)
+      return jsonResponse(updated)
+    },
+
+    async remove({ params }) {
+      const { error } = await supabase
+        .from(table)
+        .delete()
+        .eq('id', params.id)
+
+      if (error) return databaseError(error)
+      afterDelete(params.id)
+      publishChange({ table, op: 'delete', id: params.id })
+      return jsonResponse({ success: true })
+    },
+
+    // Batch API: bulk create, update and delete with per-item results
+    async batch({ request }) {
+      const parsed = parseBatch(await request.json())
+      if (parsed.error) return jsonResponse({ error: parsed.error }, { status: parsed.status || 400 })
+
+      const results = await runBatch(table, parsed.batch)
+      if (results.succeeded) {
+        if (parsed.batch.delete.length) afterDelete()
+        else afterWrite(table)
+        await announceBatch(results)
+      }
+      return jsonResponse(results)
+    },
+
+    // Streaming export: every matching row as NDJSON or CSV
+    exportRows({ request, searchParams }) {
+      const format = parseFormat(searchParams.get('format'), request.headers.get('accept') || '')
+      if (!format) return jsonResponse({ error: 'format must be ndjson or csv' }, { status: 400 })
+
+      const parsed = parseFilters(table, searchParams)
+      if (parsed.error) return jsonResponse({ error: parsed.error }, { status: 400 })
+
+      const date = new Date().toISOString().split('T')[0]
+      return new NextResponse(exportStream(table, format, parsed.filters), {
+        headers: {
+          'Content-Type': TRANSFER_FORMATS[format],
+          'Content-Disposition': `attachment; filename="${resource.path}_${date}.${format}"`,
+          'Cache-Control': 'no-store'
+        }
+      })
+    },
+
+    // Streaming import: NDJSON or CSV parsed as it is uploaded
+    async importRows({ request, searchParams }) {
+      const format = parseFormat(searchParams.get('format'), request.headers.get('content-type') || '')
+      if (!format) return jsonResponse({ error: 'format must be ndjson or csv' }, { status: 400 })
+
+      const summary = await importStream(table, format, request.body)
+      if (summary.imported) {
+        afterWrite(table)
+        publishChange({ table, op: 'reload' })
+      }
+      return jsonResponse(summary)
+    },
+
+    // Quote conversion: the new purchase order, or the one the quote already became
+    async convert({ params }) {
+      const result = await convertQuote(params.id)
+      if (!result) return jsonResponse({ error: 'Quote not found' }, { status: 404 })
+      if (result.created) afterWrite('purchase_orders', result.id)
+
+      const order = await getDocument('purchase_orders', result.id)
+      if (!order) return jsonResponse({ error: 'Purchase order not found' }, { status: 404 })
+      if (result.created) publishChange({ table: 'purchase_orders', op: 'insert', id: result.id, row: feedRow(order.doc) })
+      return jsonResponse(order.doc, { status: result.created ? 201 : 200 })
+    }
+  }
+}
@@ -0,0 +1,63 @@
+import { BLOB_COLUMNS, COLUMNS, withCounts, withLogoUrl, withCompanyLogoUrl } from '../fields.js'
+import { withItems } from '../items.js'
+
+// Resource registry. Each definition maps an API path to its table and
+// declares the routes and behaviours the resource has; lib/api/routes.js
+// compiles the registry into the router once at startup, so a new resource
+// is one more entry here.
+//
+//   columns       table columns (lib/fields.js)
+//   embeds        relations a list row can embed with fields=
+//   jsonFields    fields exposed as JSON arrays but stored in their own
+//                 table (items, in line_items)
+//   assetColumns  image columns moved to the asset store on write and
+//                 served at /{path}/:id/{column}
+//   withCounts    list rows can carry per-company document counts
+//   cached        single reads go through the document cache with ETags
+//                 (lib/records.js)
+//   filters       list and export accept the lib/filters.js parameters
+//   pdf           document type rendered at /{path}/:id/pdf
+//   transfer      NDJSON/CSV /{path}/export and /{path}/import
+//   convert       /{path}/:id/convert (quotes only)
+//   referencedBy  tables whose cached documents reference this one and go
+//                 stale when a row is deleted
+//   present       shapes a row for a list response
+
+export const RESOURCES = [
+  {
+    path: 'companies',
+    table: 'companies',
+    columns: COLUMNS.companies,
+    embeds: [],
+    jsonFields: [],
+    assetColumns: BLOB_COLUMNS,
+    withCounts: true,
+    present: row => withCounts(withLogoUrl(row))
+  },
+  {
+    path: 'quotes',
+    table: 'quotes',
+    columns: COLUMNS.quotes,
+    embeds: ['companies', 'items'],
+    jsonFields: ['items'],
+    filters: true,
+    cached: true,
+    pdf: 'quote',
+    transfer: true,
+    convert: true,
+    referencedBy: ['purchase_orders'],
+    present: row => withItems(withCompanyLogoUrl(row))
+  },
+  {
+    path: 'purchase-orders',
+    table: 'purchase_orders',
+    columns: COLUMNS.purchase_orders,
+    embeds: ['companies', 'items'],
+    jsonFields: ['items'],
+    filters: true,
+    cached: true,
+    pdf: 'purchase-order',
+    transfer: true,
+    present: row => withItems(withCompanyLogoUrl(row))
+  }
+]
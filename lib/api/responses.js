@@ -0,0 +1,113 @@
+import { NextResponse } from 'next/server'
+import { createHash } from 'crypto'
+import { createReadStream } from 'fs'
+import { stat } from 'fs/promises'
+import { Readable } from 'stream'
+import { IMMUTABLE_CACHE_CONTROL, UNSUPPORTED_IMAGE, parseDataUrl, sniffImageType } from '../assets.js'
+import { getDocumentPdf } from '../pdf.js'
+import { getDocument } from '../records.js'
+import { exportFilename } from '../exports.js'
+import { recordResponseBytes, recordSpan } from '../tracing.js'
+
+// Response helpers shared by the API handlers
+
+// NextResponse.json, with serialization timed into the request's trace
+export const jsonResponse = (body, init = {}) => {
+  const start = process.hrtime.bigint()
+  const text = JSON.stringify(body)
+  recordSpan('serialize', Number(process.hrtime.bigint() - start) / 1e6)
+  recordResponseBytes(Buffer.byteLength(text))
+
+  const headers = new Headers(init.headers)
+  headers.set('Content-Type', 'application/json')
+  return new NextResponse(text, { ...init, headers })
+}
+
+// A duplicate document number (or id) is the client's conflict, not a server error
+export const errorStatus = (error) => error.code === '23505' ? 409 : 500
+
+export const databaseError = (error) => jsonResponse({ error: error.message }, { status: errorStatus(error) })
+
+// If-None-Match may list several tags, or be weak
+export const matchesEtag = (request, etag) => {
+  const header = request.headers.get('if-none-match')
+  if (!header) return false
+  return header.trim() === '*' || header.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag)
+}
+
+export const documentResponse = async (request, table, id) => {
+  const result = await getDocument(table, id)
+  if (!result) return jsonResponse({ error: 'Not found' }, { status: 404 })
+
+  const headers = {
+    'Cache-Control': 'private, no-cache',
+    'ETag': result.etag,
+    'X-Cache': result.cached ? 'HIT' : 'MISS'
+  }
+  if (matchesEtag(request, result.etag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+  return jsonResponse(result.doc, { headers })
+}
+
+export const pdfResponse = async (request, table, type, id) => {
+  const result = await getDocumentPdf(table, type, id)
+  if (!result) return jsonResponse({ error: 'Not found' }, { status: 404 })
+
+  const etag = `"${createHash('sha1').update(result.key).digest('hex')}"`
+  const headers = {
+    'Content-Type': 'application/pdf',
+    'Content-Disposition': `attachment; filename="${result.filename}"`,
+    'Cache-Control': 'private, no-cache',
+    'ETag': etag,
+    'X-Cache': result.cached ? 'HIT' : 'MISS'
+  }
+  if (matchesEtag(request, etag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+  recordResponseBytes(result.bytes.length)
+  return new NextResponse(result.bytes, { headers })
+}
+
+export const unsupportedImage = () => jsonResponse({ error: UNSUPPORTED_IMAGE }, { status: 415 })
+
+// Stored images are served as the type sniffed from their bytes, which the
+// browser must not second-guess, and only if that is an accepted image type
+const IMAGE_HEADERS = { 'X-Content-Type-Options': 'nosniff', 'Content-Disposition': 'inline' }
+
+export const imageBytesResponse = (bytes, headers) => {
+  const mimeType = sniffImageType(bytes)
+  if (!mimeType) return unsupportedImage()
+  recordResponseBytes(bytes.length)
+  return new NextResponse(bytes, { headers: { ...headers, ...IMAGE_HEADERS, 'Content-Type': mimeType } })
+}
+
+// Serve a legacy data-URL image column as raw bytes
+export const imageResponse = (request, dataUrl, versioned) => {
+  const image = parseDataUrl(dataUrl)
+  if (!image) return jsonResponse({ error: 'Image not found' }, { status: 404 })
+
+  const etag = `"${createHash('md5').update(dataUrl).digest('hex')}"`
+  const headers = {
+    'Cache-Control': versioned ? IMMUTABLE_CACHE_CONTROL : 'public, max-age=0, must-revalidate',
+    'ETag': etag
+  }
+  if (matchesEtag(request, etag)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+  return imageBytesResponse(image.bytes, headers)
+}
+
+export const exportDownload = async (job) => {
+  if (job.status !== 'complete') {
+    return jsonResponse({ error: `Export is ${job.status}` }, { status: 409 })
+  }
+  const { size } = await stat(job.file)
+  return new NextResponse(Readable.toWeb(createReadStream(job.file)), {
+    headers: {
+      'Content-Type': 'application/zip',
+      'Content-Length': String(size),
+      'Content-Disposition': `attachment; filename="${exportFilename(job)}"`
+    }
+  })
+}
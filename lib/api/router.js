@@ -0,0 +1,71 @@
+// Compiled route table for the API. Patterns such as '/quotes/:id/pdf' are
+// compiled once into a tree of path segments per method, so matching a
+// request costs one map lookup per segment however many routes exist.
+// Static segments win over parameters: '/quotes/export' is matched before
+// '/quotes/:id'.
+
+const newNode = () => ({ children: new Map(), param: null, handler: null, route: null })
+
+const splitPath = (path) => path.split('/').filter(Boolean)
+
+// Path segments after /api/, e.g. ['quotes', 'abc', 'pdf']; a trailing
+// slash is ignored
+export const apiSegments = (pathname) => {
+  const start = pathname.indexOf('/api/')
+  if (start === -1) return []
+  const parts = pathname.slice(start + 5).split('/')
+  if (parts[parts.length - 1] === '') parts.pop()
+  return parts
+}
+
+const walk = (node, parts, index) => {
+  if (index === parts.length) return node.handler ? { handler: node.handler, route: node.route, params: {} } : null
+
+  const child = node.children.get(parts[index])
+  if (child) {
+    const found = walk(child, parts, index + 1)
+    if (found) return found
+  }
+  if (node.param) {
+    const found = walk(node.param.node, parts, index + 1)
+    if (found) {
+      found.params[node.param.name] = parts[index]
+      return found
+    }
+  }
+  return null
+}
+
+// routes: [method, pattern, handler] triples
+export const createRouter = (routes) => {
+  const trees = new Map()
+
+  for (const [method, pattern, handler] of routes) {
+    if (!trees.has(method)) trees.set(method, newNode())
+    let node = trees.get(method)
+    for (const segment of splitPath(pattern)) {
+      if (segment.startsWith(':')) {
+        const name = segment.slice(1)
+        if (!node.param) node.param = { name, node: newNode() }
+        if (node.param.name !== name) {
+          throw new Error(`${method} ${pattern}: parameter :${name} conflicts with :${node.param.name}`)
+        }
+        node = node.param.node
+      } else {
+        if (!node.children.has(segment)) node.children.set(segment, newNode())
+        node = node.children.get(segment)
+      }
+    }
+    if (node.handler) throw new Error(`Duplicate route ${method} ${pattern}`)
+    node.handler = handler
+    node.route = pattern
+  }
+
+  return {
+    // { handler, route, params } for the request, or null when no route matches
+    match(method, parts) {
+      const tree = trees.get(method)
+      return tree ? walk(tree, parts, 0) : null
+    }
+  }
+}
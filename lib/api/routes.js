@@ -0,0 +1,59 @@
+import { createRouter } from './router.js'
+import { RESOURCES } from './resources.js'
+import {
+  health,
+  metrics,
+  dashboardSummary,
+  changes,
+  startExport,
+  exportProgress,
+  downloadExport,
+  cancelExport,
+  getAsset,
+  uploadAsset,
+  missingId,
+  resourceHandlers
+} from './handlers.js'
+
+// The API's route table, compiled once when the route module loads
+
+const resourceRoutes = (resource) => {
+  const handlers = resourceHandlers(resource)
+  const base = `/${resource.path}`
+  const routes = [
+    ['GET', base, handlers.list],
+    ['GET', `${base}/:id`, handlers.get],
+    ['POST', base, handlers.create],
+    ['POST', `${base}/batch`, handlers.batch],
+    ['PUT', base, missingId('update')],
+    ['PUT', `${base}/:id`, handlers.update],
+    ['DELETE', base, missingId('delete')],
+    ['DELETE', `${base}/:id`, handlers.remove]
+  ]
+  for (const column of resource.assetColumns || []) {
+    routes.push(['GET', `${base}/:id/${column}`, handlers.image(column)])
+  }
+  if (resource.pdf) routes.push(['GET', `${base}/:id/pdf`, handlers.pdf])
+  if (resource.transfer) {
+    routes.push(['GET', `${base}/export`, handlers.exportRows], ['POST', `${base}/import`, handlers.importRows])
+  }
+  if (resource.convert) routes.push(['POST', `${base}/:id/convert`, handlers.convert])
+  return routes
+}
+
+export const ROUTES = [
+  ['GET', '/health', health],
+  ['GET', '/metrics', metrics],
+  ['GET', '/dashboard/summary', dashboardSummary],
+  ['GET', '/changes', changes],
+  ['POST', '/exports', startExport],
+  ['GET', '/exports/:id', exportProgress],
+  ['GET', '/exports/:id/download', downloadExport],
+  ['DELETE', '/exports', missingId('delete')],
+  ['DELETE', '/exports/:id', cancelExport],
+  ['GET', '/assets/:hash', getAsset],
+  ['POST', '/assets', uploadAsset],
+  ...RESOURCES.flatMap(resourceRoutes)
+]
+
+export const router = createRouter(ROUTES)
@@ -0,0 +1,113 @@
+import { createHash } from 'crypto'
+import { supabase } from './supabase.js'
+
+// Content-addressed storage for company images. Each image is stored once,
+// keyed by the SHA-256 of its bytes, and rows reference it by URL.
+
+export const ASSET_PREFIX = '/api/assets/'
+
+export const IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+const ASSET_HASH = /^[0-9a-f]{64}$/
+
+export const isAssetHash = (value) => ASSET_HASH.test(value || '')
+
+export const assetUrl = (hash) => `${ASSET_PREFIX}${hash}`
+
+// The image types the store accepts, recognised by their leading bytes. The
+// type recorded and served is always the sniffed one, never the client's, so
+// nothing but a raster image (no HTML, no SVG) is served from the app origin.
+const IMAGE_SIGNATURES = [
+  ['image/png', [[0, [0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]]]],
+  ['image/jpeg', [[0, [0xff, 0xd8, 0xff]]]],
+  ['image/gif', [[0, [0x47, 0x49, 0x46, 0x38]]]],
+  // RIFF....WEBP
+  ['image/webp', [[0, [0x52, 0x49, 0x46, 0x46]], [8, [0x57, 0x45, 0x42, 0x50]]]]
+]
+
+export const UNSUPPORTED_IMAGE = 'Images must be PNG, JPEG, WebP or GIF'
+
+// The image type of `bytes`, or null when it is not one the store accepts
+export const sniffImageType = (bytes) => {
+  const matches = ([offset, signature]) => signature.every((byte, index) => bytes[offset + index] === byte)
+  const found = IMAGE_SIGNATURES.find(([, parts]) => parts.every(matches))
+  return found ? found[0] : null
+}
+
+export const parseDataUrl = (dataUrl) => {
+  const match = /^data:([^;,]+)?(;base64)?,(.*)$/s.exec(dataUrl || '')
+  if (!match) return null
+  return {
+    mimeType: match[1] || 'application/octet-stream',
+    bytes: match[2] ? Buffer.from(match[3], 'base64') : Buffer.from(decodeURIComponent(match[3]))
+  }
+}
+
+export const hashBytes = (bytes) => createHash('sha256').update(bytes).digest('hex')
+
+// Store image bytes under their content hash; uploading the same image twice
+// is a no-op. Callers check the type with sniffImageType first.
+export const storeAsset = async (bytes) => {
+  const mimeType = sniffImageType(bytes)
+  if (!mimeType) throw new Error(UNSUPPORTED_IMAGE)
+  const hash = hashBytes(bytes)
+  const { error } = await supabase
+    .from('assets')
+    .upsert([{
+      hash,
+      mimeType,
+      data: bytes.toString('base64'),
+      size: bytes.length,
+      createdAt: new Date().toISOString()
+    }], { onConflict: 'hash', ignoreDuplicates: true })
+
+  if (error) throw new Error(error.message)
+  return { hash, url: assetUrl(hash), mimeType, size: bytes.length }
+}
+
+const inlineImage = (value) => {
+  return typeof value === 'string' && value.startsWith('data:') ? parseDataUrl(value) : null
+}
+
+// The first of `columns` in `fields` holding an inline image the store does
+// not accept, or undefined
+export const unsupportedInlineImage = (fields, columns) => {
+  return columns.find((column) => {
+    const image = inlineImage(fields[column])
+    return image && !sniffImageType(image.bytes)
+  })
+}
+
+// Replace inline data-URL images in `fields` with asset URLs
+export const storeInlineAssets = async (fields, columns) => {
+  const result = { ...fields }
+  await Promise.all(columns.map(async (column) => {
+    const image = inlineImage(result[column])
+    if (image) {
+      result[column] = (await storeAsset(image.bytes)).url
+    }
+  }))
+  return result
+}
+
+// Resolve an image column value (asset URL or legacy data URL) to bytes
+export const loadImage = async (value) => {
+  if (!value) return null
+  if (value.startsWith(ASSET_PREFIX)) {
+    const hash = value.slice(ASSET_PREFIX.length)
+    return isAssetHash(hash) ? loadAsset(hash) : null
+  }
+  return value.startsWith('data:') ? parseDataUrl(value) : null
+}
+
+export const loadAsset = async (hash) => {
+  const { data, error } = await supabase
+    .from('assets')
+    .select('mimeType, data')
+    .eq('hash', hash)
+    .maybeSingle()
+
+  if (error) throw new Error(error.message)
+  if (!data) return null
+  return { mimeType: data.mimeType, bytes: Buffer.from(data.data, 'base64') }
+}
@@ -0,0 +1,298 @@
+import { supabase, chunked, inChunks } from './supabase.js'
+import { UNSUPPORTED_IMAGE, storeInlineAssets, unsupportedInlineImage } from './assets.js'
+import { BLOB_COLUMNS, NUMBER_COLUMNS, invalidUpdate, newRow, pickWritable } from './fields.js'
+import { isItemList, toLineItemRows, insertLineItemRows } from './items.js'
+import { affectsTotals, priceDocument, loadPricing } from './pricing.js'
+
+// Batch create, update and delete for one table. Each operation list is
+// validated item by item and then written with a single bulk statement, so
+// a batch costs a handful of round trips whatever its size. Results are
+// reported per item, in request order.
+
+export const MAX_BATCH_SIZE = 1000
+
+const isObject = (value) => value && typeof value === 'object' && !Array.isArray(value)
+
+// Validate a batch body: { create?: [...], update?: [{ id, ... }], delete?: [id] }
+export const parseBatch = (body) => {
+  if (!isObject(body)) return { error: 'Batch must be an object' }
+  const batch = {}
+  for (const operation of ['create', 'update', 'delete']) {
+    const list = body[operation] ?? []
+    if (!Array.isArray(list)) return { error: `${operation} must be an array` }
+    batch[operation] = list
+  }
+
+  const size = batch.create.length + batch.update.length + batch.delete.length
+  if (!size) return { error: 'Batch is empty' }
+  if (size > MAX_BATCH_SIZE) {
+    return { error: `Batch has ${size} operations; the limit is ${MAX_BATCH_SIZE}`, status: 413 }
+  }
+  return { batch }
+}
+
+const failure = (index, error, id) => ({ index, ...(id ? { id } : {}), status: 'error', error })
+
+// Reference values in `rows[column]` that do not exist in `table`
+const missingReferences = async (rows, column, table) => {
+  const ids = [...new Set(rows.map(row => row[column]).filter(Boolean))]
+  if (!ids.length) return new Set()
+
+  const { data, error } = await inChunks(ids, chunk => supabase.from(table).select('id').in('id', chunk))
+  if (error) throw new Error(error.message)
+  const found = new Set(data.map(row => row.id))
+  return new Set(ids.filter(id => !found.has(id)))
+}
+
+// Drop staged entries whose companyId or quoteId points at nothing
+const checkReferences = async (table, staged, results) => {
+  if (table === 'companies') return staged
+
+  const references = [['companyId', 'companies']]
+  if (table === 'purchase_orders') references.push(['quoteId', 'quotes'])
+
+  for (const [column, target] of references) {
+    const missing = await missingReferences(staged.map(entry => entry.row), column, target)
+    staged = staged.filter((entry) => {
+      if (!missing.has(entry.row[column])) return true
+      results[entry.index] = failure(entry.index, `${column} ${entry.row[column]} does not exist`, entry.id ?? entry.row.id)
+      return false
+    })
+  }
+  return staged
+}
+
+const lineItemRows = (table, staged) => {
+  return staged.flatMap(entry => entry.items ? toLineItemRows(table, entry.row.id, entry.items) : [])
+}
+
+// Fields an import may carry over from another system instead of generating
+const PRESERVED_FIELDS = ['id', 'createdAt', 'updatedAt']
+
+// Ids among `staged` rows that are already taken
+const existingIds = async (table, staged) => {
+  const ids = staged.map(entry => entry.row.id)
+  const { data, error } = await inChunks(ids, chunk => supabase.from(table).select('id').in('id', chunk))
+  if (error) throw new Error(error.message)
+  return new Set(data.map(row => row.id))
+}
+
+// Drop staged documents whose number is already taken in their company,
+// stored or earlier in the batch; documents without one are numbered on insert
+const checkNumbers = async (table, staged, results) => {
+  const column = NUMBER_COLUMNS[table]
+  const numbers = column ? [...new Set(staged.map(entry => entry.row[column]).filter(Boolean))] : []
+  if (!numbers.length) return staged
+
+  const { data, error } = await inChunks(numbers, chunk => (
+    supabase.from(table).select(`companyId,${column}`).in(column, chunk)
+  ))
+  if (error) throw new Error(error.message)
+  const key = (row) => JSON.stringify([row.companyId, row[column]])
+  const taken = new Set(data.map(key))
+  return staged.filter((entry) => {
+    if (!entry.row[column]) return true
+    if (!taken.has(key(entry.row))) {
+      taken.add(key(entry.row))
+      return true
+    }
+    results[entry.index] = failure(entry.index, `${column} ${entry.row[column]} already exists`, entry.row.id)
+    return false
+  })
+}
+
+// Insert staged rows and their items; returns the error message, if any,
+// after removing the rows again
+const insertStaged = async (table, staged) => {
+  const { error } = await supabase.from(table).insert(staged.map(entry => entry.row))
+  if (error) return error.message
+  try {
+    await insertLineItemRows(lineItemRows(table, staged))
+    return null
+  } catch (itemsError) {
+    // Don't leave documents behind without their items
+    await inChunks(staged.map(entry => entry.row.id), chunk => supabase.from(table).delete().in('id', chunk))
+    return itemsError.message
+  }
+}
+
+// Insert new rows; with `preserveIds` the id and timestamps of each record
+// are kept when present, as when importing an export
+export const createRows = async (table, list, { preserveIds = false } = {}) => {
+  const results = []
+  let staged = []
+
+  list.forEach((body, index) => {
+    if (!isObject(body)) {
+      results[index] = failure(index, 'Expected an object')
+    } else if (table === 'companies' && !body.name) {
+      results[index] = failure(index, 'name is required')
+    } else if (table === 'companies' && unsupportedInlineImage(body, BLOB_COLUMNS)) {
+      results[index] = failure(index, UNSUPPORTED_IMAGE)
+    } else if (table !== 'companies' && !isItemList(body.items ?? [])) {
+      results[index] = failure(index, 'items must be a list of objects')
+    } else {
+      const row = newRow(table, body)
+      if (preserveIds) {
+        for (const field of PRESERVED_FIELDS) {
+          if (typeof body[field] === 'string' && body[field]) row[field] = body[field]
+        }
+      }
+      if (table === 'companies') {
+        staged.push({ index, row, items: null })
+      } else {
+        // Amounts are computed from the line items (lib/pricing.js)
+        const priced = priceDocument(row, body.items ?? [])
+        if (priced.error) results[index] = failure(index, priced.error)
+        else staged.push({ index, row: priced.row, items: priced.items })
+      }
+    }
+  })
+
+  if (preserveIds && staged.length) {
+    // One duplicate would fail the whole bulk insert, so report them per item
+    const taken = await existingIds(table, staged)
+    const batchIds = new Set()
+    staged = staged.filter((entry) => {
+      const { id } = entry.row
+      if (!taken.has(id) && !batchIds.has(id)) {
+        batchIds.add(id)
+        return true
+      }
+      results[entry.index] = failure(entry.index, `id ${id} already exists`, id)
+      return false
+    })
+  }
+  staged = await checkNumbers(table, staged, results)
+  staged = await checkReferences(table, staged, results)
+  if (table === 'companies') {
+    await Promise.all(staged.map(async (entry) => {
+      entry.row = await storeInlineAssets(entry.row, BLOB_COLUMNS)
+    }))
+  }
+
+  if (staged.length) {
+    const message = await insertStaged(table, staged)
+    // One bad row fails the whole bulk insert; insert the rows one at a time
+    // (in order, so generated numbers follow the batch) to find which
+    const messages = []
+    if (message && staged.length > 1) {
+      for (const entry of staged) messages.push(await insertStaged(table, [entry]))
+    } else {
+      messages.push(message)
+    }
+    staged.forEach(({ index, row }, position) => {
+      const error = messages[position]
+      results[index] = error ? failure(index, error) : { index, id: row.id, status: 'created' }
+    })
+  }
+  return results
+}
+
+const updateRows = async (table, list) => {
+  const results = []
+  let staged = []
+  const seen = new Set()
+
+  for (const [index, body] of list.entries()) {
+    if (!isObject(body) || typeof body.id !== 'string' || !body.id) {
+      results[index] = failure(index, 'Each update needs an id')
+    } else if (seen.has(body.id)) {
+      results[index] = failure(index, 'Duplicate id in batch', body.id)
+    } else if (body.items !== undefined && (table === 'companies' || !isItemList(body.items))) {
+      results[index] = failure(index, 'items must be a list of objects', body.id)
+    } else if (table === 'companies' && unsupportedInlineImage(body, BLOB_COLUMNS)) {
+      results[index] = failure(index, UNSUPPORTED_IMAGE, body.id)
+    } else if (invalidUpdate(table, body)) {
+      results[index] = failure(index, invalidUpdate(table, body), body.id)
+    } else {
+      seen.add(body.id)
+      const row = table === 'companies'
+        ? await storeInlineAssets(pickWritable(table, body), BLOB_COLUMNS)
+        : pickWritable(table, body)
+      staged.push({ index, id: body.id, row, items: body.items })
+    }
+  }
+
+  // Amounts are recomputed from the line items, stored or new (lib/pricing.js)
+  const repriced = new Set(table === 'companies' ? [] : staged.filter(entry => affectsTotals({ ...entry.row, items: entry.items })))
+  if (repriced.size) {
+    const stored = await loadPricing(table, [...repriced].map(entry => entry.id))
+    staged = staged.filter((entry) => {
+      if (!repriced.has(entry)) return true
+      const current = stored.get(entry.id)
+      if (!current) {
+        results[entry.index] = failure(entry.index, 'Not found', entry.id)
+        return false
+      }
+      const priced = priceDocument({ vatRate: current.vatRate, ...entry.row }, entry.items ?? current.items)
+      if (priced.error) {
+        results[entry.index] = failure(entry.index, priced.error, entry.id)
+        return false
+      }
+      entry.row = priced.row
+      if (entry.items !== undefined) entry.items = priced.items
+      return true
+    })
+  }
+  staged = await checkReferences(table, staged, results)
+  if (!staged.length) return results
+
+  // Only the changed columns are written, so concurrent updates to other
+  // columns survive and deleted rows stay deleted. Each row and its items are
+  // written in their own transaction (update_documents).
+  const now = new Date().toISOString()
+  const { data, error } = await supabase.rpc('update_documents', {
+    table_name: table,
+    updates: staged.map(entry => ({
+      id: entry.id,
+      changes: { ...entry.row, updatedAt: now },
+      items: entry.items === undefined ? null : toLineItemRows(table, entry.id, entry.items)
+    }))
+  })
+  staged.forEach(({ index, id }, position) => {
+    const outcome = error ? { error: error.message } : data[position]
+    if (outcome.error) results[index] = failure(index, outcome.error, id)
+    else results[index] = outcome.found ? { index, id, status: 'updated' } : failure(index, 'Not found', id)
+  })
+  return results
+}
+
+const deleteRows = async (table, list) => {
+  const results = []
+  const ids = []
+  list.forEach((id, index) => {
+    if (typeof id === 'string' && id) ids.push({ index, id })
+    else results[index] = failure(index, 'Expected an id')
+  })
+  // One delete per chunk of ids; a failed chunk fails only its own ids
+  for (const chunk of chunked(ids)) {
+    const { data, error } = await supabase
+      .from(table)
+      .delete()
+      .in('id', chunk.map(entry => entry.id))
+      .select('id')
+
+    const deleted = new Set((data || []).map(row => row.id))
+    for (const { index, id } of chunk) {
+      if (error) results[index] = failure(index, error.message, id)
+      else results[index] = deleted.has(id) ? { index, id, status: 'deleted' } : failure(index, 'Not found', id)
+    }
+  }
+  return results
+}
+
+// Run a parsed batch; operations run in the order create, update, delete
+export const runBatch = async (table, batch) => {
+  const create = batch.create.length ? await createRows(table, batch.create) : []
+  const update = batch.update.length ? await updateRows(table, batch.update) : []
+  const remove = batch.delete.length ? await deleteRows(table, batch.delete) : []
+  const all = [...create, ...update, ...remove]
+  return {
+    succeeded: all.filter(result => result.status !== 'error').length,
+    failed: all.filter(result => result.status === 'error').length,
+    create,
+    update,
+    delete: remove
+  }
+}
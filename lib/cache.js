@@ -0,0 +1,48 @@
+// Small in-process LRU cache with an optional time-to-live per entry.
+// Map iteration order is insertion order, so re-inserting on read keeps the
+// least recently used entry first in line for eviction.
+
+export const createLruCache = ({ max = 100, ttlMs = 0 } = {}) => {
+  const entries = new Map()
+
+  const isExpired = (entry) => ttlMs > 0 && Date.now() - entry.storedAt > ttlMs
+
+  return {
+    get(key) {
+      const entry = entries.get(key)
+      if (!entry) return undefined
+      entries.delete(key)
+      if (isExpired(entry)) return undefined
+      entries.set(key, entry)
+      return entry.value
+    },
+
+    set(key, value) {
+      entries.delete(key)
+      entries.set(key, { value, storedAt: Date.now() })
+      while (entries.size > max) {
+        entries.delete(entries.keys().next().value)
+      }
+      return value
+    },
+
+    delete(key) {
+      return entries.delete(key)
+    },
+
+    // Remove every entry whose key starts with `prefix`
+    deletePrefix(prefix) {
+      for (const key of [...entries.keys()]) {
+        if (key.startsWith(prefix)) entries.delete(key)
+      }
+    },
+
+    clear() {
+      entries.clear()
+    },
+
+    get size() {
+      return entries.size
+    }
+  }
+}
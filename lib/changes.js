@@ -0,0 +1,90 @@
+import { EventEmitter } from 'events'
+import { randomBytes } from 'crypto'
+
+// Change feed behind GET /api/changes. Write handlers publish row-level
+// changes and every connected dashboard receives them as Server-Sent Events,
+// so it can patch its lists in place instead of refetching them. Events are
+// numbered and the last REPLAY_SIZE are kept: a client that reconnects with
+// Last-Event-ID receives what it missed, or a `reset` event when that is no
+// longer possible. The feed lives in process memory and carries the writes
+// made through this server process.
+
+const REPLAY_SIZE = 1000
+const HEARTBEAT_MS = 25 * 1000
+
+// Subscribers further behind than this are dropped; they reconnect and reset
+const MAX_QUEUED_EVENTS = 500
+
+// Event ids are `${BOOT}-${sequence}`, so ids from before a restart are
+// recognised as stale
+const BOOT = randomBytes(4).toString('hex')
+
+const bus = new EventEmitter()
+bus.setMaxListeners(0)
+
+const recent = []
+let sequence = 0
+
+// Publish one change: { table, op, id, row }. `op` is insert, update or
+// delete; `reload` (with no id) says the table changed in bulk.
+export const publishChange = (change) => {
+  const event = { seq: ++sequence, ...change }
+  recent.push(event)
+  if (recent.length > REPLAY_SIZE) recent.shift()
+  bus.emit('change', event)
+}
+
+const formatEvent = ({ seq, ...change }) => `id: ${BOOT}-${seq}\ndata: ${JSON.stringify(change)}\n\n`
+
+// The events after `lastEventId`, or null when some of them are gone
+const replayAfter = (lastEventId) => {
+  const [boot, seq] = lastEventId.split('-')
+  const after = Number(seq)
+  if (boot !== BOOT || !Number.isInteger(after) || after > sequence) return null
+  if (after < sequence && (!recent.length || recent[0].seq > after + 1)) return null
+  return recent.filter(event => event.seq > after)
+}
+
+// A text/event-stream body for one subscriber; ends when `signal` aborts
+export const changeStream = (lastEventId, signal) => {
+  const encoder = new TextEncoder()
+  let cleanup = () => {}
+
+  return new ReadableStream({
+    start(controller) {
+      const send = (text) => controller.enqueue(encoder.encode(text))
+      const close = () => {
+        cleanup()
+        try { controller.close() } catch {}
+      }
+
+      send('retry: 3000\n\n')
+      if (lastEventId) {
+        const missed = replayAfter(lastEventId)
+        if (missed) missed.forEach(event => send(formatEvent(event)))
+        else send(`id: ${BOOT}-${sequence}\nevent: reset\ndata: {}\n\n`)
+      } else {
+        // Lets the client resume from here on its first reconnect
+        send(`id: ${BOOT}-${sequence}\nevent: ready\ndata: {}\n\n`)
+      }
+
+      const listener = (event) => {
+        if (controller.desiredSize < -MAX_QUEUED_EVENTS) return close()
+        send(formatEvent(event))
+      }
+      const heartbeat = setInterval(() => send(': ping\n\n'), HEARTBEAT_MS)
+      heartbeat.unref?.()
+
+      bus.on('change', listener)
+      signal?.addEventListener('abort', close)
+      cleanup = () => {
+        bus.off('change', listener)
+        clearInterval(heartbeat)
+        signal?.removeEventListener('abort', close)
+      }
+    },
+    cancel() {
+      cleanup()
+    }
+  })
+}
@@ -0,0 +1,11 @@
+import { supabase, generateId } from './supabase.js'
+
+// Copy a quote and its line items into a new purchase order with one
+// database call (convert_quote). A quote converts once: converting it again
+// returns the purchase order it already became. Resolves { created, id },
+// or null when the quote does not exist.
+export const convertQuote = async (quoteId) => {
+  const { data, error } = await supabase.rpc('convert_quote', { quote_id: quoteId, po_id: generateId() })
+  if (error) throw new Error(error.message)
+  return data
+}
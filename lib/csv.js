@@ -0,0 +1,79 @@
+// RFC 4180 CSV encoding and an incremental parser that accepts input in
+// arbitrary chunks, so uploads never have to be held in memory whole.
+
+const NEEDS_QUOTES = /[",\r\n]/
+
+export const csvField = (value) => {
+  if (value === null || value === undefined) return ''
+  const text = typeof value === 'object' ? JSON.stringify(value) : String(value)
+  return NEEDS_QUOTES.test(text) ? `"${text.replace(/"/g, '""')}"` : text
+}
+
+export const csvRow = (values) => `${values.map(csvField).join(',')}\r\n`
+
+// push(text) returns the records completed by that chunk; end() returns the
+// last record if the input did not end with a newline
+export const createCsvParser = () => {
+  let field = ''
+  let record = []
+  let quoted = false
+  // A quote inside a quoted field: either an escaped quote or the closing one
+  let pendingQuote = false
+  let fieldStarted = false
+
+  const endField = () => {
+    record.push(field)
+    field = ''
+    fieldStarted = false
+  }
+
+  const endRecord = (records) => {
+    endField()
+    // Skip blank lines
+    if (record.length > 1 || record[0] !== '') records.push(record)
+    record = []
+  }
+
+  return {
+    push(text) {
+      const records = []
+      for (let i = 0; i < text.length; i++) {
+        const char = text[i]
+        if (pendingQuote) {
+          pendingQuote = false
+          if (char === '"') {
+            field += '"'
+            continue
+          }
+          quoted = false
+        }
+        if (quoted) {
+          if (char === '"') pendingQuote = true
+          else field += char
+        } else if (char === '"' && !fieldStarted) {
+          quoted = true
+          fieldStarted = true
+        } else if (char === ',') {
+          endField()
+        } else if (char === '\n') {
+          endRecord(records)
+        } else if (char !== '\r') {
+          field += char
+          fieldStarted = true
+        }
+      }
+      return records
+    },
+
+    end() {
+      const records = []
+      if (pendingQuote) {
+        pendingQuote = false
+        quoted = false
+      }
+      if (quoted) throw new Error('Unterminated quoted field')
+      if (field !== '' || fieldStarted || record.length) endRecord(records)
+      return records
+    }
+  }
+}
@@ -0,0 +1,50 @@
+import { supabase } from './supabase.js'
+import { createLruCache } from './cache.js'
+import { recordCacheLookup } from './metrics.js'
+
+// Dashboard totals and per-company rollups, computed by the
+// dashboard_summary() database function and cached in memory until a write
+// handler invalidates them. The TTL bounds staleness from writes made
+// outside this process.
+
+const SUMMARY_TTL_MS = 60 * 1000
+
+const summaryCache = createLruCache({ max: 1, ttlMs: SUMMARY_TTL_MS })
+
+// Bumped on every invalidation so a computation that started before a write
+// does not cache its stale result
+let version = 0
+let inFlight = null
+
+export const invalidateDashboardSummary = () => {
+  version++
+  inFlight = null
+  summaryCache.clear()
+}
+
+const computeSummary = async () => {
+  const { data, error } = await supabase.rpc('dashboard_summary')
+  if (error) throw new Error(error.message)
+  return { ...data, generatedAt: new Date().toISOString() }
+}
+
+// Returns { summary, cached }; concurrent misses share one database call
+export const getDashboardSummary = async () => {
+  const cached = summaryCache.get('summary')
+  recordCacheLookup('dashboard', Boolean(cached))
+  if (cached) return { summary: cached, cached: true }
+
+  if (!inFlight) {
+    const started = version
+    const pending = computeSummary().then((summary) => {
+      if (started === version) summaryCache.set('summary', summary)
+      return summary
+    })
+    inFlight = pending
+    pending.then(
+      () => { if (inFlight === pending) inFlight = null },
+      () => { if (inFlight === pending) inFlight = null }
+    )
+  }
+  return { summary: await inFlight, cached: false }
+}
@@ -0,0 +1,216 @@
+import { mkdtemp, rm } from 'fs/promises'
+import { tmpdir } from 'os'
+import { join } from 'path'
+import { supabase, generateId } from './supabase.js'
+import { paginate, toPage } from './pagination.js'
+import { loadImage } from './assets.js'
+import { withItems } from './items.js'
+import { parseDateRange } from './filters.js'
+import { renderWithImages } from './pdf.js'
+import { DOCUMENT_SELECT } from './records.js'
+import { createZipWriter } from './zip.js'
+
+// Bulk PDF export jobs. A job pages through the matching quotes and purchase
+// orders, renders them with a bounded pool of concurrent tasks and streams
+// each PDF into a zip file on disk. Jobs live in process memory and are
+// polled for progress; finished archives are removed after JOB_TTL_MS.
+
+export const EXPORT_CONCURRENCY = Math.max(1, Number(process.env.EXPORT_CONCURRENCY) || 4)
+export const MAX_EXPORT_DOCUMENTS = 10000
+
+const PAGE_SIZE = 50
+const JOB_TTL_MS = 60 * 60 * 1000
+
+const SOURCES = {
+  quotes: { table: 'quotes', type: 'quote', numberColumn: 'quoteNumber' },
+  'purchase-orders': { table: 'purchase_orders', type: 'purchase-order', numberColumn: 'poNumber' }
+}
+
+const jobs = new Map()
+
+// Validate an export request body: { companyId?, from?, to?, types? }
+export const parseExportRequest = (body = {}) => {
+  const { companyId, from, to } = body
+  if (!companyId && !from && !to) {
+    return { error: 'companyId or a from/to date range is required' }
+  }
+
+  const range = parseDateRange(from, to)
+  if (range.error) return { error: range.error }
+  const scope = { companyId: companyId || null, from: range.from, to: range.to }
+
+  const types = body.types || Object.keys(SOURCES)
+  if (!Array.isArray(types) || !types.length || types.some((type) => !SOURCES[type])) {
+    return { error: `types must be a list of: ${Object.keys(SOURCES).join(', ')}` }
+  }
+
+  return { scope, types: [...new Set(types)] }
+}
+
+const applyScope = (query, scope) => {
+  if (scope.companyId) query = query.eq('companyId', scope.companyId)
+  if (scope.from) query = query.gte('createdAt', scope.from)
+  if (scope.to) query = query.lt('createdAt', scope.to)
+  return query
+}
+
+const countDocuments = async (source, scope) => {
+  const { count, error } = await applyScope(
+    supabase.from(source.table).select('id', { count: 'exact', head: true }),
+    scope
+  )
+  if (error) throw new Error(error.message)
+  return count || 0
+}
+
+const fetchPage = async (source, scope, after) => {
+  const { data, error } = await paginate(
+    applyScope(supabase.from(source.table).select(DOCUMENT_SELECT), scope),
+    { limit: PAGE_SIZE, after }
+  )
+  if (error) throw new Error(error.message)
+  return toPage(data.map(withItems), PAGE_SIZE)
+}
+
+// Run `task` over `items` with at most `concurrency` in flight
+const runPool = async (items, concurrency, task) => {
+  let next = 0
+  const worker = async () => {
+    while (next < items.length) {
+      await task(items[next++])
+    }
+  }
+  await Promise.all(Array.from({ length: Math.min(concurrency, items.length) }, worker))
+}
+
+const entryName = (name, source, doc) => {
+  const number = String(doc[source.numberColumn] || 'document').replace(/[^\w.-]+/g, '_')
+  return `${name}/${number}_${doc.id}.pdf`
+}
+
+// Cancel checks happen between documents; render itself is synchronous
+const yieldToEventLoop = () => new Promise((resolve) => setImmediate(resolve))
+
+const runJob = async (job) => {
+  const dir = await mkdtemp(join(tmpdir(), 'pdf-export-'))
+  job.dir = dir
+  job.file = join(dir, `${job.id}.zip`)
+  const zip = createZipWriter(job.file)
+
+  // Documents of one company share its images, so load each one once per job
+  const images = new Map()
+  const loadOnce = (value) => {
+    if (!value) return null
+    if (!images.has(value)) images.set(value, loadImage(value))
+    return images.get(value)
+  }
+
+  try {
+    const counts = await Promise.all(job.types.map((name) => countDocuments(SOURCES[name], job.scope)))
+    job.total = counts.reduce((sum, count) => sum + count, 0)
+    if (job.status === 'cancelled') throw new Error('Export cancelled')
+    if (job.total > MAX_EXPORT_DOCUMENTS) {
+      throw new Error(`Export matches ${job.total} documents; the limit is ${MAX_EXPORT_DOCUMENTS}`)
+    }
+    job.status = 'running'
+
+    for (const name of job.types) {
+      const source = SOURCES[name]
+      // Fetch the next page while the current one renders
+      let pending = fetchPage(source, job.scope, null)
+      while (pending) {
+        const page = await pending
+        const last = page.data[page.data.length - 1]
+        pending = page.nextCursor ? fetchPage(source, job.scope, { createdAt: last.createdAt, id: last.id }) : null
+
+        await runPool(page.data, EXPORT_CONCURRENCY, async (doc) => {
+          if (job.status === 'cancelled') return
+          await yieldToEventLoop()
+          try {
+            const bytes = await renderWithImages(source.type, doc, loadOnce)
+            await zip.add(entryName(name, source, doc), bytes, new Date(doc.createdAt))
+            job.completed++
+          } catch (error) {
+            job.failed++
+            job.errors.push({ id: doc.id, type: source.type, error: error.message })
+          }
+          job.bytes = zip.bytesWritten
+        })
+        if (job.status === 'cancelled') {
+          await pending?.catch(() => {})
+          throw new Error('Export cancelled')
+        }
+      }
+    }
+
+    await zip.close()
+    job.bytes = zip.bytesWritten
+    job.status = 'complete'
+  } catch (error) {
+    zip.abort()
+    if (job.status !== 'cancelled') {
+      job.status = 'failed'
+      job.error = error.message
+    }
+    await rm(dir, { recursive: true, force: true })
+  } finally {
+    job.finishedAt = new Date().toISOString()
+    job.timer = setTimeout(() => deleteExportJob(job.id), JOB_TTL_MS)
+    job.timer.unref?.()
+  }
+}
+
+export const createExportJob = ({ scope, types }) => {
+  const job = {
+    id: generateId(),
+    status: 'queued',
+    scope,
+    types,
+    total: null,
+    completed: 0,
+    failed: 0,
+    errors: [],
+    bytes: 0,
+    error: null,
+    createdAt: new Date().toISOString(),
+    finishedAt: null
+  }
+  jobs.set(job.id, job)
+  runJob(job).catch((error) => console.error('Export job error:', error))
+  return job
+}
+
+export const getExportJob = (id) => jobs.get(id) || null
+
+export const exportStatus = (job) => ({
+  id: job.id,
+  status: job.status,
+  total: job.total,
+  completed: job.completed,
+  failed: job.failed,
+  errors: job.errors.slice(0, 20),
+  bytes: job.bytes,
+  error: job.error,
+  createdAt: job.createdAt,
+  finishedAt: job.finishedAt,
+  downloadUrl: job.status === 'complete' ? `/api/exports/${job.id}/download` : null
+})
+
+export const exportFilename = (job) => {
+  const date = job.createdAt.split('T')[0]
+  return `Export_${job.scope.companyId || 'all'}_${date}.zip`.replace(/[^\w.-]+/g, '_')
+}
+
+// Cancel a running job, or remove a finished one and its archive
+export const deleteExportJob = async (id) => {
+  const job = jobs.get(id)
+  if (!job) return false
+  if (job.status === 'queued' || job.status === 'running') {
+    job.status = 'cancelled'
+    return true
+  }
+  clearTimeout(job.timer)
+  jobs.delete(id)
+  if (job.dir) await rm(job.dir, { recursive: true, force: true })
+  return true
+}
@@ -0,0 +1,161 @@
+import { assetUrl } from './assets.js'
+import { LINE_ITEM_SELECT } from './items.js'
+import { generateId } from './supabase.js'
+
+// Column definitions shared by the list projections and the write handlers
+
+// Image columns; they hold asset URLs, or base64 data URLs on legacy rows,
+// and list responses leave them out by default
+export const BLOB_COLUMNS = ['logo', 'signature', 'seal']
+
+export const COLUMNS = {
+  companies: [
+    'id', 'name', 'logo', 'address', 'phone', 'email', 'signature', 'seal',
+    'logoHash', 'createdAt', 'updatedAt'
+  ],
+  quotes: [
+    'id', 'companyId', 'quoteNumber', 'poNumber', 'billTo', 'billToAddress', 'billToContact',
+    'subtotal', 'vatRate', 'vatAmount', 'totalAmount', 'notes', 'createdAt', 'updatedAt'
+  ],
+  purchase_orders: [
+    'id', 'companyId', 'quoteId', 'poNumber', 'quoteNumber', 'billTo', 'billToAddress', 'billToContact',
+    'subtotal', 'vatRate', 'vatAmount', 'totalAmount', 'notes', 'status', 'createdAt', 'updatedAt'
+  ]
+}
+
+// Columns the database maintains itself and clients may not write
+const READ_ONLY_COLUMNS = ['id', 'logoHash', 'createdAt', 'updatedAt']
+
+// Embedded relations that can be requested as a field
+const EMBEDS = {
+  companies: 'companies(id,name,logoHash)',
+  items: LINE_ITEM_SELECT
+}
+
+// Pagination needs these on every row
+const REQUIRED_FIELDS = ['id', 'createdAt']
+
+// The fields a resource's list can select (lib/api/resources.js). Image
+// columns are left out unless asked for by name.
+export const listFields = ({ columns, embeds = [], assetColumns = [] }) => {
+  const defaults = [...columns.filter(column => !assetColumns.includes(column)), ...embeds]
+  return {
+    allowed: [...columns, ...embeds],
+    select: defaults.map(field => EMBEDS[field] || field).join(',')
+  }
+}
+
+// Build the select string for a list request from its `fields=` parameter
+export const parseFields = ({ allowed, select }, searchParams) => {
+  const raw = searchParams.get('fields')
+  if (!raw) return { select }
+
+  const fields = raw.split(',').map(field => field.trim()).filter(Boolean)
+  const unknown = fields.filter(field => !allowed.includes(field))
+  if (unknown.length) return { error: `Unknown fields: ${unknown.join(', ')}` }
+
+  const selected = [...new Set([...REQUIRED_FIELDS, ...fields])]
+  return { select: selected.map(field => EMBEDS[field] || field).join(',') }
+}
+
+// Drop anything that is not a writable column, e.g. embedded `companies`
+// objects or derived fields that clients echo back from a read
+export const pickWritable = (table, body) => {
+  const writable = {}
+  for (const column of COLUMNS[table]) {
+    if (!READ_ONLY_COLUMNS.includes(column) && body[column] !== undefined) {
+      writable[column] = body[column]
+    }
+  }
+  return writable
+}
+
+// Document numbers, unique per company
+export const NUMBER_COLUMNS = {
+  quotes: 'quoteNumber',
+  purchase_orders: 'poNumber'
+}
+
+// Why an update's fields can't be written, or null. Numbers are only
+// assigned on insert, so an update may not blank one.
+export const invalidUpdate = (table, fields) => {
+  const column = NUMBER_COLUMNS[table]
+  if (column && column in fields && !String(fields[column] ?? '').trim()) return `${column} cannot be blank`
+  return null
+}
+
+// A row for a new record with the create handlers' defaults. Quote and PO
+// numbers left blank are assigned by the database from a per-company sequence
+export const newRow = (table, body) => {
+  const now = new Date().toISOString()
+  if (table === 'companies') {
+    return {
+      id: generateId(),
+      name: body.name,
+      logo: body.logo || '',
+      address: body.address || '',
+      phone: body.phone || '',
+      email: body.email || '',
+      signature: body.signature || '',
+      seal: body.seal || '',
+      createdAt: now,
+      updatedAt: now
+    }
+  }
+
+  const row = {
+    id: generateId(),
+    companyId: body.companyId,
+    billTo: body.billTo || '',
+    billToAddress: body.billToAddress || '',
+    billToContact: body.billToContact || '',
+    subtotal: body.subtotal || 0,
+    vatRate: body.vatRate ?? 5,
+    vatAmount: body.vatAmount || 0,
+    totalAmount: body.totalAmount || 0,
+    notes: body.notes || '',
+    createdAt: now,
+    updatedAt: now
+  }
+  if (table === 'quotes') {
+    return {
+      ...row,
+      quoteNumber: body.quoteNumber || null,
+      poNumber: body.poNumber || ''
+    }
+  }
+  return {
+    ...row,
+    quoteId: body.quoteId || null,
+    poNumber: body.poNumber || null,
+    quoteNumber: body.quoteNumber || '',
+    status: body.status || 'pending'
+  }
+}
+
+// Per-company document counts, aggregated by the database in the same query
+export const COUNT_SELECT = 'quotes(count),purchase_orders(count)'
+
+export const withCounts = (company) => {
+  if (!company || !('quotes' in company)) return company
+  const { quotes, purchase_orders: purchaseOrders, ...rest } = company
+  return {
+    ...rest,
+    quoteCount: quotes?.[0]?.count || 0,
+    purchaseOrderCount: purchaseOrders?.[0]?.count || 0
+  }
+}
+
+// Add the immutable asset URL for the logo next to its content hash
+export const withLogoUrl = (company) => {
+  if (!company || !('logoHash' in company)) return company
+  return {
+    ...company,
+    logoUrl: company.logoHash ? assetUrl(company.logoHash) : null
+  }
+}
+
+export const withCompanyLogoUrl = (row) => {
+  if (!row || !row.companies) return row
+  return { ...row, companies: withLogoUrl(row.companies) }
+}
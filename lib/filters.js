@@ -0,0 +1,92 @@
+// Query-string filters for the quote and purchase order list endpoints.
+// Each filter maps onto a PostgREST condition that an index from the
+// migrations can serve, so lists are narrowed in the database.
+
+const DATE_ONLY = /^\d{4}-\d{2}-\d{2}$/
+
+// Columns matched by the `q` text search
+const SEARCH_COLUMNS = {
+  quotes: ['billTo', 'quoteNumber', 'poNumber'],
+  purchase_orders: ['billTo', 'poNumber', 'quoteNumber']
+}
+
+export const PO_STATUSES = ['pending', 'approved', 'completed', 'cancelled']
+
+const parseDate = (value) => {
+  const date = new Date(value)
+  return Number.isNaN(date.getTime()) ? null : date
+}
+
+// Parse an inclusive from/to range into ISO bounds for `gte`/`lt`.
+// A bare date for `to` includes that whole day.
+export const parseDateRange = (from, to) => {
+  const range = { from: null, to: null }
+  if (from) {
+    const date = parseDate(from)
+    if (!date) return { error: 'from must be a date' }
+    range.from = date.toISOString()
+  }
+  if (to) {
+    const date = parseDate(to)
+    if (!date) return { error: 'to must be a date' }
+    if (DATE_ONLY.test(to)) date.setUTCDate(date.getUTCDate() + 1)
+    else date.setTime(date.getTime() + 1)
+    range.to = date.toISOString()
+  }
+  if (range.from && range.to && range.from >= range.to) return { error: 'from must be before to' }
+  return range
+}
+
+const parseAmount = (value, name) => {
+  if (value === null || value === '') return { value: null }
+  const amount = Number(value)
+  return Number.isFinite(amount) ? { value: amount } : { error: `${name} must be a number` }
+}
+
+// LIKE wildcards and PostgREST delimiters in user input are matched as spaces
+const searchPattern = (text) => `"*${text.replace(/[%_*\\"(),]/g, ' ').replace(/\s+/g, ' ').trim()}*"`
+
+// Parse list filters from the query string into a list of conditions
+export const parseFilters = (table, searchParams) => {
+  const filters = []
+
+  const companyId = searchParams.get('companyId')
+  if (companyId) filters.push(['eq', 'companyId', companyId])
+
+  const status = searchParams.get('status')
+  if (status) {
+    if (table !== 'purchase_orders') return { error: 'status applies to purchase orders only' }
+    const statuses = status.split(',').map(value => value.trim()).filter(Boolean)
+    const unknown = statuses.filter(value => !PO_STATUSES.includes(value))
+    if (unknown.length) return { error: `Unknown status: ${unknown.join(', ')}` }
+    filters.push(['in', 'status', statuses])
+  }
+
+  const range = parseDateRange(searchParams.get('from'), searchParams.get('to'))
+  if (range.error) return { error: range.error }
+  if (range.from) filters.push(['gte', 'createdAt', range.from])
+  if (range.to) filters.push(['lt', 'createdAt', range.to])
+
+  const minAmount = parseAmount(searchParams.get('minAmount'), 'minAmount')
+  if (minAmount.error) return { error: minAmount.error }
+  if (minAmount.value !== null) filters.push(['gte', 'totalAmount', minAmount.value])
+
+  const maxAmount = parseAmount(searchParams.get('maxAmount'), 'maxAmount')
+  if (maxAmount.error) return { error: maxAmount.error }
+  if (maxAmount.value !== null) filters.push(['lte', 'totalAmount', maxAmount.value])
+
+  const q = (searchParams.get('q') || '').trim()
+  if (q) {
+    const pattern = searchPattern(q)
+    filters.push(['or', SEARCH_COLUMNS[table].map(column => `${column}.ilike.${pattern}`).join(',')])
+  }
+
+  return { filters }
+}
+
+export const applyFilters = (query, filters) => {
+  for (const [operator, ...args] of filters) {
+    query = query[operator](...args)
+  }
+  return query
+}
@@ -0,0 +1,56 @@
+// Time-sortable unique ids (ULID: https://github.com/ulid/spec).
+// 48 bits of millisecond time and 80 random bits, Crockford base32 encoded
+// to 26 characters. Ids made in the same millisecond increment the random
+// part, so ids from one process sort in the order they were generated.
+
+const ENCODING = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+const TIME_LENGTH = 10
+const RANDOM_LENGTH = 16
+
+let lastTime = -1
+let lastRandom = null
+
+const randomDigits = () => {
+  const bytes = globalThis.crypto.getRandomValues(new Uint8Array(RANDOM_LENGTH))
+  return Array.from(bytes, byte => byte & 31)
+}
+
+// Add one to the base32 digits in place; false on overflow
+const increment = (digits) => {
+  for (let i = digits.length - 1; i >= 0; i--) {
+    if (digits[i] < 31) {
+      digits[i]++
+      return true
+    }
+    digits[i] = 0
+  }
+  return false
+}
+
+const encodeTime = (time) => {
+  let text = ''
+  for (let i = 0; i < TIME_LENGTH; i++) {
+    text = ENCODING[time % 32] + text
+    time = Math.floor(time / 32)
+  }
+  return text
+}
+
+export const ulid = (now = Date.now()) => {
+  // A clock that steps backwards keeps using the last timestamp, so order holds
+  const time = Math.max(now, lastTime)
+  if (time === lastTime) {
+    if (!increment(lastRandom)) throw new Error('ULID random component overflowed within one millisecond')
+  } else {
+    lastTime = time
+    lastRandom = randomDigits()
+  }
+  return encodeTime(time) + lastRandom.map(digit => ENCODING[digit]).join('')
+}
+
+// Millisecond timestamp encoded in a ULID
+export const ulidTime = (id) => {
+  let time = 0
+  for (const char of id.slice(0, TIME_LENGTH)) time = time * 32 + ENCODING.indexOf(char)
+  return time
+}
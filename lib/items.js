@@ -0,0 +1,81 @@
+import { supabase } from './supabase.js'
+import { itemPrice } from './money.js'
+
+// Quote and purchase order line items are stored one row per item in
+// `line_items`, linked to their parent document. API rows still carry them
+// as a structured `items` array, in their original order.
+
+export const LINE_ITEM_SELECT = 'line_items(position,description,quantity,price,total,attributes)'
+
+export const PARENT_COLUMNS = {
+  quotes: 'quoteId',
+  purchase_orders: 'purchaseOrderId'
+}
+
+const toNumber = (value) => {
+  const number = Number(value)
+  return Number.isFinite(number) ? number : 0
+}
+
+export const isItemList = (items) => {
+  return Array.isArray(items) && items.every(item => item && typeof item === 'object' && !Array.isArray(item))
+}
+
+// Split API items into line_items rows; unknown keys are kept in `attributes`
+export const toLineItemRows = (table, parentId, items) => {
+  return items.map((item, position) => {
+    const { description, quantity, price, total, ...attributes } = item
+    return {
+      [PARENT_COLUMNS[table]]: parentId,
+      position,
+      description: description == null ? '' : String(description),
+      quantity: toNumber(quantity),
+      price: toNumber(itemPrice(item)),
+      total: toNumber(total),
+      attributes
+    }
+  })
+}
+
+export const fromLineItemRows = (rows = []) => {
+  return [...rows]
+    .sort((a, b) => a.position - b.position)
+    .map(({ position, attributes, quoteId, purchaseOrderId, ...item }) => ({ ...attributes, ...item }))
+}
+
+// Replace the embedded `line_items` of a row with its `items` array
+export const withItems = (row) => {
+  if (!row || !('line_items' in row)) return row
+  const { line_items: lineItems, ...rest } = row
+  return { ...rest, items: fromLineItemRows(lineItems) }
+}
+
+export const insertLineItemRows = async (rows) => {
+  if (!rows.length) return
+  const { error } = await supabase.from('line_items').insert(rows)
+  if (error) throw new Error(error.message)
+}
+
+// Insert a document and its line items in one transaction (see
+// create_document)
+export const createDocument = async (table, row, items) => {
+  const { data, error } = await supabase.rpc('create_document', {
+    table_name: table,
+    document: row,
+    items: toLineItemRows(table, row.id, items)
+  })
+  return { data: data && withItems(data), error }
+}
+
+// Update a document's changed columns and, when `items` is given, replace its
+// line items, in one transaction (see update_document). `data` is null when
+// the document does not exist.
+export const updateDocument = async (table, id, changes, items) => {
+  const { data, error } = await supabase.rpc('update_document', {
+    table_name: table,
+    document_id: id,
+    changes,
+    items: items === undefined ? null : toLineItemRows(table, id, items)
+  })
+  return { data: data && withItems(data), error }
+}
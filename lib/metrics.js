@@ -0,0 +1,102 @@
+// Process-wide counters and histograms, exposed in the Prometheus text
+// format at /api/metrics
+
+const metrics = new Map()
+
+const labelKey = (labels) => Object.keys(labels).sort().map(name => `${name}=${labels[name]}`).join(',')
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n')
+
+const formatLabels = (labels) => {
+  const names = Object.keys(labels).sort()
+  if (!names.length) return ''
+  return `{${names.map(name => `${name}="${escapeLabel(labels[name])}"`).join(',')}}`
+}
+
+export const defineCounter = (name, help) => {
+  if (!metrics.has(name)) metrics.set(name, { type: 'counter', help, series: new Map() })
+  return metrics.get(name)
+}
+
+export const incrementCounter = (name, labels = {}, amount = 1) => {
+  const metric = metrics.get(name) || defineCounter(name, name)
+  const key = labelKey(labels)
+  const series = metric.series.get(key)
+  if (series) series.value += amount
+  else metric.series.set(key, { labels, value: amount })
+}
+
+// Upper bounds of the latency buckets, in seconds
+export const LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+export const SIZE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+
+export const defineHistogram = (name, help, buckets) => {
+  if (!metrics.has(name)) metrics.set(name, { type: 'histogram', help, buckets, series: new Map() })
+  return metrics.get(name)
+}
+
+export const observeHistogram = (name, labels, value) => {
+  const metric = metrics.get(name) || defineHistogram(name, name, LATENCY_BUCKETS)
+  const key = labelKey(labels)
+  let series = metric.series.get(key)
+  if (!series) {
+    series = { labels, counts: new Array(metric.buckets.length).fill(0), sum: 0, count: 0 }
+    metric.series.set(key, series)
+  }
+  // Buckets are stored non-cumulative and summed when rendered
+  const index = metric.buckets.findIndex(bound => value <= bound)
+  if (index !== -1) series.counts[index]++
+  series.sum += value
+  series.count++
+}
+
+const renderHistogram = (lines, name, metric) => {
+  for (const { labels, counts, sum, count } of metric.series.values()) {
+    let cumulative = 0
+    metric.buckets.forEach((bound, index) => {
+      cumulative += counts[index]
+      lines.push(`${name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`)
+    })
+    lines.push(`${name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`)
+    lines.push(`${name}_sum${formatLabels(labels)} ${sum}`)
+    lines.push(`${name}_count${formatLabels(labels)} ${count}`)
+  }
+}
+
+defineCounter('cache_requests_total', 'In-process cache lookups by cache and result (hit or miss)')
+
+export const recordCacheLookup = (cache, hit) => {
+  incrementCounter('cache_requests_total', { cache, result: hit ? 'hit' : 'miss' })
+}
+
+const processGauges = () => {
+  const memory = process.memoryUsage()
+  return [
+    ['process_resident_memory_bytes', 'Resident set size of the server process', memory.rss],
+    ['nodejs_heap_used_bytes', 'V8 heap in use', memory.heapUsed],
+    ['nodejs_external_memory_bytes', 'Memory held by buffers outside the V8 heap', memory.external]
+  ]
+}
+
+export const renderMetrics = () => {
+  const lines = []
+  for (const [name, help, value] of processGauges()) {
+    lines.push(`# HELP ${name} ${help}`)
+    lines.push(`# TYPE ${name} gauge`)
+    lines.push(`${name} ${value}`)
+  }
+  for (const [name, metric] of metrics) {
+    lines.push(`# HELP ${name} ${metric.help}`)
+    lines.push(`# TYPE ${name} ${metric.type}`)
+    if (metric.type === 'histogram') {
+      renderHistogram(lines, name, metric)
+      continue
+    }
+    for (const { labels, value } of metric.series.values()) {
+      lines.push(`${name}${formatLabels(labels)} ${value}`)
+    }
+  }
+  return `${lines.join('\n')}\n`
+}
+
+export const METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
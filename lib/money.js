@@ -0,0 +1,129 @@
+// Exact money arithmetic shared by the API and the UI. Amounts are parsed as
+// decimals and computed in integer minor units of the currency (cents for
+// USD) with BigInt, so line totals, sums and VAT carry no floating-point
+// error. They cross the API as decimal numbers rounded to the currency.
+//
+// NEXT_PUBLIC_CURRENCY sets the currency (ISO 4217, default USD) and
+// NEXT_PUBLIC_MONEY_ROUNDING how amounts round to its minor unit: half-up
+// (the default), half-even, half-down, up or down.
+
+export const ROUNDING_MODES = ['half-up', 'half-even', 'half-down', 'up', 'down']
+
+export const CURRENCY = process.env.NEXT_PUBLIC_CURRENCY || 'USD'
+export const ROUNDING = ROUNDING_MODES.includes(process.env.NEXT_PUBLIC_MONEY_ROUNDING)
+  ? process.env.NEXT_PUBLIC_MONEY_ROUNDING
+  : 'half-up'
+
+const formatters = new Map()
+
+const formatter = (currency) => {
+  if (!formatters.has(currency)) {
+    formatters.set(currency, new Intl.NumberFormat('en-US', { style: 'currency', currency }))
+  }
+  return formatters.get(currency)
+}
+
+export const formatMoney = (amount, currency = CURRENCY) => formatter(currency).format(amount || 0)
+
+// Digits in the currency's minor unit: 2 for USD, 0 for JPY, 3 for KWD
+export const minorDigits = (currency = CURRENCY) => formatter(currency).resolvedOptions().maximumFractionDigits
+
+const DECIMAL = /^([+-])?(\d*)(?:\.(\d*))?(?:e([+-]?\d+))?$/i
+
+// An exact decimal { units, scale } (value = units / 10^scale) for a number
+// or numeric string, or null when it is not one. Numbers are read from their
+// shortest decimal form, so 0.1 is exactly one tenth.
+export const parseDecimal = (value) => {
+  if (typeof value === 'number' && !Number.isFinite(value)) return null
+  if (typeof value !== 'number' && typeof value !== 'string') return null
+
+  const match = DECIMAL.exec(String(value).trim())
+  if (!match || (!match[2] && !match[3])) return null
+  const fraction = match[3] || ''
+  let units = BigInt(`${match[2] || '0'}${fraction}`)
+  let scale = fraction.length - Number(match[4] || 0)
+  if (scale < 0) {
+    units *= 10n ** BigInt(-scale)
+    scale = 0
+  }
+  return { units: match[1] === '-' ? -units : units, scale }
+}
+
+// numerator / denominator (denominator > 0) rounded to an integer
+const divide = (numerator, denominator, rounding) => {
+  const quotient = numerator / denominator
+  const remainder = numerator % denominator
+  if (remainder === 0n) return quotient
+
+  const away = numerator < 0n ? quotient - 1n : quotient + 1n
+  const twice = 2n * (remainder < 0n ? -remainder : remainder)
+  switch (rounding) {
+    case 'down': return quotient
+    case 'up': return away
+    case 'half-down': return twice > denominator ? away : quotient
+    case 'half-even': return twice > denominator || (twice === denominator && quotient % 2n !== 0n) ? away : quotient
+    default: return twice >= denominator ? away : quotient
+  }
+}
+
+const toMinor = ({ units, scale }, digits, rounding) => {
+  if (scale <= digits) return units * 10n ** BigInt(digits - scale)
+  return divide(units, 10n ** BigInt(scale - digits), rounding)
+}
+
+const fromMinor = (minor, digits) => Number(minor) / 10 ** digits
+
+// Blank amounts count as zero
+const ZERO = { units: 0n, scale: 0 }
+const amountOf = (value) => value === undefined || value === null || value === '' ? ZERO : parseDecimal(value)
+
+// An amount rounded to the currency, or null when it is not a number
+export const roundMoney = (value, { currency = CURRENCY, rounding = ROUNDING } = {}) => {
+  const amount = amountOf(value)
+  if (!amount) return null
+  const digits = minorDigits(currency)
+  return fromMinor(toMinor(amount, digits, rounding), digits)
+}
+
+// An item's unit price: `price`, or the `unitPrice` some clients send. Every
+// place that prices or prints an item reads it through here.
+export const itemPrice = (item) => item.price ?? item.unitPrice
+
+// Item totals, subtotal, VAT and total of a document in one pass over its
+// items. An item's total is quantity × price (or unitPrice) rounded to the
+// currency; an item with no price keeps its own total. VAT is rounded once,
+// on the subtotal. Returns { items, subtotal, vatAmount, totalAmount }, or
+// { error } when an amount is not a number.
+export const computeTotals = (items, vatRate, { currency = CURRENCY, rounding = ROUNDING } = {}) => {
+  const digits = minorDigits(currency)
+  const rate = amountOf(vatRate)
+  if (!rate || rate.units < 0n) return { error: 'vatRate must be a non-negative number' }
+
+  const priced = []
+  let subtotal = 0n
+  for (const [index, item] of items.entries()) {
+    const price = itemPrice(item)
+    let total
+    if (price === undefined || price === null || price === '') {
+      const amount = amountOf(item.total)
+      if (!amount) return { error: `items[${index}].total must be a number` }
+      total = toMinor(amount, digits, rounding)
+    } else {
+      const quantity = amountOf(item.quantity)
+      const unit = parseDecimal(price)
+      if (!quantity) return { error: `items[${index}].quantity must be a number` }
+      if (!unit) return { error: `items[${index}].price must be a number` }
+      total = toMinor({ units: quantity.units * unit.units, scale: quantity.scale + unit.scale }, digits, rounding)
+    }
+    subtotal += total
+    priced.push({ ...item, total: fromMinor(total, digits) })
+  }
+
+  const vat = divide(subtotal * rate.units, 100n * 10n ** BigInt(rate.scale), rounding)
+  return {
+    items: priced,
+    subtotal: fromMinor(subtotal, digits),
+    vatAmount: fromMinor(vat, digits),
+    totalAmount: fromMinor(subtotal + vat, digits)
+  }
+}
@@ -0,0 +1,61 @@
+// Keyset (cursor) pagination for list endpoints.
+// Rows are ordered newest first by (createdAt, id); the cursor encodes the
+// last row of a page so the next page is a range scan instead of an OFFSET.
+
+export const DEFAULT_PAGE_SIZE = 50
+export const MAX_PAGE_SIZE = 500
+
+export const encodeCursor = (row) => {
+  return Buffer.from(JSON.stringify([row.createdAt, row.id])).toString('base64url')
+}
+
+export const decodeCursor = (cursor) => {
+  try {
+    const [createdAt, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'))
+    if (typeof createdAt !== 'string' || typeof id !== 'string') return null
+    return { createdAt, id }
+  } catch (error) {
+    return null
+  }
+}
+
+// Parse `limit` and `after` from the query string
+export const parsePageParams = (searchParams) => {
+  const rawLimit = searchParams.get('limit')
+  const limit = rawLimit === null ? DEFAULT_PAGE_SIZE : Number(rawLimit)
+  if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PAGE_SIZE) {
+    return { error: `limit must be an integer between 1 and ${MAX_PAGE_SIZE}` }
+  }
+
+  const after = searchParams.get('after')
+  if (!after) return { limit, after: null }
+
+  const cursor = decodeCursor(after)
+  if (!cursor) return { error: 'Invalid cursor' }
+  return { limit, after: cursor }
+}
+
+const quote = (value) => `"${String(value).replace(/"/g, '\\"')}"`
+
+// Apply ordering, the keyset predicate and a limit of one extra row so we can
+// tell whether another page exists without a count query
+export const paginate = (query, { limit, after }) => {
+  if (after) {
+    query = query.or(
+      `createdAt.lt.${quote(after.createdAt)},and(createdAt.eq.${quote(after.createdAt)},id.lt.${quote(after.id)})`
+    )
+  }
+  return query
+    .order('createdAt', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(limit + 1)
+}
+
+export const toPage = (rows, limit) => {
+  const hasMore = rows.length > limit
+  const data = hasMore ? rows.slice(0, limit) : rows
+  return {
+    data,
+    nextCursor: hasMore ? encodeCursor(data[data.length - 1]) : null
+  }
+}
@@ -0,0 +1,345 @@
+import { jsPDF } from 'jspdf'
+import { loadImage } from './assets.js'
+import { createLruCache } from './cache.js'
+import { getDocument, documentVersion } from './records.js'
+import { recordCacheLookup } from './metrics.js'
+import { span } from './tracing.js'
+import { formatMoney, itemPrice } from './money.js'
+
+// Vector PDF rendering for quotes and purchase orders, laid out directly from
+// the document data. Text stays text, images are embedded once at their own
+// resolution, and long item tables flow onto further pages with a repeated
+// header row.
+
+const PAGE_WIDTH = 210
+const PAGE_HEIGHT = 297
+const MARGIN = 15
+const CONTENT_WIDTH = PAGE_WIDTH - MARGIN * 2
+const FOOTER_HEIGHT = 14
+const BOTTOM = PAGE_HEIGHT - MARGIN - FOOTER_HEIGHT
+
+const COLUMNS = [
+  { key: 'description', label: 'Description', width: CONTENT_WIDTH - 20 - 30 - 32, align: 'left' },
+  { key: 'quantity', label: 'Qty', width: 20, align: 'center' },
+  { key: 'price', label: 'Price', width: 30, align: 'right' },
+  { key: 'total', label: 'Total', width: 32, align: 'right' }
+]
+
+const IMAGE_FORMATS = { 'image/png': 'PNG', 'image/jpeg': 'JPEG', 'image/jpg': 'JPEG' }
+
+const formatDate = (dateString) => {
+  return new Date(dateString).toLocaleDateString('en-US', {
+    year: 'numeric',
+    month: 'long',
+    day: 'numeric'
+  })
+}
+
+const lineHeight = (fontSize) => fontSize * 0.3528 * 1.3
+
+export const pdfFilename = (type, doc) => {
+  const date = new Date().toISOString().split('T')[0]
+  return type === 'quote'
+    ? `Quote_${doc.quoteNumber}_${date}.pdf`
+    : `PurchaseOrder_${doc.poNumber}_${date}.pdf`
+}
+
+// Draw an image scaled to fit a box, keeping its aspect ratio
+const drawImage = (pdf, image, x, y, maxWidth, maxHeight, align = 'left') => {
+  const format = image && IMAGE_FORMATS[image.mimeType]
+  if (!format) return 0
+  try {
+    const data = new Uint8Array(image.bytes)
+    const { width, height } = pdf.getImageProperties(data)
+    const scale = Math.min(maxWidth / width, maxHeight / height)
+    const w = width * scale
+    const h = height * scale
+    const left = align === 'center' ? x + (maxWidth - w) / 2 : x
+    pdf.addImage(data, format, left, y, w, h, undefined, 'FAST')
+    return h
+  } catch (error) {
+    console.error('PDF image error:', error)
+    return 0
+  }
+}
+
+const setText = (pdf, size, style = 'normal', color = 17) => {
+  pdf.setFont('helvetica', style)
+  pdf.setFontSize(size)
+  pdf.setTextColor(color)
+}
+
+const drawHeader = (pdf, type, doc, company, images) => {
+  let left = MARGIN
+  if (images.logo && drawImage(pdf, images.logo, MARGIN, MARGIN, 16, 16)) {
+    left += 20
+  }
+
+  let y = MARGIN + 5
+  setText(pdf, 14, 'bold')
+  pdf.text(company.name || 'Company Name', left, y)
+  y += 5
+
+  setText(pdf, 8, 'normal', 90)
+  const details = [
+    ...(company.address ? pdf.splitTextToSize(company.address, 95) : []),
+    company.phone && `Phone: ${company.phone}`,
+    company.email && `Email: ${company.email}`
+  ].filter(Boolean)
+  for (const line of details) {
+    pdf.text(line, left, y)
+    y += lineHeight(8)
+  }
+
+  const right = PAGE_WIDTH - MARGIN
+  let ry = MARGIN + 6
+  setText(pdf, 18, 'bold')
+  pdf.text(type === 'quote' ? 'QUOTE' : 'PURCHASE ORDER', right, ry, { align: 'right' })
+  ry += 7
+
+  setText(pdf, 8, 'normal', 90)
+  const meta = [
+    type === 'quote' ? `Quote #: ${doc.quoteNumber}` : `PO #: ${doc.poNumber}`,
+    type === 'purchase-order' && doc.quoteNumber && `Quote #: ${doc.quoteNumber}`,
+    type === 'quote' && doc.poNumber && `PO #: ${doc.poNumber}`,
+    `Date: ${formatDate(doc.createdAt)}`
+  ].filter(Boolean)
+  for (const line of meta) {
+    pdf.text(line, right, ry, { align: 'right' })
+    ry += lineHeight(8)
+  }
+
+  return Math.max(y, ry, MARGIN + 20) + 4
+}
+
+const drawBillTo = (pdf, doc, y) => {
+  setText(pdf, 10, 'bold')
+  pdf.text('Bill To:', MARGIN, y)
+  y += 2
+
+  const lines = [
+    ...pdf.splitTextToSize(doc.billToAddress || '', CONTENT_WIDTH - 6),
+    doc.billToContact && `Contact: ${doc.billToContact}`
+  ].filter(Boolean)
+  const height = 6 + lineHeight(9) + lines.length * lineHeight(8)
+
+  pdf.setFillColor(249, 250, 251)
+  pdf.rect(MARGIN, y, CONTENT_WIDTH, height, 'F')
+
+  let ty = y + 5
+  setText(pdf, 9, 'bold')
+  pdf.text(doc.billTo || 'Customer Name', MARGIN + 3, ty)
+  ty += lineHeight(9)
+  setText(pdf, 8, 'normal', 90)
+  for (const line of lines) {
+    pdf.text(line, MARGIN + 3, ty)
+    ty += lineHeight(8)
+  }
+  return y + height + 6
+}
+
+const drawTableHeader = (pdf, y) => {
+  const height = 7
+  pdf.setFillColor(249, 250, 251)
+  pdf.setDrawColor(209, 213, 219)
+  pdf.rect(MARGIN, y, CONTENT_WIDTH, height, 'FD')
+  setText(pdf, 8, 'bold')
+
+  let x = MARGIN
+  for (const column of COLUMNS) {
+    drawCell(pdf, column.label, x, y + 4.7, column)
+    x += column.width
+  }
+  return y + height
+}
+
+const drawCell = (pdf, text, x, y, column) => {
+  if (column.align === 'right') {
+    pdf.text(text, x + column.width - 2, y, { align: 'right' })
+  } else if (column.align === 'center') {
+    pdf.text(text, x + column.width / 2, y, { align: 'center' })
+  } else {
+    pdf.text(text, x + 2, y)
+  }
+}
+
+const drawItems = (pdf, items, y) => {
+  y = drawTableHeader(pdf, y)
+  setText(pdf, 8)
+
+  items.forEach((item, index) => {
+    const description = pdf.splitTextToSize(String(item.description || ''), COLUMNS[0].width - 4)
+    const height = Math.max(1, description.length) * lineHeight(8) + 3
+
+    if (y + height > BOTTOM) {
+      pdf.addPage()
+      y = drawTableHeader(pdf, MARGIN)
+      setText(pdf, 8)
+    }
+
+    if (index % 2 === 1) {
+      pdf.setFillColor(249, 250, 251)
+      pdf.rect(MARGIN, y, CONTENT_WIDTH, height, 'F')
+    }
+    pdf.setDrawColor(209, 213, 219)
+    pdf.rect(MARGIN, y, CONTENT_WIDTH, height, 'S')
+
+    const baseline = y + 4.5
+    const values = {
+      description,
+      quantity: String(item.quantity ?? ''),
+      price: formatMoney(itemPrice(item)),
+      total: formatMoney(item.total)
+    }
+    let x = MARGIN
+    for (const column of COLUMNS) {
+      drawCell(pdf, values[column.key], x, baseline, column)
+      x += column.width
+    }
+    y += height
+  })
+
+  return y + 6
+}
+
+const ensureSpace = (pdf, y, height) => {
+  if (y + height <= BOTTOM) return y
+  pdf.addPage()
+  return MARGIN
+}
+
+const drawTotals = (pdf, doc, y) => {
+  y = ensureSpace(pdf, y, 26)
+  const width = 70
+  const x = PAGE_WIDTH - MARGIN - width
+  pdf.setFillColor(249, 250, 251)
+  pdf.rect(x, y, width, 24, 'F')
+
+  const rows = [
+    ['Subtotal:', formatMoney(doc.subtotal)],
+    [`VAT (${doc.vatRate}%):`, formatMoney(doc.vatAmount)]
+  ]
+  let ty = y + 6
+  for (const [label, value] of rows) {
+    setText(pdf, 8, 'normal', 60)
+    pdf.text(label, x + 3, ty)
+    setText(pdf, 8, 'bold')
+    pdf.text(value, x + width - 3, ty, { align: 'right' })
+    ty += 5
+  }
+  pdf.setDrawColor(209, 213, 219)
+  pdf.line(x + 3, ty - 2, x + width - 3, ty - 2)
+  ty += 3
+  setText(pdf, 10, 'bold')
+  pdf.text('Total:', x + 3, ty)
+  pdf.text(formatMoney(doc.totalAmount), x + width - 3, ty, { align: 'right' })
+
+  return y + 30
+}
+
+const drawNotes = (pdf, notes, y) => {
+  if (!notes) return y
+  y = ensureSpace(pdf, y, 14)
+  setText(pdf, 10, 'bold')
+  pdf.text('Notes & Remarks:', MARGIN, y)
+  y += 5
+
+  setText(pdf, 8, 'normal', 60)
+  for (const line of pdf.splitTextToSize(notes, CONTENT_WIDTH - 6)) {
+    y = ensureSpace(pdf, y, lineHeight(8))
+    pdf.text(line, MARGIN + 3, y)
+    y += lineHeight(8)
+  }
+  return y + 6
+}
+
+const drawSignatures = (pdf, images, y) => {
+  y = ensureSpace(pdf, y, 32)
+  const signatureX = MARGIN + 10
+  if (images.signature) {
+    drawImage(pdf, images.signature, signatureX, y, 34, 16, 'center')
+  }
+  pdf.setDrawColor(156, 163, 175)
+  pdf.line(signatureX, y + 20, signatureX + 34, y + 20)
+  setText(pdf, 8, 'normal', 90)
+  pdf.text('Authorized Signature', signatureX + 17, y + 24, { align: 'center' })
+
+  if (images.seal) {
+    const sealX = PAGE_WIDTH - MARGIN - 10 - 22
+    drawImage(pdf, images.seal, sealX, y, 22, 18, 'center')
+    pdf.text('Company Seal', sealX + 11, y + 24, { align: 'center' })
+  }
+  return y + 30
+}
+
+const drawFooters = (pdf, type, generated) => {
+  const pages = pdf.getNumberOfPages()
+  for (let page = 1; page <= pages; page++) {
+    pdf.setPage(page)
+    const y = PAGE_HEIGHT - MARGIN - FOOTER_HEIGHT + 4
+    pdf.setDrawColor(209, 213, 219)
+    pdf.line(MARGIN, y, PAGE_WIDTH - MARGIN, y)
+    setText(pdf, 7, 'normal', 110)
+    pdf.text(
+      `This ${type === 'quote' ? 'quote' : 'purchase order'} is valid for 30 days from the date of issue.`,
+      PAGE_WIDTH / 2, y + 4, { align: 'center' }
+    )
+    pdf.text(`Generated on ${generated}`, MARGIN, y + 8)
+    pdf.text(`Page ${page} of ${pages}`, PAGE_WIDTH - MARGIN, y + 8, { align: 'right' })
+  }
+}
+
+// The date a PDF rendered now says it was generated on
+const generatedToday = () => formatDate(new Date().toISOString())
+
+// Render a quote or purchase order to PDF bytes.
+// `images` holds { logo, signature, seal } as { mimeType, bytes } or null.
+export const renderDocumentPdf = ({ type, doc, company = {}, images = {}, generated = generatedToday() }) => {
+  const pdf = new jsPDF({ unit: 'mm', format: 'a4', compress: true })
+  pdf.setProperties({
+    title: type === 'quote' ? `Quote ${doc.quoteNumber}` : `Purchase Order ${doc.poNumber}`,
+    author: company.name || ''
+  })
+
+  let y = drawHeader(pdf, type, doc, company, images)
+  y = drawBillTo(pdf, doc, y)
+  y = drawItems(pdf, doc.items || [], y)
+  y = drawTotals(pdf, doc, y)
+  y = drawNotes(pdf, doc.notes, y)
+  drawSignatures(pdf, images, y)
+  drawFooters(pdf, type, generated)
+
+  return Buffer.from(pdf.output('arraybuffer'))
+}
+
+// Load the company images for a document and render it
+export const renderWithImages = async (type, doc, load = loadImage, generated = generatedToday()) => {
+  const company = doc.companies || {}
+  const [logo, signature, seal] = await Promise.all(
+    [company.logo, company.signature, company.seal].map(load)
+  )
+  return renderDocumentPdf({ type, doc, company, images: { logo, signature, seal }, generated })
+}
+
+// Rendered PDFs keyed by document id, the updatedAt of the document and its
+// company, and the generation date printed in the footer
+const pdfCache = createLruCache({ max: 200 })
+
+// Load a quote or purchase order and render it, reusing a cached render when
+// neither the document nor its company changed. Returns null if not found.
+export const getDocumentPdf = async (table, type, id) => {
+  const result = await getDocument(table, id)
+  if (!result) return null
+  const { doc } = result
+
+  const generated = generatedToday()
+  const key = `${type}:${documentVersion(doc)}:${generated}`
+  const filename = pdfFilename(type, doc)
+
+  const cached = pdfCache.get(key)
+  recordCacheLookup('pdf', Boolean(cached))
+  if (cached) return { doc, key, filename, bytes: cached, cached: true }
+
+  const bytes = pdfCache.set(key, await span('render', () => renderWithImages(type, doc, loadImage, generated)))
+  return { doc, key, filename, bytes, cached: false }
+}
@@ -0,0 +1,43 @@
+import { supabase, inChunks } from './supabase.js'
+import { LINE_ITEM_SELECT, withItems } from './items.js'
+import { computeTotals, roundMoney } from './money.js'
+
+// Server-side document amounts (lib/money.js). Quotes and purchase orders
+// with line items get their item totals, subtotal, VAT and total recomputed
+// from the items whatever the client sent; documents without items keep the
+// amounts they were given, rounded to the currency.
+
+const AMOUNT_COLUMNS = ['subtotal', 'vatAmount', 'totalAmount']
+
+// Whether a write can change a document's amounts
+export const affectsTotals = (body) => {
+  return ['items', 'vatRate', ...AMOUNT_COLUMNS].some(field => body[field] !== undefined)
+}
+
+// `row` holds the document's columns as they will be written (at least its
+// vatRate) and `items` the line items it ends up with. Returns { row, items }
+// with the amounts filled in, or { error }.
+export const priceDocument = (row, items) => {
+  const { items: priced, error, ...totals } = computeTotals(items, row.vatRate)
+  if (error) return { error }
+  if (items.length) return { row: { ...row, ...totals }, items: priced }
+
+  const amounts = {}
+  for (const column of AMOUNT_COLUMNS) {
+    if (row[column] === undefined) continue
+    amounts[column] = roundMoney(row[column])
+    if (amounts[column] === null) return { error: `${column} must be a number` }
+  }
+  return { row: { ...row, ...amounts }, items }
+}
+
+// What an update's amounts are computed from: the stored vatRate and line
+// items of each document, by id
+export const loadPricing = async (table, ids) => {
+  const { data, error } = await inChunks(ids, chunk => (
+    supabase.from(table).select(`id, vatRate, ${LINE_ITEM_SELECT}`).in('id', chunk)
+  ))
+
+  if (error) throw new Error(error.message)
+  return new Map(data.map(row => [row.id, withItems(row)]))
+}
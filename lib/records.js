@@ -0,0 +1,58 @@
+import { createHash } from 'crypto'
+import { supabase } from './supabase.js'
+import { createLruCache } from './cache.js'
+import { LINE_ITEM_SELECT, withItems } from './items.js'
+import { recordCacheLookup } from './metrics.js'
+
+// Read-through cache for single quotes and purchase orders with their
+// company letterhead and line items. Write handlers invalidate entries, and
+// the ETag is derived from the updatedAt of the document and its company.
+
+// Columns a document needs to be shown or rendered
+export const DOCUMENT_SELECT = `*, companies (id, name, logo, address, phone, email, signature, seal, updatedAt), ${LINE_ITEM_SELECT}`
+
+const RECORD_TTL_MS = 5 * 60 * 1000
+
+const recordCache = createLruCache({ max: 500, ttlMs: RECORD_TTL_MS })
+
+// Bumped on every invalidation so a read that overlaps a write does not
+// cache the row it read before the write
+let generation = 0
+
+export const documentVersion = (doc) => `${doc.id}:${doc.updatedAt}:${doc.companies?.updatedAt || ''}`
+
+const documentEtag = (doc) => `"${createHash('sha1').update(documentVersion(doc)).digest('hex')}"`
+
+// Returns { doc, etag, cached }, or null if the document does not exist
+export const getDocument = async (table, id) => {
+  const key = `${table}:${id}`
+  const cached = recordCache.get(key)
+  recordCacheLookup('record', Boolean(cached))
+  if (cached) return { ...cached, cached: true }
+
+  const started = generation
+  const { data, error } = await supabase
+    .from(table)
+    .select(DOCUMENT_SELECT)
+    .eq('id', id)
+    .maybeSingle()
+
+  if (error) throw new Error(error.message)
+  if (!data) return null
+
+  const entry = { doc: withItems(data), etag: documentEtag(data) }
+  if (started === generation) recordCache.set(key, entry)
+  return { ...entry, cached: false }
+}
+
+export const invalidateDocument = (table, id) => {
+  generation++
+  recordCache.delete(`${table}:${id}`)
+}
+
+// Drop every cached document of a table, or of all tables
+export const invalidateDocuments = (table) => {
+  generation++
+  if (table) recordCache.deletePrefix(`${table}:`)
+  else recordCache.clear()
+}
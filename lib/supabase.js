@@ -1,9 +1,34 @@
 import { createClient } from '@supabase/supabase-js'
+import { ulid } from './ids.js'
+import { tracedFetch } from './tracing.js'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
 const supabaseAnonKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY
 
-export const supabase = createClient(supabaseUrl, supabaseAnonKey)
+// Every query is timed into the current request's trace (lib/tracing.js)
+export const supabase = createClient(supabaseUrl, supabaseAnonKey, { global: { fetch: tracedFetch } })
+
+// Values per `.in()` filter. The values go in the request URL, and a
+// thousand ids make one long enough for proxies and PostgREST to answer 414.
+export const IN_FILTER_CHUNK = 100
+
+export const chunked = (values, size = IN_FILTER_CHUNK) => {
+  const chunks = []
+  for (let start = 0; start < values.length; start += size) chunks.push(values.slice(start, start + size))
+  return chunks
+}
+
+// Run `query(values)` one chunk of values at a time and concatenate the
+// rows; stops at the first error
+export const inChunks = async (values, query) => {
+  const rows = []
+  for (const chunk of chunked(values)) {
+    const { data, error } = await query(chunk)
+    if (error) return { data: null, error }
+    rows.push(...(data || []))
+  }
+  return { data: rows, error: null }
+}
 
 // Database initialization function
 export const initializeDatabase = async () => {
@@ -21,7 +46,5 @@ export const initializeDatabase = async () => {
   }
 }
 
-// Generate unique ID
-export const generateId = () => {
-  return `${Date.now()}_${Math.random().toString(36).substr(2, 9)}`
-}
\ No newline at end of file
+// Generate a unique, time-sortable ID
+export const generateId = () => ulid()
\ No newline at end of file
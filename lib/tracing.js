@@ -0,0 +1,148 @@
+import { AsyncLocalStorage } from 'async_hooks'
+import {
+  LATENCY_BUCKETS,
+  SIZE_BUCKETS,
+  defineHistogram,
+  incrementCounter,
+  defineCounter,
+  observeHistogram
+} from './metrics.js'
+
+// Per-request instrumentation. Each API request runs inside a trace held
+// in AsyncLocalStorage; the Supabase client's fetch adds every database
+// round trip to the current trace, and handlers can time other phases with
+// span(). When the handler returns, the trace becomes a Server-Timing
+// header, a JSON log line and histogram observations.
+
+const storage = new AsyncLocalStorage()
+
+defineHistogram('http_request_duration_seconds', 'API handler time by method, route and status', LATENCY_BUCKETS)
+defineHistogram('http_request_db_seconds', 'Database time per API request by method and route', LATENCY_BUCKETS)
+defineHistogram('http_response_size_bytes', 'API response body size by method and route', SIZE_BUCKETS)
+defineHistogram('db_query_duration_seconds', 'Database round trips by table and HTTP method', LATENCY_BUCKETS)
+defineCounter('db_rows_total', 'Rows returned by database queries by table')
+
+// Set API_REQUEST_LOG=false to silence the per-request log lines
+const LOG_REQUESTS = process.env.API_REQUEST_LOG !== 'false'
+
+const elapsedMs = (start) => Number(process.hrtime.bigint() - start) / 1e6
+
+export const startTrace = (method, route) => ({
+  method,
+  route,
+  start: process.hrtime.bigint(),
+  db: { queries: 0, ms: 0, rows: 0 },
+  spans: new Map(),
+  bytes: null
+})
+
+export const runWithTrace = (trace, fn) => storage.run(trace, fn)
+
+export const currentTrace = () => storage.getStore()
+
+// Add `ms` to a named phase of the current request
+export const recordSpan = (name, ms) => {
+  const trace = currentTrace()
+  if (trace) trace.spans.set(name, (trace.spans.get(name) || 0) + ms)
+}
+
+// Time `fn` as a named phase of the current request
+export const span = async (name, fn) => {
+  const start = process.hrtime.bigint()
+  try {
+    return await fn()
+  } finally {
+    recordSpan(name, elapsedMs(start))
+  }
+}
+
+export const recordResponseBytes = (bytes) => {
+  const trace = currentTrace()
+  if (trace) trace.bytes = bytes
+}
+
+// PostgREST reports the rows it returned as Content-Range: 0-49/* or */0
+const rowsFromRange = (range) => {
+  const match = /^(\d+)-(\d+)\//.exec(range || '')
+  return match ? Number(match[2]) - Number(match[1]) + 1 : 0
+}
+
+const tableFromUrl = (url) => {
+  const match = /\/rest\/v1\/(rpc\/)?([^/?]+)/.exec(url)
+  if (!match) return 'other'
+  return match[1] ? `rpc:${match[2]}` : match[2]
+}
+
+// fetch for the Supabase client: times each round trip, body included
+export const tracedFetch = async (input, init) => {
+  const start = process.hrtime.bigint()
+  const response = await fetch(input, init)
+  const body = await response.arrayBuffer()
+  const ms = elapsedMs(start)
+
+  const url = typeof input === 'string' ? input : input.url
+  const table = tableFromUrl(url)
+  const rows = rowsFromRange(response.headers.get('content-range'))
+  observeHistogram('db_query_duration_seconds', { table, method: init?.method || 'GET' }, ms / 1000)
+  if (rows) incrementCounter('db_rows_total', { table }, rows)
+
+  const trace = currentTrace()
+  if (trace) {
+    trace.db.queries++
+    trace.db.ms += ms
+    trace.db.rows += rows
+  }
+
+  // Statuses such as 204 must not carry a body, not even an empty one
+  const nullBody = [101, 204, 205, 304].includes(response.status)
+  return new Response(nullBody ? null : body, {
+    status: response.status,
+    statusText: response.statusText,
+    headers: response.headers
+  })
+}
+
+const timing = (name, ms, description) => {
+  const desc = description ? `;desc="${description.replace(/"/g, "'")}"` : ''
+  return `${name};dur=${ms.toFixed(1)}${desc}`
+}
+
+// Finish a request: Server-Timing header, log line and metrics
+export const finishTrace = (trace, response) => {
+  const totalMs = elapsedMs(trace.start)
+  const status = response.status
+  const bytes = trace.bytes ?? (Number(response.headers.get('content-length')) || null)
+  const spanMs = [...trace.spans.values()].reduce((sum, ms) => sum + ms, 0)
+  const appMs = Math.max(0, totalMs - trace.db.ms - spanMs)
+
+  const header = [
+    timing('db', trace.db.ms, `${trace.db.queries} queries: ${trace.db.rows} rows`),
+    ...[...trace.spans].map(([name, ms]) => timing(name, ms)),
+    timing('app', appMs),
+    timing('total', totalMs, `${trace.method} ${trace.route}`)
+  ].join(', ')
+  try {
+    response.headers.set('Server-Timing', header)
+  } catch (error) {
+    // Some responses (redirects) have immutable headers
+  }
+
+  const labels = { method: trace.method, route: trace.route }
+  observeHistogram('http_request_duration_seconds', { ...labels, status }, totalMs / 1000)
+  observeHistogram('http_request_db_seconds', labels, trace.db.ms / 1000)
+  if (bytes !== null) observeHistogram('http_response_size_bytes', labels, bytes)
+
+  if (LOG_REQUESTS) {
+    console.log(JSON.stringify({
+      time: new Date().toISOString(),
+      msg: 'request',
+      method: trace.method,
+      route: trace.route,
+      status,
+      totalMs: Number(totalMs.toFixed(2)),
+      db: { queries: trace.db.queries, ms: Number(trace.db.ms.toFixed(2)), rows: trace.db.rows },
+      spans: Object.fromEntries([...trace.spans].map(([name, ms]) => [name, Number(ms.toFixed(2))])),
+      bytes
+    }))
+  }
+}
@@ -0,0 +1,185 @@
+import { supabase } from './supabase.js'
+import { COLUMNS } from './fields.js'
+import { LINE_ITEM_SELECT, withItems } from './items.js'
+import { paginate, toPage } from './pagination.js'
+import { applyFilters } from './filters.js'
+import { csvRow, createCsvParser } from './csv.js'
+import { createRows } from './batch.js'
+
+// Streaming NDJSON/CSV export and import of quotes and purchase orders.
+// Exports walk the table a keyset page at a time and only fetch the next
+// page when the client has consumed the previous one; imports parse the
+// upload as it arrives and insert it in batches. Memory use stays flat
+// whatever the size of the data.
+
+export const TRANSFER_FORMATS = {
+  ndjson: 'application/x-ndjson',
+  csv: 'text/csv; charset=utf-8'
+}
+
+const EXPORT_PAGE_SIZE = 1000
+const IMPORT_BATCH_SIZE = 500
+const MAX_REPORTED_ERRORS = 100
+
+const NUMERIC_COLUMNS = ['subtotal', 'vatRate', 'vatAmount', 'totalAmount']
+
+const exportColumns = (table) => [...COLUMNS[table], 'items']
+
+// Pick the format from ?format= or the Content-Type/Accept header
+export const parseFormat = (value, header = '') => {
+  if (value) return TRANSFER_FORMATS[value] ? value : null
+  return header.includes('csv') ? 'csv' : 'ndjson'
+}
+
+export const exportStream = (table, format, filters) => {
+  const columns = exportColumns(table)
+  const encoder = new TextEncoder()
+  let after = null
+  let headerSent = format !== 'csv'
+
+  return new ReadableStream({
+    async pull(controller) {
+      if (!headerSent) {
+        headerSent = true
+        controller.enqueue(encoder.encode(csvRow(columns)))
+        return
+      }
+
+      const { data, error } = await paginate(
+        applyFilters(
+          supabase.from(table).select(`${COLUMNS[table].join(',')},${LINE_ITEM_SELECT}`),
+          filters
+        ),
+        { limit: EXPORT_PAGE_SIZE, after }
+      )
+      if (error) {
+        controller.error(new Error(error.message))
+        return
+      }
+
+      const page = toPage(data, EXPORT_PAGE_SIZE)
+      const rows = page.data.map(withItems)
+      const text = rows
+        .map(row => format === 'csv' ? csvRow(columns.map(column => row[column])) : `${JSON.stringify(row)}\n`)
+        .join('')
+      if (text) controller.enqueue(encoder.encode(text))
+
+      if (page.nextCursor) {
+        const last = rows[rows.length - 1]
+        after = { createdAt: last.createdAt, id: last.id }
+      } else {
+        controller.close()
+      }
+    }
+  })
+}
+
+// Turn a CSV record into an API object; empty cells fall back to defaults
+const fromCsvRecord = (header, values) => {
+  const record = {}
+  header.forEach((column, index) => {
+    const value = values[index]
+    if (value === undefined || value === '') return
+    if (column === 'items') record.items = JSON.parse(value)
+    else if (NUMERIC_COLUMNS.includes(column)) record[column] = Number(value)
+    else record[column] = value
+  })
+  return record
+}
+
+// Yield [recordNumber, record or Error] from an NDJSON or CSV byte stream
+async function* readRecords(format, body) {
+  const decoder = new TextDecoder()
+  let number = 0
+
+  if (format === 'csv') {
+    const parser = createCsvParser()
+    let header = null
+    const convert = function* (records) {
+      for (const values of records) {
+        if (!header) {
+          header = values.map(column => column.trim())
+          continue
+        }
+        number++
+        try {
+          yield [number, fromCsvRecord(header, values)]
+        } catch (error) {
+          yield [number, new Error(`Invalid record: ${error.message}`)]
+        }
+      }
+    }
+    for await (const chunk of body) {
+      yield* convert(parser.push(decoder.decode(chunk, { stream: true })))
+    }
+    yield* convert(parser.push(decoder.decode()))
+    let rest
+    try {
+      rest = parser.end()
+    } catch (error) {
+      // A truncated upload ends inside a quoted field; fail that last record
+      // like any other unparseable one
+      yield [number + 1, new Error(`Invalid record: ${error.message}`)]
+      return
+    }
+    yield* convert(rest)
+    return
+  }
+
+  let buffer = ''
+  const convert = function* (lines) {
+    for (const line of lines) {
+      if (!line.trim()) continue
+      number++
+      try {
+        yield [number, JSON.parse(line)]
+      } catch (error) {
+        yield [number, new Error(`Invalid JSON: ${error.message}`)]
+      }
+    }
+  }
+  for await (const chunk of body) {
+    buffer += decoder.decode(chunk, { stream: true })
+    const lines = buffer.split('\n')
+    buffer = lines.pop()
+    yield* convert(lines)
+  }
+  yield* convert([buffer + decoder.decode()])
+}
+
+// Import an upload, inserting it IMPORT_BATCH_SIZE records at a time.
+// Ids and timestamps in the records are kept, so an export can be
+// re-imported elsewhere.
+export const importStream = async (table, format, body) => {
+  const summary = { received: 0, imported: 0, failed: 0, errors: [] }
+  const fail = (record, error) => {
+    summary.failed++
+    if (summary.errors.length < MAX_REPORTED_ERRORS) summary.errors.push({ record, error })
+  }
+
+  let batch = []
+  const flush = async () => {
+    const entries = batch
+    batch = []
+    // createRows reports each record on its own, so a bad record fails
+    // alone rather than taking the rest of its batch with it
+    const results = await createRows(table, entries.map(entry => entry.record), { preserveIds: true })
+    entries.forEach((entry, index) => {
+      const result = results[index]
+      if (!result || result.status === 'error') fail(entry.number, result?.error ?? 'Not imported')
+      else summary.imported++
+    })
+  }
+
+  for await (const [number, record] of readRecords(format, body || [])) {
+    summary.received++
+    if (record instanceof Error) {
+      fail(number, record.message)
+      continue
+    }
+    batch.push({ number, record })
+    if (batch.length >= IMPORT_BATCH_SIZE) await flush()
+  }
+  if (batch.length) await flush()
+  return summary
+}
@@ -0,0 +1,178 @@
+import { createWriteStream } from 'fs'
+import { once } from 'events'
+
+// Minimal streaming ZIP writer (stored entries, no compression: PDFs are
+// already compressed). Each entry is written as soon as it is added, so only
+// the small central directory is held in memory. Sizes, offsets and entry
+// counts past the classic format's 32- and 16-bit fields are written as
+// ZIP64 records, so archives of any size stay readable.
+
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256)
+  for (let n = 0; n < 256; n++) {
+    let c = n
+    for (let k = 0; k < 8; k++) {
+      c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1
+    }
+    table[n] = c >>> 0
+  }
+  return table
+})()
+
+export const crc32 = (bytes) => {
+  let crc = 0xffffffff
+  for (let i = 0; i < bytes.length; i++) {
+    crc = CRC_TABLE[(crc ^ bytes[i]) & 0xff] ^ (crc >>> 8)
+  }
+  return (crc ^ 0xffffffff) >>> 0
+}
+
+const dosDateTime = (date) => {
+  const time = (date.getHours() << 11) | (date.getMinutes() << 5) | Math.floor(date.getSeconds() / 2)
+  const day = ((date.getFullYear() - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate()
+  return { time, day }
+}
+
+// Field values meaning "see the ZIP64 record"
+const ZIP64_32 = 0xffffffff
+const ZIP64_16 = 0xffff
+
+// Version needed to extract: 2.0, or 4.5 for ZIP64
+const VERSION = 20
+const VERSION_ZIP64 = 45
+
+// ZIP64 extended information extra field holding the given 64-bit values
+const zip64Extra = (values) => {
+  const extra = Buffer.alloc(4 + values.length * 8)
+  extra.writeUInt16LE(0x0001, 0)
+  extra.writeUInt16LE(values.length * 8, 2)
+  values.forEach((value, index) => extra.writeBigUInt64LE(BigInt(value), 4 + index * 8))
+  return extra
+}
+
+export const createZipWriter = (path) => {
+  const stream = createWriteStream(path)
+  const entries = []
+  let offset = 0
+  // Entries may be added from concurrent tasks; writes are chained so each
+  // entry lands contiguously in the file
+  let tail = Promise.resolve()
+
+  const write = async (buffer) => {
+    offset += buffer.length
+    if (!stream.write(buffer)) await once(stream, 'drain')
+  }
+
+  const writeEntry = async (name, bytes, date) => {
+    const nameBytes = Buffer.from(name, 'utf8')
+    const crc = crc32(bytes)
+    const { time, day } = dosDateTime(date)
+    const size = bytes.length
+    const large = size >= ZIP64_32
+    const extra = large ? zip64Extra([size, size]) : Buffer.alloc(0)
+
+    const header = Buffer.alloc(30)
+    header.writeUInt32LE(0x04034b50, 0)
+    header.writeUInt16LE(large ? VERSION_ZIP64 : VERSION, 4)
+    header.writeUInt16LE(0x0800, 6) // UTF-8 names
+    header.writeUInt16LE(0, 8) // stored
+    header.writeUInt16LE(time, 10)
+    header.writeUInt16LE(day, 12)
+    header.writeUInt32LE(crc, 14)
+    header.writeUInt32LE(large ? ZIP64_32 : size, 18)
+    header.writeUInt32LE(large ? ZIP64_32 : size, 22)
+    header.writeUInt16LE(nameBytes.length, 26)
+    header.writeUInt16LE(extra.length, 28)
+
+    entries.push({ nameBytes, crc, size, offset, time, day })
+    await write(header)
+    await write(nameBytes)
+    await write(extra)
+    await write(bytes)
+  }
+
+  return {
+    get bytesWritten() {
+      return offset
+    },
+
+    get entryCount() {
+      return entries.length
+    },
+
+    add(name, bytes, date = new Date()) {
+      const next = tail.then(() => writeEntry(name, bytes, date))
+      tail = next.catch(() => {})
+      return next
+    },
+
+    async close() {
+      await tail
+      const start = offset
+      for (const entry of entries) {
+        // Only the values that overflow go in the ZIP64 field, in this order
+        const largeSize = entry.size >= ZIP64_32
+        const largeOffset = entry.offset >= ZIP64_32
+        const extra = largeSize || largeOffset
+          ? zip64Extra([...(largeSize ? [entry.size, entry.size] : []), ...(largeOffset ? [entry.offset] : [])])
+          : Buffer.alloc(0)
+        const version = extra.length ? VERSION_ZIP64 : VERSION
+
+        const record = Buffer.alloc(46)
+        record.writeUInt32LE(0x02014b50, 0)
+        record.writeUInt16LE(version, 4)
+        record.writeUInt16LE(version, 6)
+        record.writeUInt16LE(0x0800, 8)
+        record.writeUInt16LE(0, 10)
+        record.writeUInt16LE(entry.time, 12)
+        record.writeUInt16LE(entry.day, 14)
+        record.writeUInt32LE(entry.crc, 16)
+        record.writeUInt32LE(largeSize ? ZIP64_32 : entry.size, 20)
+        record.writeUInt32LE(largeSize ? ZIP64_32 : entry.size, 24)
+        record.writeUInt16LE(entry.nameBytes.length, 28)
+        record.writeUInt16LE(extra.length, 30)
+        record.writeUInt32LE(largeOffset ? ZIP64_32 : entry.offset, 42)
+        await write(record)
+        await write(entry.nameBytes)
+        await write(extra)
+      }
+
+      const directorySize = offset - start
+      const zip64 = entries.length >= ZIP64_16 || directorySize >= ZIP64_32 || start >= ZIP64_32
+      if (zip64) {
+        const directoryEnd = offset
+        const record = Buffer.alloc(56)
+        record.writeUInt32LE(0x06064b50, 0)
+        record.writeBigUInt64LE(44n, 4) // size of the rest of the record
+        record.writeUInt16LE(VERSION_ZIP64, 12)
+        record.writeUInt16LE(VERSION_ZIP64, 14)
+        record.writeBigUInt64LE(BigInt(entries.length), 24)
+        record.writeBigUInt64LE(BigInt(entries.length), 32)
+        record.writeBigUInt64LE(BigInt(directorySize), 40)
+        record.writeBigUInt64LE(BigInt(start), 48)
+        await write(record)
+
+        const locator = Buffer.alloc(20)
+        locator.writeUInt32LE(0x07064b50, 0)
+        locator.writeBigUInt64LE(BigInt(directoryEnd), 8)
+        locator.writeUInt32LE(1, 16) // total disks
+        await write(locator)
+      }
+
+      const end = Buffer.alloc(22)
+      end.writeUInt32LE(0x06054b50, 0)
+      end.writeUInt16LE(zip64 ? ZIP64_16 : entries.length, 8)
+      end.writeUInt16LE(zip64 ? ZIP64_16 : entries.length, 10)
+      end.writeUInt32LE(zip64 ? ZIP64_32 : directorySize, 12)
+      end.writeUInt32LE(zip64 ? ZIP64_32 : start, 16)
+      await write(end)
+
+      stream.end()
+      await once(stream, 'finish')
+    },
+
+    abort() {
+      stream.destroy()
+    }
+  }
+}
@@ -0,0 +1,186 @@
+#!/usr/bin/env node
+// Bundle size and time-to-interactive of the dashboard. Builds the app,
+// splits the client JavaScript into what the first load of / needs and the
+// chunks that are only fetched later (the lazy modals), then serves the build
+// and times the dashboard in headless Chromium.
+//
+//   node scripts/bench-bundle.mjs [--skip-build] [--runs 5] [--port 3100]
+//                                 [--out report.json] [--baseline report.json]
+//
+// The timing needs the app's Supabase environment and Playwright
+// (npm i -D playwright && npx playwright install chromium); without
+// Playwright only the bundle sizes are reported. --baseline prints the change
+// against an earlier --out report.
+
+import { execSync, spawn } from 'node:child_process'
+import { existsSync, readFileSync, readdirSync, writeFileSync } from 'node:fs'
+import { join, relative } from 'node:path'
+import { gzipSync } from 'node:zlib'
+
+const args = process.argv.slice(2)
+const flag = (name) => args.includes(`--${name}`)
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`)
+  return index === -1 ? fallback : args[index + 1]
+}
+const RUNS = Number(option('runs', 5))
+const PORT = Number(option('port', 3100))
+const OUT = option('out', null)
+const BASELINE = option('baseline', null)
+
+const NEXT_DIR = '.next'
+
+// The dashboard is interactive once its first page of quotes has rendered
+// and the main thread then stays free of long tasks for this long
+const QUIET_MS = 1000
+
+const size = (file) => {
+  const contents = readFileSync(join(NEXT_DIR, file))
+  return { bytes: contents.length, gzip: gzipSync(contents).length }
+}
+
+const sum = (files) => files.map(size).reduce(
+  (total, { bytes, gzip }) => ({ bytes: total.bytes + bytes, gzip: total.gzip + gzip }),
+  { bytes: 0, gzip: 0 }
+)
+
+const walk = (dir) => readdirSync(dir, { withFileTypes: true }).flatMap(entry => (
+  entry.isDirectory() ? walk(join(dir, entry.name)) : [join(dir, entry.name)]
+))
+
+const bundles = () => {
+  const build = JSON.parse(readFileSync(join(NEXT_DIR, 'build-manifest.json'), 'utf8'))
+  const app = JSON.parse(readFileSync(join(NEXT_DIR, 'app-build-manifest.json'), 'utf8'))
+
+  const initial = [...new Set([...build.rootMainFiles, ...app.pages['/layout'], ...app.pages['/page']])]
+    .filter(file => file.endsWith('.js'))
+  // build.pages lists the chunks of the pages router's /_app and /_error,
+  // which Next.js builds even for an app router only project
+  const referenced = new Set([
+    ...build.rootMainFiles, ...build.polyfillFiles,
+    ...Object.values(build.pages).flat(), ...Object.values(app.pages).flat()
+  ])
+  // Chunks no entry point references are only loaded by dynamic imports
+  const lazy = walk(join(NEXT_DIR, 'static', 'chunks'))
+    .map(file => relative(NEXT_DIR, file))
+    .filter(file => file.endsWith('.js') && !referenced.has(file))
+
+  return {
+    initial: { files: initial.length, ...sum(initial) },
+    lazy: { files: lazy.length, ...sum(lazy) }
+  }
+}
+
+const median = (values) => {
+  const sorted = [...values].sort((a, b) => a - b)
+  return sorted[Math.floor(sorted.length / 2)]
+}
+
+const serve = async () => {
+  const server = spawn('npx', ['next', 'start', '--port', String(PORT)], { stdio: 'ignore' })
+  const url = `http://localhost:${PORT}`
+  for (let attempt = 0; attempt < 120; attempt++) {
+    try {
+      await fetch(`${url}/api/health`)
+      return { server, url }
+    } catch {
+      await new Promise(resolve => setTimeout(resolve, 500))
+    }
+  }
+  server.kill()
+  throw new Error(`next start did not come up on port ${PORT}`)
+}
+
+const timings = async () => {
+  let playwright
+  try {
+    playwright = await import('playwright')
+  } catch {
+    console.log('Playwright is not installed; skipping the time-to-interactive runs')
+    return null
+  }
+
+  const { server, url } = await serve()
+  const browser = await playwright.chromium.launch()
+  const runs = []
+  try {
+    for (let run = 0; run < RUNS; run++) {
+      // A fresh context each run, so nothing is served from the browser cache
+      const context = await browser.newContext({ viewport: { width: 1280, height: 900 } })
+      const page = await context.newPage()
+      await page.addInitScript(() => {
+        window.__longTasks = []
+        new PerformanceObserver(list => {
+          for (const entry of list.getEntries()) {
+            window.__longTasks.push([entry.startTime, entry.startTime + entry.duration])
+          }
+        }).observe({ type: 'longtask', buffered: true })
+      })
+      const firstPage = page.waitForResponse(response => new URL(response.url()).pathname === '/api/quotes',
+        { timeout: 60000 })
+      await page.goto(url, { waitUntil: 'load' })
+      await firstPage
+      const ready = await page.evaluate(() => new Promise(resolve => {
+        requestAnimationFrame(() => resolve(performance.now()))
+      }))
+      await page.waitForTimeout(QUIET_MS * 2)
+
+      const result = await page.evaluate(({ ready, quiet }) => {
+        const [navigation] = performance.getEntriesByType('navigation')
+        const paint = performance.getEntriesByName('first-contentful-paint')[0]
+        let interactive = ready
+        for (const [start, end] of window.__longTasks) {
+          if (start < interactive + quiet) interactive = Math.max(interactive, end)
+        }
+        const scripts = performance.getEntriesByType('resource')
+          .filter(entry => entry.initiatorType === 'script')
+        return {
+          fcpMs: paint ? paint.startTime : null,
+          domContentLoadedMs: navigation.domContentLoadedEventEnd,
+          readyMs: ready,
+          ttiMs: interactive,
+          scriptBytes: scripts.reduce((total, entry) => total + entry.transferSize, 0)
+        }
+      }, { ready, quiet: QUIET_MS })
+      runs.push(result)
+      await context.close()
+    }
+  } finally {
+    await browser.close()
+    server.kill()
+  }
+
+  return Object.fromEntries(Object.keys(runs[0]).map(key => [
+    key, Math.round(median(runs.map(run => run[key] ?? 0)))
+  ]))
+}
+
+if (!flag('skip-build') || !existsSync(join(NEXT_DIR, 'app-build-manifest.json'))) {
+  execSync('npx next build', { stdio: 'inherit' })
+}
+
+const report = { recordedAt: new Date().toISOString(), runs: RUNS, bundles: bundles(), timings: await timings() }
+const baseline = BASELINE ? JSON.parse(readFileSync(BASELINE, 'utf8')) : null
+
+const kb = (bytes) => (bytes / 1024).toFixed(1)
+const change = (after, before) => {
+  if (before === undefined || before === null) return ''
+  return before ? ` (${after >= before ? '+' : ''}${((after / before - 1) * 100).toFixed(1)}%)` : ''
+}
+
+console.log('Client JavaScript of /')
+console.log(`${'Bundle'.padEnd(10)} ${'files'.padStart(6)} ${'KB'.padStart(10)} ${'gzip KB'.padStart(10)}`)
+for (const [name, bundle] of Object.entries(report.bundles)) {
+  const before = baseline?.bundles?.[name]
+  console.log(`${name.padEnd(10)} ${String(bundle.files).padStart(6)} ${kb(bundle.bytes).padStart(10)} ` +
+    `${kb(bundle.gzip).padStart(10)}${change(bundle.gzip, before?.gzip)}`)
+}
+
+if (report.timings) {
+  console.log(`\nDashboard load, median of ${RUNS} runs`)
+  for (const [metric, value] of Object.entries(report.timings)) {
+    console.log(`${metric.padEnd(20)} ${String(value).padStart(10)}${change(value, baseline?.timings?.[metric])}`)
+  }
+}
+
+if (OUT) writeFileSync(OUT, JSON.stringify(report, null, 2) + '\n')
@@ -0,0 +1,116 @@
+#!/usr/bin/env node
+// Micro-benchmark of API dispatch overhead: the compiled route table in
+// lib/api/router.js against the if-chain dispatch route.js used before it.
+// Handlers are no-ops, so the numbers are the cost of finding the handler.
+//
+//   node scripts/bench-router.mjs [--iterations 200000] [--resources 3]
+//
+// --resources adds synthetic resources to both dispatchers to show how each
+// scales as routes are added.
+
+import { createRouter, apiSegments } from '../lib/api/router.js'
+
+const args = process.argv.slice(2)
+const option = (name, fallback) => {
+  const index = args.indexOf(`--${name}`)
+  return index === -1 ? fallback : Number(args[index + 1])
+}
+const ITERATIONS = option('iterations', 200000)
+const RESOURCE_COUNT = Math.max(3, option('resources', 3))
+
+const noop = () => null
+const RESOURCE_PATHS = [
+  'companies', 'quotes', 'purchase-orders',
+  ...Array.from({ length: RESOURCE_COUNT - 3 }, (_, index) => `resource-${index}`)
+]
+
+// Same shapes as lib/api/routes.js
+const routes = [
+  ['GET', '/health', noop],
+  ['GET', '/metrics', noop],
+  ['GET', '/dashboard/summary', noop],
+  ['POST', '/exports', noop],
+  ['GET', '/exports/:id', noop],
+  ['GET', '/exports/:id/download', noop],
+  ['DELETE', '/exports/:id', noop],
+  ['GET', '/assets/:hash', noop],
+  ['POST', '/assets', noop],
+  ...RESOURCE_PATHS.flatMap(path => [
+    ['GET', `/${path}`, noop],
+    ['GET', `/${path}/:id`, noop],
+    ['GET', `/${path}/:id/pdf`, noop],
+    ['GET', `/${path}/export`, noop],
+    ['POST', `/${path}`, noop],
+    ['POST', `/${path}/batch`, noop],
+    ['POST', `/${path}/import`, noop],
+    ['PUT', `/${path}/:id`, noop],
+    ['DELETE', `/${path}/:id`, noop]
+  ])
+]
+const router = createRouter(routes)
+
+const compiled = (method, url) => {
+  const { pathname } = new URL(url)
+  return router.match(method, apiSegments(pathname))
+}
+
+// The previous dispatch: parse, split and walk the conditions in order
+const legacy = (method, url) => {
+  const pathname = new URL(url).pathname
+  const pathParts = (pathname.split('/api/')[1] || '').split('/')
+  if (method === 'GET') {
+    if (pathParts[0] === 'health') return noop
+    if (pathParts[0] === 'metrics') return noop
+    if (pathParts[1] === 'export' && RESOURCE_PATHS.includes(pathParts[0])) return noop
+    if (pathParts[0] === 'dashboard' && pathParts[1] === 'summary') return noop
+    if (pathParts[0] === 'exports' && pathParts[1]) return noop
+    if (pathParts[0] === 'assets') return noop
+  }
+  if (method === 'POST') {
+    if (pathParts[0] === 'assets') return noop
+    if (pathParts[1] === 'import' && RESOURCE_PATHS.includes(pathParts[0])) return noop
+    if (pathParts[1] === 'batch' && RESOURCE_PATHS.includes(pathParts[0])) return noop
+    if (pathParts[0] === 'exports') return noop
+  }
+  if (method === 'DELETE' && pathParts[0] === 'exports') return noop
+  for (const path of RESOURCE_PATHS) {
+    if (pathParts[0] === path) {
+      if (method === 'GET' && pathParts[1] && pathParts[2] === 'pdf') return noop
+      return noop
+    }
+  }
+  return null
+}
+
+const last = RESOURCE_PATHS[RESOURCE_PATHS.length - 1]
+const REQUESTS = [
+  ['GET', 'http://localhost/api/health'],
+  ['GET', 'http://localhost/api/quotes?limit=50'],
+  ['GET', 'http://localhost/api/quotes/01J9ZQ4R6V3K8X2M5N7P0T1W4Y'],
+  ['GET', 'http://localhost/api/purchase-orders/01J9ZQ4R6V3K8X2M5N7P0T1W4Y/pdf'],
+  ['POST', 'http://localhost/api/purchase-orders/batch'],
+  ['PUT', `http://localhost/api/${last}/01J9ZQ4R6V3K8X2M5N7P0T1W4Y`],
+  ['DELETE', `http://localhost/api/${last}/01J9ZQ4R6V3K8X2M5N7P0T1W4Y`],
+  ['GET', 'http://localhost/api/missing/route']
+]
+
+const measure = (dispatch) => {
+  // Warm up so both run optimized code
+  for (let i = 0; i < 20000; i++) dispatch(...REQUESTS[i % REQUESTS.length])
+  const started = process.hrtime.bigint()
+  for (let i = 0; i < ITERATIONS; i++) dispatch(...REQUESTS[i % REQUESTS.length])
+  return Number(process.hrtime.bigint() - started) / ITERATIONS
+}
+
+// URL parsing is common to both; measure it alone to isolate matching
+const parseOnly = (method, url) => new URL(url).pathname
+
+const parse = measure(parseOnly)
+const results = [['if-chain', measure(legacy)], ['compiled', measure(compiled)]]
+
+console.log(`Dispatch overhead, ${routes.length} routes, ${RESOURCE_PATHS.length} resources, ${ITERATIONS} requests`)
+console.log(`${'Dispatcher'.padEnd(12)} ${'ns/request'.padStart(11)} ${'ns matching'.padStart(12)}`)
+console.log(`${'URL parse'.padEnd(12)} ${parse.toFixed(0).padStart(11)} ${'-'.padStart(12)}`)
+for (const [name, nanos] of results) {
+  console.log(`${name.padEnd(12)} ${nanos.toFixed(0).padStart(11)} ${(nanos - parse).toFixed(0).padStart(12)}`)
+}
@@ -0,0 +1,52 @@
+-- Baseline schema for the quote generator, as used by app/api/[[...path]]/route.js
+
+create table if not exists companies (
+  "id" text primary key,
+  "name" text not null,
+  "logo" text default '',
+  "address" text default '',
+  "phone" text default '',
+  "email" text default '',
+  "signature" text default '',
+  "seal" text default '',
+  "createdAt" timestamptz not null default now(),
+  "updatedAt" timestamptz not null default now()
+);
+
+create table if not exists quotes (
+  "id" text primary key,
+  "companyId" text references companies ("id") on delete cascade,
+  "quoteNumber" text not null,
+  "poNumber" text default '',
+  "billTo" text default '',
+  "billToAddress" text default '',
+  "billToContact" text default '',
+  "items" text default '[]',
+  "subtotal" numeric default 0,
+  "vatRate" numeric default 5,
+  "vatAmount" numeric default 0,
+  "totalAmount" numeric default 0,
+  "notes" text default '',
+  "createdAt" timestamptz not null default now(),
+  "updatedAt" timestamptz not null default now()
+);
+
+create table if not exists purchase_orders (
+  "id" text primary key,
+  "companyId" text references companies ("id") on delete cascade,
+  "quoteId" text references quotes ("id") on delete set null,
+  "poNumber" text not null,
+  "quoteNumber" text default '',
+  "billTo" text default '',
+  "billToAddress" text default '',
+  "billToContact" text default '',
+  "items" text default '[]',
+  "subtotal" numeric default 0,
+  "vatRate" numeric default 5,
+  "vatAmount" numeric default 0,
+  "totalAmount" numeric default 0,
+  "notes" text default '',
+  "status" text default 'pending',
+  "createdAt" timestamptz not null default now(),
+  "updatedAt" timestamptz not null default now()
+);
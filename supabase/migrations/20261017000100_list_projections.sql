@@ -0,0 +1,11 @@
+-- List endpoints leave the base64 image columns out of their payloads and
+-- return a short hash instead, which also versions the logo URL for caching.
+
+alter table companies
+  add column if not exists "logoHash" text
+  generated always as (case when coalesce("logo", '') = '' then null else md5("logo") end) stored;
+
+-- Keyset pagination order used by the list endpoints
+create index if not exists companies_created_at_id_idx on companies ("createdAt" desc, "id" desc);
+create index if not exists quotes_created_at_id_idx on quotes ("createdAt" desc, "id" desc);
+create index if not exists purchase_orders_created_at_id_idx on purchase_orders ("createdAt" desc, "id" desc);
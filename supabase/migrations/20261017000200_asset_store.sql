@@ -0,0 +1,39 @@
+-- Content-addressed asset store for company images. Images are stored once,
+-- keyed by the SHA-256 of their bytes, and served from /api/assets/{hash}
+-- with immutable caching; company rows reference them by URL.
+
+create table if not exists assets (
+  "hash" text primary key check ("hash" ~ '^[0-9a-f]{64}$'),
+  "mimeType" text not null,
+  "data" text not null,
+  "size" integer not null,
+  "createdAt" timestamptz not null default now()
+);
+
+-- Move inline base64 images out of company rows
+with images as (
+  select substring(value from '^data:([^;,]+)') as "mimeType",
+         split_part(value, ',', 2) as "data",
+         decode(split_part(value, ',', 2), 'base64') as bytes
+  from companies
+  cross join lateral (values ("logo"), ("signature"), ("seal")) as image(value)
+  where value like 'data:%;base64,%'
+)
+insert into assets ("hash", "mimeType", "data", "size")
+select distinct on (encode(sha256(bytes), 'hex'))
+       encode(sha256(bytes), 'hex'), coalesce("mimeType", 'application/octet-stream'), "data", length(bytes)
+from images
+on conflict ("hash") do nothing;
+
+update companies set "logo" = '/api/assets/' || encode(sha256(decode(split_part("logo", ',', 2), 'base64')), 'hex')
+where "logo" like 'data:%;base64,%';
+update companies set "signature" = '/api/assets/' || encode(sha256(decode(split_part("signature", ',', 2), 'base64')), 'hex')
+where "signature" like 'data:%;base64,%';
+update companies set "seal" = '/api/assets/' || encode(sha256(decode(split_part("seal", ',', 2), 'base64')), 'hex')
+where "seal" like 'data:%;base64,%';
+
+-- The logo hash is now the asset's content hash
+alter table companies drop column if exists "logoHash";
+alter table companies
+  add column "logoHash" text
+  generated always as (substring("logo" from '^/api/assets/([0-9a-f]{64})$')) stored;
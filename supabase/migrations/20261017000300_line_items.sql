@@ -0,0 +1,70 @@
+-- Move quote and purchase order line items out of the JSON-encoded `items`
+-- text column into their own table so they can be indexed, filtered and
+-- aggregated in the database.
+
+create table if not exists line_items (
+  "id" bigint generated always as identity primary key,
+  "quoteId" text references quotes ("id") on delete cascade,
+  "purchaseOrderId" text references purchase_orders ("id") on delete cascade,
+  "position" integer not null,
+  "description" text not null default '',
+  "quantity" numeric not null default 0,
+  "price" numeric not null default 0,
+  "total" numeric not null default 0,
+  -- Any other keys a client sent with the item
+  "attributes" jsonb not null default '{}',
+  constraint line_items_one_parent check (num_nonnulls("quoteId", "purchaseOrderId") = 1)
+);
+
+create unique index if not exists line_items_quote_position
+  on line_items ("quoteId", "position") where "quoteId" is not null;
+create unique index if not exists line_items_purchase_order_position
+  on line_items ("purchaseOrderId", "position") where "purchaseOrderId" is not null;
+create index if not exists line_items_description on line_items ("description");
+
+-- Backfill from the JSON column, tolerating malformed rows and non-numeric values
+create function pg_temp.to_numeric(value text) returns numeric
+language sql immutable as $$
+  select case when value ~ '^\s*-?[0-9]+(\.[0-9]+)?\s*$' then value::numeric else 0 end
+$$;
+
+create function pg_temp.to_jsonb_array(value text) returns jsonb
+language plpgsql immutable as $$
+begin
+  if jsonb_typeof(value::jsonb) = 'array' then
+    return value::jsonb;
+  end if;
+  return '[]'::jsonb;
+exception when others then
+  return '[]'::jsonb;
+end
+$$;
+
+insert into line_items ("quoteId", "position", "description", "quantity", "price", "total", "attributes")
+select
+  q."id",
+  e.ordinality - 1,
+  coalesce(e.item ->> 'description', ''),
+  pg_temp.to_numeric(e.item ->> 'quantity'),
+  pg_temp.to_numeric(coalesce(e.item ->> 'price', e.item ->> 'unitPrice')),
+  pg_temp.to_numeric(e.item ->> 'total'),
+  e.item - 'description' - 'quantity' - 'price' - 'total'
+from quotes q
+cross join lateral jsonb_array_elements(pg_temp.to_jsonb_array(q."items")) with ordinality as e(item, ordinality)
+where jsonb_typeof(e.item) = 'object';
+
+insert into line_items ("purchaseOrderId", "position", "description", "quantity", "price", "total", "attributes")
+select
+  p."id",
+  e.ordinality - 1,
+  coalesce(e.item ->> 'description', ''),
+  pg_temp.to_numeric(e.item ->> 'quantity'),
+  pg_temp.to_numeric(coalesce(e.item ->> 'price', e.item ->> 'unitPrice')),
+  pg_temp.to_numeric(e.item ->> 'total'),
+  e.item - 'description' - 'quantity' - 'price' - 'total'
+from purchase_orders p
+cross join lateral jsonb_array_elements(pg_temp.to_jsonb_array(p."items")) with ordinality as e(item, ordinality)
+where jsonb_typeof(e.item) = 'object';
+
+alter table quotes drop column if exists "items";
+alter table purchase_orders drop column if exists "items";
@@ -0,0 +1,26 @@
+-- Indexes behind the list filters in lib/filters.js and the per-company
+-- counts of /api/companies?withCounts=true
+
+-- companyId filter and per-company counts, in keyset order
+create index if not exists quotes_company_created_at_id_idx
+  on quotes ("companyId", "createdAt" desc, "id" desc);
+create index if not exists purchase_orders_company_created_at_id_idx
+  on purchase_orders ("companyId", "createdAt" desc, "id" desc);
+
+-- Purchase order status filter
+create index if not exists purchase_orders_status_created_at_id_idx
+  on purchase_orders ("status", "createdAt" desc, "id" desc);
+
+-- Amount range filters
+create index if not exists quotes_total_amount_idx on quotes ("totalAmount");
+create index if not exists purchase_orders_total_amount_idx on purchase_orders ("totalAmount");
+
+-- Substring search (`q`) over bill-to names and document numbers
+create extension if not exists pg_trgm;
+
+create index if not exists quotes_bill_to_trgm_idx on quotes using gin ("billTo" gin_trgm_ops);
+create index if not exists quotes_quote_number_trgm_idx on quotes using gin ("quoteNumber" gin_trgm_ops);
+create index if not exists quotes_po_number_trgm_idx on quotes using gin ("poNumber" gin_trgm_ops);
+create index if not exists purchase_orders_bill_to_trgm_idx on purchase_orders using gin ("billTo" gin_trgm_ops);
+create index if not exists purchase_orders_po_number_trgm_idx on purchase_orders using gin ("poNumber" gin_trgm_ops);
+create index if not exists purchase_orders_quote_number_trgm_idx on purchase_orders using gin ("quoteNumber" gin_trgm_ops);
@@ -0,0 +1,61 @@
+-- Dashboard totals computed in one round trip; called as
+-- supabase.rpc('dashboard_summary') by /api/dashboard/summary
+
+create or replace function dashboard_summary()
+returns jsonb
+language sql
+stable
+as $$
+  with quote_rollup as (
+    select "companyId", count(*) as "count", coalesce(sum("totalAmount"), 0) as "totalAmount"
+    from quotes
+    group by "companyId"
+  ),
+  po_rollup as (
+    select "companyId", count(*) as "count", coalesce(sum("totalAmount"), 0) as "totalAmount"
+    from purchase_orders
+    group by "companyId"
+  )
+  select jsonb_build_object(
+    'totals', jsonb_build_object(
+      'companies', (select count(*) from companies),
+      'quotes', (select count(*) from quotes),
+      'purchaseOrders', (select count(*) from purchase_orders)
+    ),
+    'quotes', (
+      select jsonb_build_object(
+        'totalAmount', coalesce(sum("totalAmount"), 0),
+        'vatAmount', coalesce(sum("vatAmount"), 0)
+      )
+      from quotes
+    ),
+    'purchaseOrders', (
+      select jsonb_build_object(
+        'totalAmount', coalesce(sum("totalAmount"), 0),
+        'vatAmount', coalesce(sum("vatAmount"), 0),
+        'byStatus', coalesce((
+          select jsonb_object_agg("status", "count")
+          from (
+            select coalesce("status", 'pending') as "status", count(*) as "count"
+            from purchase_orders
+            group by 1
+          ) statuses
+        ), '{}'::jsonb)
+      )
+      from purchase_orders
+    ),
+    'companies', coalesce((
+      select jsonb_agg(jsonb_build_object(
+        'id', c."id",
+        'name', c."name",
+        'quoteCount', coalesce(q."count", 0),
+        'quoteAmount', coalesce(q."totalAmount", 0),
+        'purchaseOrderCount', coalesce(p."count", 0),
+        'purchaseOrderAmount', coalesce(p."totalAmount", 0)
+      ) order by c."name", c."id")
+      from companies c
+      left join quote_rollup q on q."companyId" = c."id"
+      left join po_rollup p on p."companyId" = c."id"
+    ), '[]'::jsonb)
+  )
+$$;
@@ -0,0 +1,104 @@
+-- Per-company, gapless quote and purchase order numbers (Q-000001,
+-- PO-000001, ...). A quote or PO inserted without a number gets the next
+-- one from its company's counter in a BEFORE INSERT trigger. The counter
+-- row is locked until the inserting transaction ends, so concurrent
+-- inserts for one company queue on it. A rolled-back insert also rolls the
+-- counter back, which keeps the numbers gapless.
+
+create table if not exists document_sequences (
+  "companyId" text not null references companies ("id") on delete cascade,
+  "kind" text not null check ("kind" in ('quote', 'purchase-order')),
+  "lastValue" bigint not null default 0,
+  primary key ("companyId", "kind")
+);
+
+-- Legacy Q-<timestamp> numbers could collide; suffix the later duplicates
+-- so the numbers can be made unique per company
+with ranked as (
+  select "id", "quoteNumber",
+    row_number() over (partition by "companyId", "quoteNumber" order by "createdAt", "id") as "rank"
+  from quotes
+)
+update quotes q set "quoteNumber" = r."quoteNumber" || '-' || r."rank"
+from ranked r
+where q."id" = r."id" and r."rank" > 1;
+
+with ranked as (
+  select "id", "poNumber",
+    row_number() over (partition by "companyId", "poNumber" order by "createdAt", "id") as "rank"
+  from purchase_orders
+)
+update purchase_orders p set "poNumber" = r."poNumber" || '-' || r."rank"
+from ranked r
+where p."id" = r."id" and r."rank" > 1;
+
+create unique index if not exists quotes_company_quote_number_key
+  on quotes ("companyId", "quoteNumber");
+create unique index if not exists purchase_orders_company_po_number_key
+  on purchase_orders ("companyId", "poNumber");
+
+-- Next number for a company; skips numbers a client already used by hand
+create or replace function next_document_number(company_id text, kind text)
+returns text
+language plpgsql
+as $$
+declare
+  prefix text := case kind when 'quote' then 'Q-' else 'PO-' end;
+  next_value bigint;
+  candidate text;
+begin
+  insert into document_sequences ("companyId", "kind")
+  values (company_id, kind)
+  on conflict do nothing;
+
+  loop
+    update document_sequences s
+    set "lastValue" = s."lastValue" + 1
+    where s."companyId" = company_id and s."kind" = next_document_number.kind
+    returning s."lastValue" into next_value;
+
+    candidate := prefix || lpad(next_value::text, 6, '0');
+    if kind = 'quote' then
+      exit when not exists (select 1 from quotes where "companyId" = company_id and "quoteNumber" = candidate);
+    else
+      exit when not exists (select 1 from purchase_orders where "companyId" = company_id and "poNumber" = candidate);
+    end if;
+  end loop;
+
+  return candidate;
+end
+$$;
+
+create or replace function assign_quote_number()
+returns trigger
+language plpgsql
+as $$
+begin
+  if coalesce(new."quoteNumber", '') = '' then
+    new."quoteNumber" := next_document_number(new."companyId", 'quote');
+  end if;
+  return new;
+end
+$$;
+
+create or replace function assign_po_number()
+returns trigger
+language plpgsql
+as $$
+begin
+  if coalesce(new."poNumber", '') = '' then
+    new."poNumber" := next_document_number(new."companyId", 'purchase-order');
+  end if;
+  return new;
+end
+$$;
+
+drop trigger if exists quotes_assign_number on quotes;
+create trigger quotes_assign_number
+  before insert on quotes
+  for each row execute function assign_quote_number();
+
+drop trigger if exists purchase_orders_assign_number on purchase_orders;
+create trigger purchase_orders_assign_number
+  before insert on purchase_orders
+  for each row execute function assign_po_number();
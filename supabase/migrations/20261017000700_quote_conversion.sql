@@ -0,0 +1,62 @@
+-- Quote to purchase order conversion in the database, called as
+-- supabase.rpc('convert_quote') by POST /api/quotes/{id}/convert.
+-- quote_conversions records which purchase order each quote became, so a
+-- quote converts at most once; deleting that purchase order frees the
+-- quote to be converted again.
+
+create table if not exists quote_conversions (
+  "quoteId" text primary key references quotes ("id") on delete cascade,
+  "purchaseOrderId" text not null unique references purchase_orders ("id") on delete cascade,
+  "createdAt" timestamptz not null default now()
+);
+
+-- Purchase orders converted before this migration count as conversions
+insert into quote_conversions ("quoteId", "purchaseOrderId", "createdAt")
+select distinct on ("quoteId") "quoteId", "id", "createdAt"
+from purchase_orders
+where "quoteId" is not null
+order by "quoteId", "createdAt", "id"
+on conflict do nothing;
+
+-- Returns { created, id } with the new or existing purchase order id, or
+-- null when the quote does not exist. The PO number comes from the
+-- company's sequence (assign_po_number).
+create or replace function convert_quote(quote_id text, po_id text)
+returns jsonb
+language plpgsql
+as $$
+declare
+  source quotes;
+  existing text;
+begin
+  -- Concurrent conversions of one quote queue on this row lock
+  select * into source from quotes where "id" = quote_id for update;
+  if not found then
+    return null;
+  end if;
+
+  select "purchaseOrderId" into existing from quote_conversions where "quoteId" = quote_id;
+  if existing is not null then
+    return jsonb_build_object('created', false, 'id', existing);
+  end if;
+
+  insert into purchase_orders (
+    "id", "companyId", "quoteId", "quoteNumber", "billTo", "billToAddress", "billToContact",
+    "subtotal", "vatRate", "vatAmount", "totalAmount", "notes", "status", "createdAt", "updatedAt"
+  )
+  values (
+    po_id, source."companyId", source."id", source."quoteNumber", source."billTo", source."billToAddress",
+    source."billToContact", source."subtotal", source."vatRate", source."vatAmount", source."totalAmount",
+    source."notes", 'pending', now(), now()
+  );
+
+  insert into line_items ("purchaseOrderId", "position", "description", "quantity", "price", "total", "attributes")
+  select po_id, "position", "description", "quantity", "price", "total", "attributes"
+  from line_items
+  where "quoteId" = quote_id;
+
+  insert into quote_conversions ("quoteId", "purchaseOrderId") values (quote_id, po_id);
+
+  return jsonb_build_object('created', true, 'id', po_id);
+end
+$$;
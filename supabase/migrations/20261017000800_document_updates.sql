@@ -0,0 +1,68 @@
+-- Document updates in one transaction, called as supabase.rpc('update_document')
+-- by PUT /api/{resource}/{id}. The row's changed columns and, for quotes and
+-- purchase orders, its replacement line items are written together, so a
+-- failure at any step (a missing row, a duplicate document number, a bad
+-- item) leaves the document and its items as they were.
+--
+-- Only the columns present in `changes` are written; the other columns keep
+-- whatever concurrent writers stored. `items`, when not null, holds the
+-- document's new line_items rows. Returns the updated row, with its
+-- `line_items` for quotes and purchase orders, or null when the row does not
+-- exist.
+
+create or replace function update_document(table_name text, document_id text, changes jsonb, items jsonb default null)
+returns jsonb
+language plpgsql
+as $$
+declare
+  parent_column text := case table_name when 'quotes' then 'quoteId' when 'purchase_orders' then 'purchaseOrderId' end;
+  assignments text;
+  updated jsonb;
+  stored_items jsonb;
+begin
+  if table_name not in ('companies', 'quotes', 'purchase_orders') then
+    raise exception 'update_document: unknown table %', table_name;
+  end if;
+  if items is not null and parent_column is null then
+    raise exception 'update_document: % have no line items', table_name;
+  end if;
+
+  -- "column" = r."column" for each changed column; jsonb_populate_record
+  -- casts each value to its column's type
+  select string_agg(format('%1$I = r.%1$I', key), ', ')
+  into assignments
+  from jsonb_object_keys(changes) as key;
+  if assignments is null then
+    raise exception 'update_document: no changes';
+  end if;
+
+  execute format(
+    'update %1$I t set %2$s from jsonb_populate_record(null::%1$I, $2) r where t."id" = $1 returning to_jsonb(t)',
+    table_name, assignments
+  ) into updated using document_id, changes;
+  if updated is null or parent_column is null then
+    return updated;
+  end if;
+
+  if items is not null then
+    execute format('delete from line_items where %I = $1', parent_column) using document_id;
+    execute format(
+      'insert into line_items (%I, "position", "description", "quantity", "price", "total", "attributes")
+       select $1, r."position", coalesce(r."description", ''''), coalesce(r."quantity", 0), coalesce(r."price", 0),
+         coalesce(r."total", 0), coalesce(r."attributes", ''{}'')
+       from jsonb_populate_recordset(null::line_items, $2) r',
+      parent_column
+    ) using document_id, items;
+  end if;
+
+  execute format(
+    'select coalesce(jsonb_agg(jsonb_build_object(
+       ''position'', "position", ''description'', "description", ''quantity'', "quantity",
+       ''price'', "price", ''total'', "total", ''attributes'', "attributes") order by "position"), ''[]'')
+     from line_items where %I = $1',
+    parent_column
+  ) into stored_items using document_id;
+
+  return updated || jsonb_build_object('line_items', stored_items);
+end
+$$;
@@ -0,0 +1,33 @@
+-- Batch updates, called as supabase.rpc('update_documents') by the batch
+-- endpoints (lib/batch.js). Each entry of `updates` is { id, changes, items? }
+-- and is applied with update_document in its own subtransaction: a failing
+-- entry rolls back only its own row and items, and the others still apply.
+--
+-- Returns one result per entry, in order: { id, found } when the update ran
+-- (found is false when the row does not exist), or { id, error, code } with
+-- the entry's SQL error.
+
+create or replace function update_documents(table_name text, updates jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+  entry jsonb;
+  updated jsonb;
+  results jsonb := '[]';
+begin
+  for entry in select value from jsonb_array_elements(updates) loop
+    begin
+      updated := update_document(
+        table_name, entry->>'id', entry->'changes', nullif(entry->'items', 'null'::jsonb)
+      );
+      results := results || jsonb_build_array(jsonb_build_object('id', entry->>'id', 'found', updated is not null));
+    exception when others then
+      results := results || jsonb_build_array(
+        jsonb_build_object('id', entry->>'id', 'error', sqlerrm, 'code', sqlstate)
+      );
+    end;
+  end loop;
+  return results;
+end
+$$;
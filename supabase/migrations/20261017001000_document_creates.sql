@@ -0,0 +1,53 @@
+-- Document creation in one transaction, called as
+-- supabase.rpc('create_document') by POST /api/quotes and
+-- /api/purchase-orders. The row and its line items are inserted together, so
+-- a failing item insert leaves no document behind without its items.
+--
+-- `document` holds the new row's columns; columns it leaves out take their
+-- defaults, and the numbering trigger still fills in a missing number.
+-- `items` holds the document's line_items rows. Returns the inserted row
+-- with its `line_items`.
+
+create or replace function create_document(table_name text, document jsonb, items jsonb default '[]')
+returns jsonb
+language plpgsql
+as $$
+declare
+  parent_column text := case table_name when 'quotes' then 'quoteId' when 'purchase_orders' then 'purchaseOrderId' end;
+  columns text;
+  created jsonb;
+  stored_items jsonb;
+begin
+  if parent_column is null then
+    raise exception 'create_document: unknown table %', table_name;
+  end if;
+
+  -- jsonb_populate_record casts each value to its column's type
+  select string_agg(format('%I', key), ', ')
+  into columns
+  from jsonb_object_keys(document) as key;
+
+  execute format(
+    'insert into %1$I as t (%2$s) select %2$s from jsonb_populate_record(null::%1$I, $1) returning to_jsonb(t)',
+    table_name, columns
+  ) into created using document;
+
+  execute format(
+    'insert into line_items (%I, "position", "description", "quantity", "price", "total", "attributes")
+     select $1, r."position", coalesce(r."description", ''''), coalesce(r."quantity", 0), coalesce(r."price", 0),
+       coalesce(r."total", 0), coalesce(r."attributes", ''{}'')
+     from jsonb_populate_recordset(null::line_items, $2) r',
+    parent_column
+  ) using created->>'id', coalesce(items, '[]');
+
+  execute format(
+    'select coalesce(jsonb_agg(jsonb_build_object(
+       ''position'', "position", ''description'', "description", ''quantity'', "quantity",
+       ''price'', "price", ''total'', "total", ''attributes'', "attributes") order by "position"), ''[]'')
+     from line_items where %I = $1',
+    parent_column
+  ) into stored_items using created->>'id';
+
+  return created || jsonb_build_object('line_items', stored_items);
+end
+$$;
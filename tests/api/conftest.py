@@ -0,0 +1,130 @@
+"""
+Fixtures for the live API suite.
+
+Tests run against the server at NEXT_PUBLIC_BASE_URL and are skipped when it
+cannot be reached. Every row a test creates carries the run's namespace (the
+xdist worker id plus a random suffix), so workers running side by side, or
+several runs against one server, never read each other's data. Read-only
+tests share rows seeded once per worker through the batch API; tests that
+write get a company of their own, and deleting a company cascades to its
+documents.
+"""
+
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from tests.api.support import (
+    API_BASE, LARGE_IMAGE_BYTES, SAMPLE_LOGO_BASE64, created_ids, load_items, parse_server_timing, png_data_url
+)
+
+# Every API call the session made: (route, {phase: duration_ms})
+CALLS = []
+
+
+def record_call(response, *args, **kwargs):
+    header = response.headers.get('Server-Timing')
+    timing = parse_server_timing(header) if header else {}
+    route = timing.get('total', (0, ""))[1] or f"{response.request.method} {response.request.path_url}"
+    CALLS.append((route, {name: duration for name, (duration, _) in timing.items()}))
+
+
+def pytest_collection_modifyitems(items):
+    here = Path(__file__).parent
+    for item in items:
+        if here in item.path.parents:
+            item.add_marker(pytest.mark.api)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Attach the test's API calls and their server time to its report"""
+    start = len(CALLS)
+    yield
+    calls = CALLS[start:]
+    item.user_properties += [
+        ("api_calls", len(calls)),
+        ("server_ms", sum(phases.get('total', 0) for _, phases in calls)),
+        ("db_ms", sum(phases.get('db', 0) for _, phases in calls)),
+        ("server_timing", calls),
+    ]
+
+
+@pytest.fixture(scope="session")
+def api():
+    """Shared keep-alive session; every response's Server-Timing is recorded"""
+    session = requests.Session()
+    try:
+        session.get(f"{API_BASE}/health", timeout=5)
+    except requests.exceptions.RequestException as error:
+        pytest.skip(f"API not reachable at {API_BASE}: {error}")
+    session.hooks['response'].append(record_call)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def namespace(request):
+    """Prefix for the names of rows this worker creates"""
+    worker = getattr(request.config, "workerinput", {}).get("workerid", "main")
+    return f"pytest-{worker}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture(scope="session")
+def seed(api, namespace, request):
+    """Companies and documents shared by the read-only tests, created with
+    one batch call per table and removed with one at the end"""
+    large_image = png_data_url(LARGE_IMAGE_BYTES)
+    response = api.post(f"{API_BASE}/companies/batch", json={"create": [
+        {"name": f"{namespace} Pagination"},
+        {"name": f"{namespace} Filters"},
+        {"name": f"{namespace} Summary"},
+        {"name": f"{namespace} Payload", "logo": large_image, "signature": large_image, "seal": large_image},
+        {"name": f"{namespace} Relationships", "logo": SAMPLE_LOGO_BASE64},
+    ]}, timeout=60)
+    results = response.json().get("create", []) if response.status_code == 200 else []
+    companies = [result["id"] for result in results if result["status"] == "created"]
+    # Registered before anything can fail, so a partly seeded run still
+    # removes what it created; deleting a company cascades to its documents
+    request.addfinalizer(lambda: api.post(f"{API_BASE}/companies/batch", json={"delete": companies}, timeout=60))
+    assert len(companies) == 5, response.text
+    pagination, filters, summary, payload, relationships = companies
+
+    quotes = created_ids(api, "quotes", [
+        *({"companyId": pagination, "quoteNumber": f"PAGE-TEST-{index}", "items": []} for index in range(5)),
+        {"companyId": filters, "billTo": "Filter Acme Trading", "totalAmount": 50, "items": []},
+        {"companyId": filters, "billTo": "Filter Globex", "totalAmount": 500, "items": []},
+        {"companyId": filters, "billTo": "Filter acme labs", "totalAmount": 900, "items": []},
+        {"companyId": summary, "totalAmount": 250, "vatAmount": 12.5, "items": []},
+        {"companyId": payload, "quoteNumber": "PAYLOAD-TEST-001", "items": load_items()},
+        {"companyId": relationships, "quoteNumber": "FK-TEST-Q001",
+         "items": [{"description": "Test Item", "quantity": 1, "unitPrice": 100, "total": 100}]},
+    ])
+    orders = created_ids(api, "purchase-orders", [
+        {"companyId": filters, "poNumber": "FILTER-PO-1", "status": "approved", "items": []},
+        {"companyId": summary, "totalAmount": 100, "status": "approved", "items": []},
+        {"companyId": relationships, "poNumber": "FK-TEST-PO001", "quoteId": quotes[-1],
+         "items": [{"description": "Test PO Item", "quantity": 2, "unitPrice": 50, "total": 100}]},
+    ])
+    return SimpleNamespace(
+        pagination=pagination, pagination_quotes=quotes[:5],
+        filters=filters,
+        summary=summary,
+        payload=payload, payload_quote=quotes[-2],
+        relationships=relationships, relationship_quote=quotes[-1], relationship_order=orders[-1],
+    )
+
+
+@pytest.fixture
+def company(api, namespace, request):
+    """A company of the test's own, deleted with its documents afterwards"""
+    response = api.post(f"{API_BASE}/companies", json={
+        "name": f"{namespace} {request.node.name}", "logo": SAMPLE_LOGO_BASE64
+    }, timeout=10)
+    assert response.status_code == 200, response.text
+    created = response.json()
+    request.addfinalizer(lambda: api.delete(f"{API_BASE}/companies/{created['id']}", timeout=10))
+    return created
@@ -0,0 +1,144 @@
+"""
+Shared settings and helpers for the live API suite, the benchmark suite and
+backend_test.py's load and benchmark modes
+"""
+
+import base64
+import os
+import re
+import time
+from decimal import Decimal, ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN, ROUND_UP, ROUND_DOWN
+
+# Get base URL from environment
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://a017fc05-72ae-46e0-8737-e0fa7a88504b.preview.emergentagent.com')
+API_BASE = f"{BASE_URL}/api"
+
+# Test data
+SAMPLE_LOGO_BASE64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+
+# List rows must stay small even when companies carry large images
+MAX_LIST_ROW_BYTES = 2048
+LARGE_IMAGE_BYTES = 150 * 1024
+
+# Operations per /api/{resource}/batch request (the server caps batches at 1000)
+BATCH_SIZE = 500
+
+# The server's money settings (lib/money.js), so expected amounts can be
+# computed exactly with Decimal
+MONEY_ROUNDING = {
+    "half-up": ROUND_HALF_UP, "half-even": ROUND_HALF_EVEN, "half-down": ROUND_HALF_DOWN,
+    "up": ROUND_UP, "down": ROUND_DOWN
+}.get(os.getenv('NEXT_PUBLIC_MONEY_ROUNDING', 'half-up'), ROUND_HALF_UP)
+MINOR_UNIT = Decimal(1).scaleb(-{"JPY": 0, "KRW": 0, "BHD": 3, "KWD": 3, "OMR": 3}.get(os.getenv('NEXT_PUBLIC_CURRENCY', 'USD'), 2))
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into {name: (duration_ms, description)}"""
+    metrics = {}
+    # Commas and semicolons inside quoted descriptions do not separate entries
+    for entry in re.split(r',(?=(?:[^"]*"[^"]*")*[^"]*$)', header):
+        name, *params = [part.strip() for part in re.split(r';(?=(?:[^"]*"[^"]*")*[^"]*$)', entry)]
+        duration, description = 0.0, ""
+        for param in params:
+            key, _, value = param.partition('=')
+            if key == 'dur':
+                duration = float(value)
+            elif key == 'desc':
+                description = value.strip('"')
+        if name:
+            metrics[name] = (duration, description)
+    return metrics
+
+
+def png_data_url(size):
+    """A data URL of `size` random bytes behind a PNG signature, so the asset
+    store accepts it"""
+    signature = b"\x89PNG\r\n\x1a\n"
+    return "data:image/png;base64," + base64.b64encode(signature + os.urandom(size - len(signature))).decode()
+
+
+def load_items():
+    """Line items used by the quote and purchase order workloads"""
+    return [
+        {"description": "Premium Widget Model A", "quantity": 10, "unitPrice": 150.00, "total": 1500.00},
+        {"description": "Standard Widget Model B", "quantity": 25, "unitPrice": 75.50, "total": 1887.50}
+    ]
+
+
+def count_pdf_pages(content):
+    return content.count(b"/Type /Page") - content.count(b"/Type /Pages")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def decimal_of(value):
+    """The exact decimal a JSON number stands for"""
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(str(value))
+
+
+def expected_totals(items, vat_rate):
+    """Item totals, subtotal, VAT and total as the server computes them"""
+    lines = [(decimal_of(item["quantity"]) * decimal_of(item["price"])).quantize(MINOR_UNIT, MONEY_ROUNDING) for item in items]
+    subtotal = sum(lines, Decimal(0))
+    vat = (subtotal * decimal_of(vat_rate) / 100).quantize(MINOR_UNIT, MONEY_ROUNDING)
+    return lines, {"subtotal": subtotal, "vatAmount": vat, "totalAmount": subtotal + vat}
+
+
+def batch(api, path, **operations):
+    """POST one /api/{path}/batch and return its per-operation results,
+    failing the test if any operation did not succeed"""
+    response = api.post(f"{API_BASE}/{path}/batch", json=operations, timeout=60)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert not body.get("failed"), body
+    return {operation: body.get(operation, []) for operation in operations}
+
+
+def created_ids(api, path, rows):
+    """Create `rows` through the batch API, BATCH_SIZE at a time, and return their ids in order"""
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        results = batch(api, path, create=rows[start:start + BATCH_SIZE])["create"]
+        ids.extend(result["id"] for result in results)
+    return ids
+
+
+def eventually(probe, timeout=10, interval=0.1):
+    """Call probe() until it returns something truthy or `timeout` passes;
+    returns the last result"""
+    deadline = time.time() + timeout
+    while True:
+        result = probe()
+        if result or time.time() >= deadline:
+            return result
+        time.sleep(interval)
+
+
+def cache_hit(api, url):
+    """Read `url` until the server answers from its cache (another worker's
+    write can evict the entry in between); returns the last response"""
+    responses = []
+
+    def probe():
+        responses.append(api.get(url, timeout=60))
+        return responses[-1].headers.get("X-Cache") == "HIT"
+
+    eventually(probe)
+    return responses[-1]
+
+
+def find_listed(api, path, row_id, **params):
+    """The row with `row_id` in the /api/{path} list, walking its pages"""
+    params = {"limit": 500, **params}
+    while True:
+        page = api.get(f"{API_BASE}/{path}", params=params, timeout=30).json()
+        row = next((row for row in page["data"] if row["id"] == row_id), None)
+        if row or not page.get("nextCursor"):
+            return row
+        params["after"] = page["nextCursor"]
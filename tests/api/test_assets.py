@@ -0,0 +1,90 @@
+"""
+Content-addressed image storage and the size of list payloads
+"""
+
+import base64
+import json
+
+from tests.api.support import (
+    API_BASE, BASE_URL, LARGE_IMAGE_BYTES, MAX_LIST_ROW_BYTES, SAMPLE_LOGO_BASE64, find_listed
+)
+
+
+def test_asset_store(api, company):
+    logo_bytes = base64.b64decode(SAMPLE_LOGO_BASE64.split(',', 1)[1])
+    logo = company["logo"]
+    assert logo.startswith("/api/assets/")
+
+    # Uploading the same bytes again resolves to the same asset
+    response = api.post(f"{API_BASE}/assets", data=logo_bytes, headers={"Content-Type": "image/png"}, timeout=10)
+    assert response.status_code == 200
+    assert response.json()["url"] == logo
+
+    response = api.get(f"{BASE_URL}{logo}", timeout=10)
+    assert response.status_code == 200
+    assert response.content == logo_bytes
+    assert "immutable" in response.headers.get("Cache-Control", "")
+    assert response.headers.get("ETag") == f'"{logo.rsplit("/", 1)[-1]}"'
+
+    response = api.get(f"{BASE_URL}{logo}", headers={"If-None-Match": response.headers["ETag"]}, timeout=10)
+    assert response.status_code == 304
+
+
+def test_asset_types(api, namespace):
+    # The served type is the one sniffed from the bytes, not the client's
+    logo_bytes = base64.b64decode(SAMPLE_LOGO_BASE64.split(',', 1)[1])
+    response = api.post(f"{API_BASE}/assets", data=logo_bytes, headers={"Content-Type": "text/html"}, timeout=10)
+    assert response.status_code == 200
+    response = api.get(f"{BASE_URL}{response.json()['url']}", timeout=10)
+    assert response.headers.get("Content-Type") == "image/png"
+    assert response.headers.get("X-Content-Type-Options") == "nosniff"
+    assert response.headers.get("Content-Disposition") == "inline"
+
+    # Markup is refused however it is labelled, on upload and inline
+    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+    for content_type in ("image/svg+xml", "text/html", "image/png"):
+        response = api.post(f"{API_BASE}/assets", data=svg, headers={"Content-Type": content_type}, timeout=10)
+        assert response.status_code == 415, content_type
+    response = api.post(f"{API_BASE}/assets", json={
+        "dataUrl": "data:text/html;base64," + base64.b64encode(b"<script>alert(1)</script>").decode()
+    }, timeout=10)
+    assert response.status_code == 415
+
+    response = api.post(f"{API_BASE}/companies", json={
+        "name": f"{namespace} SVG Logo", "logo": "data:image/svg+xml;base64," + base64.b64encode(svg).decode()
+    }, timeout=10)
+    assert response.status_code == 415
+
+
+def test_company_list_payload(api, seed):
+    companies = api.get(f"{API_BASE}/companies", timeout=10).json()["data"]
+    assert not [company["id"] for company in companies if set(company) & {"logo", "signature", "seal"}]
+
+    own = find_listed(api, "companies", seed.payload)
+    assert not set(own) & {"logo", "signature", "seal"}
+    assert len(json.dumps(own)) <= MAX_LIST_ROW_BYTES
+    assert own["logoUrl"]
+
+    # The logo URL serves the original bytes and revalidates with ETags
+    response = api.get(f"{BASE_URL}{own['logoUrl']}", timeout=10)
+    assert response.status_code == 200
+    assert len(response.content) == LARGE_IMAGE_BYTES
+    response = api.get(f"{BASE_URL}{own['logoUrl']}", headers={"If-None-Match": response.headers.get("ETag", "")}, timeout=10)
+    assert response.status_code == 304
+
+
+def test_quote_list_payload(api, seed):
+    quotes = api.get(f"{API_BASE}/quotes", params={"companyId": seed.payload}, timeout=10).json()["data"]
+    assert [quote["id"] for quote in quotes] == [seed.payload_quote]
+    assert "logo" not in (quotes[0].get("companies") or {})
+    assert len(json.dumps(quotes[0])) <= MAX_LIST_ROW_BYTES
+
+
+def test_list_projection(api, seed):
+    response = api.get(f"{API_BASE}/quotes", params={"companyId": seed.payload, "fields": "quoteNumber,totalAmount"}, timeout=10)
+    assert response.status_code == 200
+    keys = set().union(*(quote.keys() for quote in response.json()["data"]))
+    assert keys <= {"id", "createdAt", "quoteNumber", "totalAmount"}
+
+    response = api.get(f"{API_BASE}/quotes", params={"fields": "nope"}, timeout=10)
+    assert response.status_code == 400
@@ -0,0 +1,167 @@
+"""
+Batch writes, streaming import/export and bulk PDF export jobs
+"""
+
+import io
+import json
+import zipfile
+
+from tests.api.support import API_BASE, eventually
+
+
+def test_batch_companies(api, namespace):
+    response = api.post(f"{API_BASE}/companies/batch", json={"create": [
+        {"name": f"{namespace} Batch Test Company"},
+        {"email": "missing-name@test.com"},
+    ]}, timeout=10)
+    assert response.status_code == 200
+    results = response.json()["create"]
+    assert [result["status"] for result in results] == ["created", "error"]
+
+    response = api.post(f"{API_BASE}/companies/batch", json={"delete": [results[0]["id"]]}, timeout=10)
+    assert response.json()["succeeded"] == 1
+
+
+def test_batch_quotes(api, company):
+    quotes = [{"companyId": company["id"], "quoteNumber": f"BATCH-{index}", "totalAmount": index,
+               "items": [{"description": f"Item {index}", "quantity": 1, "price": index, "total": index}]}
+              for index in range(50)]
+    quotes.append({"companyId": "missing-company", "quoteNumber": "BATCH-BAD"})
+    quotes.append({"companyId": company["id"], "quoteNumber": "BATCH-0"})
+    response = api.post(f"{API_BASE}/quotes/batch", json={"create": quotes}, timeout=30)
+    results = response.json()["create"]
+    quote_ids = [result["id"] for result in results if result["status"] == "created"]
+    assert len(quote_ids) == 50
+    assert [result["status"] for result in results[-2:]] == ["error", "error"]
+    assert "already exists" in results[-1]["error"]
+    assert response.json()["failed"] == 2
+
+    updates = [{"id": quote_id, "notes": "Batch updated"} for quote_id in quote_ids[:10]]
+    updates.append({"id": "missing-quote", "notes": "x"})
+    # A taken number fails only its own update, items included
+    updates.append({"id": quote_ids[10], "quoteNumber": "BATCH-11", "items": []})
+    response = api.post(f"{API_BASE}/quotes/batch", json={"update": updates}, timeout=30)
+    assert [result["status"] for result in response.json()["update"]] == ["updated"] * 10 + ["error"] * 2
+    quote = api.get(f"{API_BASE}/quotes/{quote_ids[0]}", timeout=10).json()
+    assert quote["notes"] == "Batch updated"
+    assert quote["quoteNumber"] == "BATCH-0"
+    assert len(quote["items"]) == 1
+    quote = api.get(f"{API_BASE}/quotes/{quote_ids[10]}", timeout=10).json()
+    assert quote["quoteNumber"] == "BATCH-10"
+    assert len(quote["items"]) == 1
+
+    response = api.post(f"{API_BASE}/quotes/batch", json={"delete": quote_ids + ["missing-quote"]}, timeout=30)
+    assert response.json()["succeeded"] == 50
+    assert response.json()["delete"][-1]["status"] == "error"
+
+
+def test_batch_full_size(api, company):
+    # A full batch of ids is looked up and deleted in chunks, not one
+    # request URL long enough to be rejected
+    quotes = [{"companyId": company["id"], "quoteNumber": f"FULL-{index}"} for index in range(1000)]
+    response = api.post(f"{API_BASE}/quotes/batch", json={"create": quotes}, timeout=120)
+    quote_ids = [result["id"] for result in response.json()["create"] if result["status"] == "created"]
+    assert len(quote_ids) == 1000
+
+    response = api.post(f"{API_BASE}/quotes/batch", json={"delete": quote_ids}, timeout=120)
+    assert response.status_code == 200
+    assert (response.json()["succeeded"], response.json()["failed"]) == (1000, 0)
+
+
+def test_batch_size_cap(api):
+    response = api.post(f"{API_BASE}/quotes/batch", json={"delete": ["x"] * 1001}, timeout=10)
+    assert response.status_code == 413
+
+
+def test_import_export(api, company):
+    lines = [json.dumps({"companyId": company["id"], "quoteNumber": f"IMPORT-{index}", "totalAmount": index,
+                         "notes": "line one\nline \"two\", with comma",
+                         "items": [{"description": f"Item {index}", "quantity": 1, "price": index, "total": index}]})
+             for index in range(120)]
+    lines.insert(10, "{not json")
+    lines.append(json.dumps({"companyId": "missing-company", "quoteNumber": "IMPORT-BAD"}))
+    # A duplicate number fails only its own record, not the rest of its batch
+    lines.append(json.dumps({"companyId": company["id"], "quoteNumber": "IMPORT-5"}))
+    response = api.post(f"{API_BASE}/quotes/import", data="\n".join(lines).encode(),
+                        headers={"Content-Type": "application/x-ndjson"}, timeout=60)
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (120, 3)
+    assert [error["record"] for error in summary["errors"]] == [11, 122, 123]
+    assert "IMPORT-5 already exists" in summary["errors"][2]["error"]
+
+    response = api.get(f"{API_BASE}/quotes/export", params={"companyId": company["id"]}, timeout=60)
+    assert response.headers.get("content-type", "").startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(rows) == 120
+    assert len(rows[0]["items"]) == 1
+
+    response = api.get(f"{API_BASE}/quotes/export", params={"companyId": company["id"], "format": "csv"}, timeout=60)
+    assert response.headers.get("content-type", "").startswith("text/csv")
+    assert "items" in response.text.split("\r\n", 1)[0].split(",")
+    csv_body = response.content
+
+    # Re-importing an export keeps ids, so every row is a duplicate
+    response = api.post(f"{API_BASE}/quotes/import", data=csv_body, headers={"Content-Type": "text/csv"}, timeout=60)
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (0, 120)
+
+    # Once the rows are gone, the CSV round trip restores the same documents
+    api.post(f"{API_BASE}/quotes/batch", json={"delete": [row["id"] for row in rows]}, timeout=30)
+    response = api.post(f"{API_BASE}/quotes/import?format=csv", data=csv_body, timeout=60)
+    assert response.json()["imported"] == 120
+    imported = api.get(f"{API_BASE}/quotes/{rows[0]['id']}", timeout=10).json()
+    for field in ("notes", "totalAmount", "items", "createdAt"):
+        assert imported[field] == rows[0][field], field
+
+
+def test_import_truncated_csv(api, company):
+    # The upload ends inside a quoted field: only that record fails
+    body = "\r\n".join([
+        "companyId,quoteNumber,notes",
+        f"{company['id']},TRUNC-1,first",
+        f"{company['id']},TRUNC-2,second",
+        f'{company["id"]},TRUNC-3,"cut off',
+    ])
+    response = api.post(f"{API_BASE}/quotes/import?format=csv", data=body.encode(), timeout=30)
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["received"], summary["imported"], summary["failed"]) == (3, 2, 1)
+    assert summary["errors"][0]["record"] == 3
+    assert "Unterminated quoted field" in summary["errors"][0]["error"]
+
+
+def test_unknown_export_format(api):
+    response = api.get(f"{API_BASE}/quotes/export", params={"format": "xml"}, timeout=10)
+    assert response.status_code == 400
+
+
+def test_bulk_pdf_export(api, company):
+    assert api.post(f"{API_BASE}/exports", json={}, timeout=10).status_code == 400
+
+    api.post(f"{API_BASE}/quotes/batch", json={"create": [
+        {"companyId": company["id"], "quoteNumber": f"EXP-{index}"} for index in range(3)
+    ]}, timeout=10)
+    api.post(f"{API_BASE}/purchase-orders", json={"companyId": company["id"], "poNumber": "EXP-PO-1"}, timeout=10)
+
+    response = api.post(f"{API_BASE}/exports", json={"companyId": company["id"]}, timeout=10)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    def finished():
+        job = api.get(f"{API_BASE}/exports/{job_id}", timeout=10).json()
+        return job if job.get("status") not in ("queued", "running") else None
+
+    try:
+        job = eventually(finished, timeout=60, interval=0.5)
+        assert job and job["status"] == "complete"
+        assert job["completed"] == 4
+
+        response = api.get(f"{API_BASE}/exports/{job_id}/download", timeout=60)
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            names = archive.namelist()
+        assert len(names) == 4
+        assert all(name.endswith(".pdf") for name in names)
+    finally:
+        api.delete(f"{API_BASE}/exports/{job_id}", timeout=10)
@@ -0,0 +1,123 @@
+"""
+The /api/changes Server-Sent Events feed. Other workers' writes arrive on
+the same feed, so every wait matches on this test's own row ids.
+"""
+
+import json
+import queue
+import threading
+import time
+
+import pytest
+
+from tests.api.support import API_BASE
+
+
+def open_change_feed(api, last_event_id=None):
+    """Subscribe to /api/changes; returns (response, queue of (id, event, data))"""
+    headers = {"Accept": "text/event-stream"}
+    if last_event_id:
+        headers["Last-Event-ID"] = last_event_id
+    response = api.get(f"{API_BASE}/changes", headers=headers, stream=True, timeout=30)
+    events = queue.Queue()
+
+    def read():
+        fields = {}
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    name, _, value = line.partition(":")
+                    if name:
+                        fields[name] = value.lstrip()
+                elif "data" in fields:
+                    events.put((fields.get("id"), fields.get("event", "message"), json.loads(fields["data"])))
+                    fields = {}
+        except Exception:
+            pass
+
+    threading.Thread(target=read, daemon=True).start()
+    return response, events
+
+
+def wait_for_event(events, predicate, timeout=10):
+    """The first queued event matching predicate(event, data), or None"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            event = events.get(timeout=max(0.01, deadline - time.time()))
+        except queue.Empty:
+            return None
+        if predicate(event[1], event[2]):
+            return event
+    return None
+
+
+def change(table, op, id):
+    return lambda event, data: (data.get("table"), data.get("op"), data.get("id")) == (table, op, id)
+
+
+@pytest.fixture
+def feed(api):
+    feeds = []
+
+    def subscribe(last_event_id=None):
+        response, events = open_change_feed(api, last_event_id)
+        feeds.append(response)
+        return response, events
+
+    yield subscribe
+    for response in feeds:
+        response.close()
+
+
+def test_change_feed(api, namespace, feed):
+    response, events = feed()
+    assert response.status_code == 200
+    assert response.headers.get("content-type", "").startswith("text/event-stream")
+    ready = wait_for_event(events, lambda event, data: event == "ready")
+    assert ready
+
+    company = api.post(f"{API_BASE}/companies", json={"name": f"{namespace} Feed Test Company"}, timeout=10).json()
+    try:
+        found = wait_for_event(events, change("companies", "insert", company["id"]))
+        assert found
+        assert found[2]["row"]["name"] == company["name"]
+        assert "logo" not in found[2]["row"]
+
+        items = [{"description": "Widget", "quantity": 2, "price": 10, "total": 20}]
+        quote = api.post(f"{API_BASE}/quotes", json={"companyId": company["id"], "items": items}, timeout=10).json()
+        found = wait_for_event(events, change("quotes", "insert", quote["id"]))
+        assert found
+        assert found[2]["row"]["items"] == items
+        assert found[2]["row"]["quoteNumber"] == quote["quoteNumber"]
+        assert "companies" not in found[2]["row"]
+
+        api.put(f"{API_BASE}/quotes/{quote['id']}", json={"billTo": "Feed Customer"}, timeout=10)
+        found = wait_for_event(events, change("quotes", "update", quote["id"]))
+        assert found and found[2]["row"]["billTo"] == "Feed Customer"
+
+        # Batch writes are announced row by row
+        batch = api.post(f"{API_BASE}/quotes/batch", json={
+            "create": [{"companyId": company["id"], "billTo": f"Batch {n}"} for n in range(3)]
+        }, timeout=30).json()
+        created = [entry["id"] for entry in batch["create"] if entry["status"] == "created"]
+        assert len(created) == 3
+        assert all(wait_for_event(events, change("quotes", "insert", id)) for id in created)
+
+        api.post(f"{API_BASE}/quotes/batch", json={"delete": created}, timeout=30)
+        assert all(wait_for_event(events, change("quotes", "delete", id)) for id in created)
+
+        api.delete(f"{API_BASE}/quotes/{quote['id']}", timeout=10)
+        assert wait_for_event(events, change("quotes", "delete", quote["id"]))
+    finally:
+        api.delete(f"{API_BASE}/companies/{company['id']}", timeout=10)
+
+    # A reconnect resumes after the last event it saw
+    response.close()
+    _, replayed = feed(ready[0])
+    assert wait_for_event(replayed, change("quotes", "insert", quote["id"]), timeout=5)
+
+
+def test_change_feed_reset(feed):
+    _, events = feed("stale-1")
+    assert wait_for_event(events, lambda event, data: event == "reset", timeout=5)
@@ -0,0 +1,154 @@
+"""
+CRUD endpoints of companies, quotes and purchase orders, and the company
+each document embeds
+"""
+
+from datetime import datetime
+
+from tests.api.support import API_BASE, SAMPLE_LOGO_BASE64
+
+
+def test_companies_crud(api, namespace):
+    company_data = {
+        "name": f"{namespace} Acme Corporation Ltd",
+        "logo": SAMPLE_LOGO_BASE64,
+        "address": "123 Business Street, Corporate City, CC 12345",
+        "phone": "+1-555-123-4567",
+        "email": "contact@acmecorp.com",
+        "signature": "John Smith, CEO",
+        "seal": "Official Company Seal"
+    }
+    response = api.post(f"{API_BASE}/companies", json=company_data, timeout=10)
+    assert response.status_code == 200, response.text
+    company_id = response.json()["id"]
+
+    try:
+        response = api.get(f"{API_BASE}/companies", timeout=10)
+        assert response.status_code == 200
+        assert isinstance(response.json()["data"], list)
+
+        response = api.get(f"{API_BASE}/companies/{company_id}", timeout=10)
+        assert response.status_code == 200
+        assert response.json()["name"] == company_data["name"]
+
+        response = api.put(f"{API_BASE}/companies/{company_id}", json={
+            "name": f"{namespace} Acme Corporation Ltd - Updated",
+            "phone": "+1-555-987-6543",
+            "email": "updated@acmecorp.com"
+        }, timeout=10)
+        assert response.status_code == 200
+        assert response.json()["name"].endswith("- Updated")
+    finally:
+        response = api.delete(f"{API_BASE}/companies/{company_id}", timeout=10)
+    assert response.status_code == 200
+
+    response = api.get(f"{API_BASE}/companies/{company_id}", timeout=10)
+    assert response.status_code == 404
+
+
+def test_quotes_crud(api, company):
+    quote_data = {
+        "companyId": company["id"],
+        "quoteNumber": f"Q-{datetime.now().strftime('%Y%m%d')}-001",
+        "poNumber": "PO-REF-12345",
+        "billTo": "ABC Manufacturing Ltd",
+        "billToAddress": "789 Industrial Ave, Manufacturing City, MC 11111",
+        "billToContact": "Jane Doe, Procurement Manager",
+        "items": [
+            {"description": "Premium Widget Model A", "quantity": 10, "unitPrice": 150.00, "total": 1500.00},
+            {"description": "Standard Widget Model B", "quantity": 25, "unitPrice": 75.50, "total": 1887.50}
+        ],
+        "subtotal": 3387.50,
+        "vatRate": 5,
+        "vatAmount": 169.38,
+        "totalAmount": 3556.88,
+        "notes": "Payment terms: Net 30 days. Delivery within 2 weeks."
+    }
+    response = api.post(f"{API_BASE}/quotes", json=quote_data, timeout=10)
+    assert response.status_code == 200, response.text
+    quote_id = response.json()["id"]
+
+    response = api.get(f"{API_BASE}/quotes", params={"companyId": company["id"]}, timeout=10)
+    assert response.status_code == 200
+    assert [quote["id"] for quote in response.json()["data"]] == [quote_id]
+
+    response = api.get(f"{API_BASE}/quotes/{quote_id}", timeout=10)
+    assert response.status_code == 200
+    quote = response.json()
+    assert quote["quoteNumber"] == quote_data["quoteNumber"]
+    assert quote["companies"]["name"] == company["name"]
+
+    response = api.put(f"{API_BASE}/quotes/{quote_id}", json={
+        "billTo": "ABC Manufacturing Ltd - Updated",
+        "notes": "Updated payment terms: Net 15 days."
+    }, timeout=10)
+    assert response.status_code == 200
+    assert response.json()["billTo"] == "ABC Manufacturing Ltd - Updated"
+
+    # Numbers are only assigned on insert, so an edit can't blank one
+    response = api.put(f"{API_BASE}/quotes/{quote_id}", json={"quoteNumber": " "}, timeout=10)
+    assert response.status_code == 400
+    assert api.get(f"{API_BASE}/quotes/{quote_id}", timeout=10).json()["quoteNumber"] == quote_data["quoteNumber"]
+
+    response = api.delete(f"{API_BASE}/quotes/{quote_id}", timeout=10)
+    assert response.status_code == 200
+    assert api.get(f"{API_BASE}/quotes/{quote_id}", timeout=10).status_code == 404
+
+
+def test_purchase_orders_crud(api, company):
+    po_data = {
+        "companyId": company["id"],
+        "poNumber": f"PO-{datetime.now().strftime('%Y%m%d')}-001",
+        "quoteNumber": "Q-REF-67890",
+        "billTo": "XYZ Services Inc",
+        "billToAddress": "987 Service Lane, Service City, SC 22222",
+        "billToContact": "Bob Johnson, Operations Manager",
+        "items": [
+            {"description": "Professional Service Package A", "quantity": 5, "unitPrice": 500.00, "total": 2500.00},
+            {"description": "Maintenance Contract - Annual", "quantity": 1, "unitPrice": 1200.00, "total": 1200.00}
+        ],
+        "subtotal": 3700.00,
+        "vatRate": 5,
+        "vatAmount": 185.00,
+        "totalAmount": 3885.00,
+        "status": "pending",
+        "notes": "Service to commence within 30 days of PO approval."
+    }
+    response = api.post(f"{API_BASE}/purchase-orders", json=po_data, timeout=10)
+    assert response.status_code == 200, response.text
+    po_id = response.json()["id"]
+
+    response = api.get(f"{API_BASE}/purchase-orders", params={"companyId": company["id"]}, timeout=10)
+    assert response.status_code == 200
+    assert [po["id"] for po in response.json()["data"]] == [po_id]
+
+    response = api.get(f"{API_BASE}/purchase-orders/{po_id}", timeout=10)
+    assert response.status_code == 200
+    po = response.json()
+    assert po["poNumber"] == po_data["poNumber"]
+    assert po["companies"]["name"] == company["name"]
+
+    response = api.put(f"{API_BASE}/purchase-orders/{po_id}", json={
+        "status": "approved",
+        "notes": "PO approved. Service start date confirmed."
+    }, timeout=10)
+    assert response.status_code == 200
+    assert response.json()["status"] == "approved"
+
+    response = api.delete(f"{API_BASE}/purchase-orders/{po_id}", timeout=10)
+    assert response.status_code == 200
+    assert api.get(f"{API_BASE}/purchase-orders/{po_id}", timeout=10).status_code == 404
+
+
+def test_foreign_key_relationships(api, seed, namespace):
+    quote = api.get(f"{API_BASE}/quotes/{seed.relationship_quote}", timeout=10).json()
+    assert quote["companies"]["name"] == f"{namespace} Relationships"
+
+    po = api.get(f"{API_BASE}/purchase-orders/{seed.relationship_order}", timeout=10).json()
+    assert po["companies"]["name"] == f"{namespace} Relationships"
+    assert po["quoteId"] == seed.relationship_quote
+
+
+def test_missing_ids(api):
+    assert api.put(f"{API_BASE}/quotes", json={}, timeout=10).status_code == 400
+    assert api.get(f"{API_BASE}/quotes/missing-quote", timeout=10).status_code == 404
@@ -0,0 +1,107 @@
+"""
+Server-side PDFs, the single-record cache and quote to purchase order
+conversion
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.api.support import API_BASE, cache_hit, count_pdf_pages
+
+
+def test_pdf_rendering(api, company):
+    items = [{"description": f"Item {index}", "quantity": 1, "unitPrice": 10, "total": 10} for index in range(120)]
+    quote_id = api.post(f"{API_BASE}/quotes", json={
+        "companyId": company["id"], "quoteNumber": "PDF-TEST-001", "items": items
+    }, timeout=10).json()["id"]
+
+    response = api.get(f"{API_BASE}/quotes/{quote_id}/pdf", timeout=60)
+    assert response.status_code == 200
+    assert response.headers.get("Content-Type") == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert count_pdf_pages(response.content) > 1
+
+    etag = response.headers.get("ETag", "")
+    response = cache_hit(api, f"{API_BASE}/quotes/{quote_id}/pdf")
+    assert response.headers.get("X-Cache") == "HIT"
+    assert response.headers.get("ETag") == etag
+
+    response = api.get(f"{API_BASE}/quotes/{quote_id}/pdf", headers={"If-None-Match": etag}, timeout=60)
+    assert response.status_code == 304
+
+    # Editing the quote changes updatedAt and so invalidates the cached render
+    api.put(f"{API_BASE}/quotes/{quote_id}", json={"notes": "Changed"}, timeout=10)
+    response = api.get(f"{API_BASE}/quotes/{quote_id}/pdf", headers={"If-None-Match": etag}, timeout=60)
+    assert response.status_code == 200
+    assert response.headers.get("ETag") != etag
+
+
+def test_record_cache(api, company):
+    quote_id = api.post(f"{API_BASE}/quotes", json={"companyId": company["id"], "items": []}, timeout=10).json()["id"]
+    url = f"{API_BASE}/quotes/{quote_id}"
+
+    response = api.get(url, timeout=10)
+    etag = response.headers.get("ETag")
+    assert response.status_code == 200
+    assert etag
+
+    response = cache_hit(api, url)
+    assert response.headers.get("X-Cache") == "HIT"
+    assert response.headers.get("ETag") == etag
+
+    response = api.get(url, headers={"If-None-Match": etag}, timeout=10)
+    assert response.status_code == 304
+    assert not response.content
+
+    # Writes invalidate the cached record, so the old ETag no longer matches
+    api.put(url, json={"notes": "Changed"}, timeout=10)
+    response = api.get(url, headers={"If-None-Match": etag}, timeout=10)
+    assert response.status_code == 200
+    assert response.json()["notes"] == "Changed"
+    assert response.headers.get("ETag") != etag
+
+    renamed = f"{company['name']} Renamed"
+    api.put(f"{API_BASE}/companies/{company['id']}", json={"name": renamed}, timeout=10)
+    assert api.get(url, timeout=10).json()["companies"]["name"] == renamed
+
+    api.delete(url, timeout=10)
+    assert api.get(url, timeout=10).status_code == 404
+
+    response = api.get(f"{API_BASE}/metrics", timeout=10)
+    assert response.status_code == 200
+    assert 'cache_requests_total{cache="record",result="hit"}' in response.text
+
+
+def test_quote_conversion(api, company):
+    items = [{"description": "Consulting", "quantity": 3, "price": 100, "total": 300, "unit": "hours"}]
+    quote = api.post(f"{API_BASE}/quotes", json={
+        "companyId": company["id"], "billTo": "Globex", "items": items,
+        "subtotal": 300, "vatAmount": 15, "totalAmount": 315
+    }, timeout=10).json()
+
+    response = api.post(f"{API_BASE}/quotes/{quote['id']}/convert", timeout=10)
+    order = response.json()
+    assert response.status_code == 201
+    assert order["quoteId"] == quote["id"]
+    assert order["quoteNumber"] == quote["quoteNumber"]
+    assert order["billTo"] == "Globex"
+    assert order["totalAmount"] == 315
+    assert order["status"] == "pending"
+    assert order["items"] == quote["items"]
+    assert order["poNumber"].startswith("PO-")
+
+    # Converting again returns the same order
+    response = api.post(f"{API_BASE}/quotes/{quote['id']}/convert", timeout=10)
+    assert response.status_code == 200
+    assert response.json()["id"] == order["id"]
+
+
+def test_concurrent_conversions(api, company):
+    quote = api.post(f"{API_BASE}/quotes", json={"companyId": company["id"], "items": []}, timeout=10).json()
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        responses = list(pool.map(
+            lambda _: api.post(f"{API_BASE}/quotes/{quote['id']}/convert", timeout=30), range(10)
+        ))
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sorted(response.status_code for response in responses) == [200] * 9 + [201]
+
+    assert api.post(f"{API_BASE}/quotes/missing-quote/convert", timeout=10).status_code == 404
@@ -0,0 +1,62 @@
+"""
+Keyset pagination, list filters, company counts and the dashboard summary,
+read from the rows the session seeded
+"""
+
+from tests.api.support import API_BASE, cache_hit, find_listed
+
+
+def test_keyset_pagination(api, seed):
+    seen = []
+    params = {"companyId": seed.pagination, "limit": 2}
+    while True:
+        response = api.get(f"{API_BASE}/quotes", params=params, timeout=10)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["data"]) <= 2
+        seen.extend(quote["id"] for quote in page["data"])
+        if not page.get("nextCursor"):
+            break
+        params["after"] = page["nextCursor"]
+
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(seed.pagination_quotes)
+
+
+def test_invalid_cursor(api):
+    response = api.get(f"{API_BASE}/quotes", params={"after": "not-a-cursor"}, timeout=10)
+    assert response.status_code == 400
+
+
+def test_list_filters(api, seed):
+    response = api.get(f"{API_BASE}/quotes", params={"companyId": seed.filters, "q": "ACME", "minAmount": 100}, timeout=10)
+    assert response.status_code == 200
+    assert [row["billTo"] for row in response.json()["data"]] == ["Filter acme labs"]
+
+    response = api.get(f"{API_BASE}/purchase-orders", params={"companyId": seed.filters, "status": "pending"}, timeout=10)
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+    response = api.get(f"{API_BASE}/quotes", params={"from": "not-a-date"}, timeout=10)
+    assert response.status_code == 400
+
+
+def test_company_counts(api, seed):
+    company = find_listed(api, "companies", seed.filters, withCounts="true")
+    assert company["quoteCount"] == 3
+    assert company["purchaseOrderCount"] == 1
+
+
+def test_dashboard_summary(api, seed):
+    response = api.get(f"{API_BASE}/dashboard/summary", timeout=10)
+    assert response.status_code == 200
+    summary = response.json()
+    assert all(key in summary for key in ("totals", "quotes", "purchaseOrders", "companies"))
+
+    # Other workers write concurrently, so only this session's rollup is exact
+    rollup = next(row for row in summary["companies"] if row["id"] == seed.summary)
+    assert rollup["quoteCount"] == 1
+    assert rollup["purchaseOrderAmount"] == 100
+
+    response = cache_hit(api, f"{API_BASE}/dashboard/summary")
+    assert response.headers.get("X-Cache") == "HIT"
@@ -0,0 +1,90 @@
+"""
+Line items stored as structured arrays and document amounts computed
+exactly on the server
+"""
+
+import random
+
+from tests.api.support import API_BASE, decimal_of, expected_totals
+
+# Line items in the quote whose totals are checked exactly
+EXACT_TOTALS_ITEMS = 2000
+
+COMPLEX_ITEMS = [
+    {
+        "description": "High-end Product with Special Characters: àáâãäåæçèéêë",
+        "quantity": 3,
+        "unitPrice": 1234.56,
+        "total": 3703.68,
+        "category": "premium",
+        "sku": "SKU-001-SPECIAL"
+    },
+    {
+        "description": "Bulk Item with Discount",
+        "quantity": 100,
+        "unitPrice": 9.99,
+        "total": 999.00,
+        "discount": 0.01,
+        "category": "bulk"
+    }
+]
+
+
+def test_items_round_trip(api, company):
+    response = api.post(f"{API_BASE}/quotes", json={
+        "companyId": company["id"], "quoteNumber": "JSON-TEST-001", "items": COMPLEX_ITEMS, "vatRate": 7.5
+    }, timeout=10)
+    assert response.status_code == 200, response.text
+    quote_id = response.json()["id"]
+
+    items = api.get(f"{API_BASE}/quotes/{quote_id}", timeout=10).json()["items"]
+    assert isinstance(items, list)
+    assert [item["description"] for item in items] == [item["description"] for item in COMPLEX_ITEMS]
+    assert items[0]["sku"] == "SKU-001-SPECIAL"
+    assert items[1]["quantity"] == 100
+
+    # Replacing the items swaps the stored line items
+    response = api.put(f"{API_BASE}/quotes/{quote_id}", json={"items": COMPLEX_ITEMS[1:]}, timeout=10)
+    assert response.status_code == 200
+    assert [item["description"] for item in response.json()["items"]] == ["Bulk Item with Discount"]
+
+    response = api.post(f"{API_BASE}/quotes", json={"companyId": company["id"], "items": "[]"}, timeout=10)
+    assert response.status_code == 400
+
+
+def test_exact_totals(api, company):
+    rng = random.Random(19)
+    items = [{
+        "description": f"Line {index}",
+        "quantity": rng.choice([1, 3, 12, 0.5, 1.25, 2.333, 7.5]),
+        "price": rng.choice([0.1, 0.2, 0.7, 9.99, 19.95, 33.333, 0.005, 1234.56, 0.015])
+    } for index in range(EXACT_TOTALS_ITEMS)]
+    # Float arithmetic as the old client did it; the server ignores these
+    for item in items:
+        item["total"] = item["quantity"] * item["price"]
+    float_subtotal = sum(item["total"] for item in items)
+    lines, expected = expected_totals(items, 7.5)
+
+    response = api.post(f"{API_BASE}/quotes", json={
+        "companyId": company["id"], "items": items, "vatRate": 7.5,
+        "subtotal": float_subtotal, "vatAmount": float_subtotal * 0.075, "totalAmount": float_subtotal * 1.075
+    }, timeout=60)
+    assert response.status_code == 200, response.text[:200]
+    quote = response.json()
+
+    for body in (quote, api.get(f"{API_BASE}/quotes/{quote['id']}", timeout=30).json()):
+        assert {key: decimal_of(body[key]) for key in expected} == expected
+        assert [decimal_of(item["total"]) for item in body["items"]] == lines
+
+    # Changing the VAT rate recomputes from the stored items
+    response = api.put(f"{API_BASE}/quotes/{quote['id']}", json={"vatRate": 12.5}, timeout=30)
+    _, expected = expected_totals(items, 12.5)
+    assert response.status_code == 200
+    assert {key: decimal_of(response.json()[key]) for key in expected} == expected
+
+
+def test_non_numeric_price(api, company):
+    response = api.post(f"{API_BASE}/quotes", json={
+        "companyId": company["id"], "items": [{"quantity": 1, "price": "ten"}]
+    }, timeout=10)
+    assert response.status_code == 400
@@ -0,0 +1,239 @@
+"""
+Fixtures for the performance regression benchmarks.
+
+The benchmarks only run with --bench, serially, against a local backend at
+NEXT_PUBLIC_BASE_URL. They seed datasets of --bench-sizes quotes (two line
+items each, spread over companies that carry their own logo), growing one
+dataset in place from the smallest size to the largest, and measure each
+endpoint's latency, response size and the server's peak RSS at every size.
+
+Results are written to tests/bench/results.json. A measurement fails when a
+metric is more than --bench-threshold worse than the baseline recorded for
+the same size and endpoint (tests/bench/baseline.json unless --bench-baseline
+says otherwise); --bench-update-baseline records the run as the new baseline.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import requests
+
+from tests.api.support import API_BASE, BATCH_SIZE, batch, load_items, parse_server_timing, percentile, png_data_url
+
+BENCH_DIR = Path(__file__).parent
+RESULTS_PATH = BENCH_DIR / "results.json"
+
+QUOTES_PER_COMPANY = 100
+LOGO_BYTES = 4 * 1024
+
+# Batch requests in flight while seeding
+SEED_CONCURRENCY = 4
+
+# Unmeasured requests before each measurement
+WARMUP_REQUESTS = 3
+
+RSS_SAMPLE_INTERVAL = 0.1
+
+# Compared metrics and the smallest change that counts as a regression, so
+# noise on fast endpoints does not fail the run
+METRICS = {"p50_ms": 2.0, "p95_ms": 5.0, "bytes": 0, "peak_rss_mb": 16.0, "dom_nodes": 50, "js_heap_mb": 8.0}
+
+
+def pytest_collection_modifyitems(config, items):
+    here = Path(__file__).parent
+    run = config.getoption("bench")
+    for item in items:
+        if here in item.path.parents:
+            item.add_marker(pytest.mark.bench)
+            if not run:
+                item.add_marker(pytest.mark.skip(reason="benchmarks only run with --bench"))
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = sorted({int(size) for size in metafunc.config.getoption("bench_sizes").split(",") if size.strip()})
+        metafunc.parametrize("size", sizes, scope="session")
+
+
+def server_rss_mb(session):
+    """The server's resident set size from /api/metrics, in MB"""
+    for line in session.get(f"{API_BASE}/metrics", timeout=10).text.splitlines():
+        if line.startswith("process_resident_memory_bytes "):
+            return float(line.split()[1]) / (1024 * 1024)
+    return 0.0
+
+
+class PeakRss:
+    """Samples the server's RSS on its own connection while in use"""
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.peak = 0.0
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        while not self.stop.is_set():
+            try:
+                self.peak = max(self.peak, server_rss_mb(self.session))
+            except requests.exceptions.RequestException:
+                pass
+            self.stop.wait(RSS_SAMPLE_INTERVAL)
+
+    def __enter__(self):
+        self.peak = server_rss_mb(self.session)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+        self.session.close()
+
+
+class Dataset:
+    """Companies and quotes seeded for the benchmarks, grown in place"""
+
+    def __init__(self, session, name):
+        self.session = session
+        self.name = name
+        self.companies = []
+        self.quotes = []
+
+    def grow(self, size):
+        missing = size - len(self.quotes)
+        if missing <= 0:
+            return self
+        companies_needed = -(-size // QUOTES_PER_COMPANY) - len(self.companies)
+        if companies_needed > 0:
+            start = len(self.companies)
+            self.companies += self.create("companies", [{
+                "name": f"{self.name} {index}",
+                "logo": png_data_url(LOGO_BYTES)
+            } for index in range(start, start + companies_needed)])
+
+        start = len(self.quotes)
+        self.quotes += self.create("quotes", [{
+            "companyId": self.companies[index // QUOTES_PER_COMPANY],
+            "quoteNumber": f"BENCH-{index}",
+            "billTo": f"Bench Customer {index % 97}",
+            "items": load_items()
+        } for index in range(start, size)])
+        return self
+
+    def create(self, path, rows):
+        """Create rows BATCH_SIZE at a time, SEED_CONCURRENCY batches at once; ids in order"""
+        chunks = [rows[start:start + BATCH_SIZE] for start in range(0, len(rows), BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=SEED_CONCURRENCY) as pool:
+            results = pool.map(lambda chunk: batch(self.session, path, create=chunk)["create"], chunks)
+            return [result["id"] for chunk in results for result in chunk]
+
+    def delete(self):
+        # Deleting a company cascades to its quotes
+        for start in range(0, len(self.companies), BATCH_SIZE):
+            self.session.post(f"{API_BASE}/companies/batch",
+                              json={"delete": self.companies[start:start + BATCH_SIZE]}, timeout=600)
+
+
+class Bench:
+    """Measures endpoints, compares them with the baseline and keeps the results"""
+
+    def __init__(self, session, config):
+        self.session = session
+        self.samples = config.getoption("bench_samples")
+        self.threshold = config.getoption("bench_threshold")
+        self.update_baseline = config.getoption("bench_update_baseline")
+        self.baseline_path = Path(config.getoption("bench_baseline") or BENCH_DIR / "baseline.json")
+        self.baseline = json.loads(self.baseline_path.read_text()) if self.baseline_path.exists() else {}
+        self.results = {}
+
+    def measure(self, requests_to_time):
+        """Latency, bytes and server time of GETting each (path, params) in
+        turn, cycling until `samples` requests were timed"""
+        for path, params in requests_to_time[:WARMUP_REQUESTS]:
+            self.session.get(f"{API_BASE}/{path}", params=params, timeout=120).raise_for_status()
+
+        latencies, server, sizes = [], [], []
+        with PeakRss() as rss:
+            for index in range(self.samples):
+                path, params = requests_to_time[index % len(requests_to_time)]
+                started = time.perf_counter()
+                response = self.session.get(f"{API_BASE}/{path}", params=params, timeout=120)
+                latencies.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+                sizes.append(len(response.content))
+                timing = parse_server_timing(response.headers.get("Server-Timing", ""))
+                server.append(timing.get("total", (0.0, ""))[0])
+
+        latencies.sort()
+        return {
+            "samples": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "server_p50_ms": round(percentile(sorted(server), 50), 2),
+            "bytes": round(sum(sizes) / len(sizes)),
+            "peak_rss_mb": round(rss.peak, 1),
+        }
+
+    def record(self, size, endpoint, result):
+        self.results.setdefault(str(size), {})[endpoint] = result
+
+    def regressions(self, size, endpoint, result):
+        """Metrics more than `threshold` worse than the baseline's"""
+        baseline = self.baseline.get("results", {}).get(str(size), {}).get(endpoint)
+        if not baseline:
+            return []
+        found = []
+        for metric, noise in METRICS.items():
+            before, after = baseline.get(metric), result.get(metric)
+            if before is not None and after is not None and after > before * (1 + self.threshold) and after - before > noise:
+                change = f"{after / before - 1:+.0%}" if before else "new"
+                found.append(f"{metric} {before} -> {after} ({change})")
+        return found
+
+    def save(self):
+        document = {
+            "recordedAt": datetime.now(timezone.utc).isoformat(),
+            "baseUrl": API_BASE,
+            "samples": self.samples,
+            "results": self.results,
+        }
+        RESULTS_PATH.write_text(json.dumps(document, indent=2) + "\n")
+        if self.update_baseline:
+            # Sizes and endpoints this run did not measure keep their baseline
+            merged = self.baseline.get("results", {})
+            for size, endpoints in self.results.items():
+                merged.setdefault(size, {}).update(endpoints)
+            self.baseline_path.write_text(json.dumps({**document, "results": merged}, indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def bench(request):
+    if hasattr(request.config, "workerinput"):
+        pytest.skip("benchmarks run serially; run them without -n")
+    session = requests.Session()
+    try:
+        session.get(f"{API_BASE}/health", timeout=5)
+    except requests.exceptions.RequestException as error:
+        pytest.skip(f"API not reachable at {API_BASE}: {error}")
+    measurements = Bench(session, request.config)
+    yield measurements
+    measurements.save()
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def datasets(bench):
+    dataset = Dataset(bench.session, f"bench-{datetime.now():%Y%m%d%H%M%S}")
+    yield dataset
+    dataset.delete()
+
+
+@pytest.fixture
+def dataset(datasets, size):
+    return datasets.grow(size)
@@ -0,0 +1,82 @@
+"""
+DOM size of the dashboard's virtualized quotes list in a headless browser.
+Scrolling through the list fetches page after page of quotes, but only the
+rows in view are mounted, so the document must stay the same size however
+many quotes are loaded. Needs Playwright with Chromium installed
+(pip install playwright && playwright install chromium).
+"""
+
+import pytest
+
+from tests.api.support import BASE_URL
+
+LIST = '[data-virtual-list="quotes"]'
+
+# Scrolls to the bottom of the list, each fetching at most one more page
+SCROLLS = 20
+
+# Time for a scroll to trigger the next page's fetch
+SETTLE_MS = 300
+
+# How much larger than after the first page the document may grow while
+# scrolling (row contents differ slightly in size)
+MAX_DOM_GROWTH = 1.2
+
+
+def dom_nodes(page):
+    return page.evaluate("document.querySelectorAll('*').length")
+
+
+def list_height(page):
+    """Height of all the quotes rows loaded so far, mounted or not"""
+    return page.eval_on_selector(LIST, "list => list.scrollHeight")
+
+
+def js_heap_mb(page):
+    # performance.memory is Chromium only
+    used = page.evaluate("performance.memory ? performance.memory.usedJSHeapSize : 0")
+    return round(used / (1024 * 1024), 1)
+
+
+@pytest.fixture(scope="module")
+def browser():
+    sync_api = pytest.importorskip("playwright.sync_api")
+    with sync_api.sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        yield browser
+        browser.close()
+
+
+def test_dashboard_dom_size(bench, dataset, size, browser, record_property):
+    page = browser.new_page(viewport={"width": 1280, "height": 900})
+    try:
+        page.goto(BASE_URL, wait_until="load", timeout=120_000)
+        page.wait_for_selector(f"{LIST} [data-row]", timeout=60_000)
+        initial = dom_nodes(page)
+        first_page_height = list_height(page)
+
+        counts = []
+        for _ in range(SCROLLS):
+            page.eval_on_selector(LIST, "list => list.scrollTo(0, list.scrollHeight)")
+            # The change feed keeps a request open, so the page never goes
+            # network-idle; wait for the list's page fetch instead
+            page.wait_for_timeout(SETTLE_MS)
+            page.wait_for_selector(f"{LIST} > p", state="detached", timeout=60_000)
+            counts.append(dom_nodes(page))
+        loaded_height = list_height(page)
+
+        result = {"dom_nodes": max(counts), "js_heap_mb": js_heap_mb(page)}
+    finally:
+        page.close()
+
+    endpoint = "dashboard quotes list"
+    bench.record(size, endpoint, result)
+    record_property("bench", (size, endpoint, result))
+
+    # Scrolling loaded further pages
+    assert loaded_height > first_page_height
+    assert result["dom_nodes"] <= initial * MAX_DOM_GROWTH, (
+        f"DOM grew from {initial} to {result['dom_nodes']} nodes while scrolling {size} quotes"
+    )
+    regressions = bench.regressions(size, endpoint, result)
+    assert not regressions, f"{endpoint} at {size} quotes regressed: " + "; ".join(regressions)
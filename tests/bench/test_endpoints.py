@@ -0,0 +1,53 @@
+"""
+Latency, payload size and server memory of the main read endpoints at each
+dataset size, checked against the stored baseline
+"""
+
+import random
+
+import pytest
+
+from tests.api.support import API_BASE
+
+
+def list_pages(bench, dataset):
+    """Pages of /api/quotes after the first, by cursor"""
+    cursors, params = [], {}
+    while len(cursors) < bench.samples:
+        cursor = bench.session.get(f"{API_BASE}/quotes", params=params, timeout=60).json().get("nextCursor")
+        if not cursor:
+            break
+        cursors.append(cursor)
+        params = {"after": cursor}
+    return [("quotes", {"after": cursor}) for cursor in cursors] or [("quotes", {})]
+
+
+def quote_reads(bench, dataset):
+    rng = random.Random(21)
+    return [(f"quotes/{quote_id}", {}) for quote_id in rng.sample(dataset.quotes, min(bench.samples, len(dataset.quotes)))]
+
+
+# Endpoint name -> the (path, params) requests that measure it
+ENDPOINTS = {
+    "GET /quotes": lambda bench, dataset: [("quotes", {})],
+    "GET /quotes?after": list_pages,
+    "GET /quotes?companyId&q": lambda bench, dataset: [
+        ("quotes", {"companyId": company_id, "q": "customer 1"}) for company_id in dataset.companies[:bench.samples]
+    ],
+    "GET /quotes/:id": quote_reads,
+    "GET /companies?withCounts": lambda bench, dataset: [("companies", {"withCounts": "true"})],
+    "GET /dashboard/summary": lambda bench, dataset: [("dashboard/summary", {})],
+    "GET /quotes/export?companyId": lambda bench, dataset: [
+        ("quotes/export", {"companyId": company_id}) for company_id in dataset.companies[:bench.samples]
+    ],
+}
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_endpoint(bench, dataset, size, endpoint, record_property):
+    result = bench.measure(ENDPOINTS[endpoint](bench, dataset))
+    bench.record(size, endpoint, result)
+    record_property("bench", (size, endpoint, result))
+
+    regressions = bench.regressions(size, endpoint, result)
+    assert not regressions, f"{endpoint} at {size} quotes regressed: " + "; ".join(regressions)
@@ -0,0 +1,94 @@
+"""
+Suite-wide options, and the end-of-run reports of the live API tests
+(tests/api) and the benchmarks (tests/bench). Each of those tests records
+its measurements as user properties; they travel back from xdist workers
+with the test reports and are summarised here when the run ends.
+"""
+
+TIMING_PHASES = ("db", "serialize", "render", "app", "total")
+
+# Columns of the benchmark summary: (metric, title, format)
+BENCH_COLUMNS = (
+    ("p50_ms", "p50 ms", ".1f"),
+    ("p95_ms", "p95 ms", ".1f"),
+    ("server_p50_ms", "server ms", ".1f"),
+    ("bytes", "bytes", ""),
+    ("peak_rss_mb", "peak RSS MB", ".1f"),
+    ("dom_nodes", "DOM nodes", ""),
+    ("js_heap_mb", "JS heap MB", ".1f"),
+)
+
+# Slowest tests listed in the timing summary
+SLOWEST_TESTS = 15
+
+
+def pytest_addoption(parser):
+    parser.addoption("--server-timing", action="store_true",
+                     help="report the Server-Timing breakdown of the API tests' calls per route")
+
+    group = parser.getgroup("bench", "performance regression benchmarks (tests/bench)")
+    group.addoption("--bench", action="store_true", help="run the benchmark suite against NEXT_PUBLIC_BASE_URL")
+    group.addoption("--bench-sizes", default="1000,10000,100000",
+                    help="quotes in each seeded dataset (default: 1000,10000,100000)")
+    group.addoption("--bench-samples", type=int, default=30, help="requests per measurement (default: 30)")
+    group.addoption("--bench-threshold", type=float, default=0.2,
+                    help="fail when a metric is this fraction worse than its baseline (default: 0.2)")
+    group.addoption("--bench-baseline", help="baseline JSON file (default: tests/bench/baseline.json)")
+    group.addoption("--bench-update-baseline", action="store_true",
+                    help="record this run's results as the new baseline")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "api: talks to the running API at NEXT_PUBLIC_BASE_URL")
+    config.addinivalue_line("markers", "bench: performance benchmark, only run with --bench")
+
+
+def reported(terminalreporter, key):
+    """(nodeid, duration, properties) of every test whose call recorded `key`"""
+    found = []
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            properties = dict(getattr(report, "user_properties", ()))
+            if getattr(report, "when", None) == "call" and key in properties:
+                found.append((report.nodeid, report.duration, properties))
+    return found
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    benchmarks = reported(terminalreporter, "bench")
+    if benchmarks:
+        # Endpoint and page benchmarks measure different metrics; a column is
+        # shown when any result has it
+        present = [column for column in BENCH_COLUMNS
+                   if any(column[0] in properties["bench"][2] for _, _, properties in benchmarks)]
+        terminalreporter.section("Benchmarks")
+        terminalreporter.write_line(f"{'Rows':>8} {'Endpoint':<32}" + "".join(f" {title:>12}" for _, title, _ in present))
+        for _, _, properties in benchmarks:
+            size, endpoint, result = properties["bench"]
+            terminalreporter.write_line(f"{size:>8} {endpoint:<32}" + "".join(
+                f" {result[metric]:>12{spec}}" if metric in result else f" {'-':>12}" for metric, _, spec in present
+            ))
+
+    timings = reported(terminalreporter, "api_calls")
+    if not timings:
+        return
+
+    terminalreporter.section("API test timing")
+    terminalreporter.write_line(f"{'Test':<64} {'Wall s':>8} {'Calls':>6} {'Server ms':>10} {'DB ms':>8}")
+    for nodeid, duration, properties in sorted(timings, key=lambda timing: -timing[1])[:SLOWEST_TESTS]:
+        terminalreporter.write_line(
+            f"{nodeid[-64:]:<64} {duration:>8.2f} {properties['api_calls']:>6}"
+            f" {properties['server_ms']:>10.1f} {properties['db_ms']:>8.1f}"
+        )
+
+    if not config.getoption("server_timing"):
+        return
+    by_route = {}
+    for _, _, properties in timings:
+        for route, phases in properties["server_timing"]:
+            by_route.setdefault(route, []).append(phases)
+    terminalreporter.section("Server-Timing breakdown (average per call)")
+    terminalreporter.write_line(f"{'Route':<40} {'Calls':>6}" + "".join(f" {phase + ' ms':>12}" for phase in TIMING_PHASES))
+    for route, calls in sorted(by_route.items(), key=lambda item: -sum(phases.get("total", 0) for phases in item[1])):
+        averages = [sum(phases.get(phase, 0) for phases in calls) / len(calls) for phase in TIMING_PHASES]
+        terminalreporter.write_line(f"{route:<40} {len(calls):>6}" + "".join(f" {average:>12.1f}" for average in averages))
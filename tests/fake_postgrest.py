@@ -0,0 +1,1058 @@
+#!/usr/bin/env python3
+"""
+Local in-process stand-in for the Supabase REST (PostgREST) backend
+
+Implements the subset of the PostgREST wire protocol that `@supabase/supabase-js`
+emits for the queries in `app/api/[[...path]]/route.js`:
+
+  * `select=` with column lists, aliases and embedded relations such as
+    `*,companies(id,name,logo)`
+  * horizontal filters (`eq`, `neq`, `gt`, `gte`, `lt`, `lte`, `like`, `ilike`,
+    `is`, `in`, `not.*`) and `or=(...)` / `and=(...)` groups
+  * `order=`, `limit=`, `offset=`
+  * POST (insert), PATCH (update) and DELETE with `Prefer: return=representation`
+  * `Accept: application/vnd.pgrst.object+json` for `.single()`
+
+Every response can be delayed by a configurable latency so route overhead can be
+measured separately from database round-trip time.
+
+Usage:
+    python -m tests.fake_postgrest --port 54321 --latency-ms 5
+
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 \\
+    NEXT_PUBLIC_SUPABASE_ANON_KEY=fake yarn dev
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+OBJECT_MEDIA_TYPE = "application/vnd.pgrst.object+json"
+
+# Longest request URL accepted, as with the 8 KB header buffers of the
+# proxies usually in front of PostgREST
+MAX_URL_LENGTH = 8192
+
+
+ASSET_URL = re.compile(r"^/api/assets/([0-9a-f]{64})$")
+
+
+def asset_hash(value):
+    match = ASSET_URL.match(value or "")
+    return match.group(1) if match else None
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+def assign_document_number(column, kind, prefix):
+    """BEFORE INSERT trigger: number the row from its company's sequence
+    when the client left `column` blank (next_document_number)"""
+    def trigger(db, table, row):
+        if row.get(column):
+            return
+        company_id = row.get("companyId")
+        sequence = db.tables["document_sequences"].setdefault(
+            (company_id, kind), {"companyId": company_id, "kind": kind, "lastValue": 0}
+        )
+        taken = {other.get(column) for other in db.tables[table].values() if other.get("companyId") == company_id}
+        while True:
+            sequence["lastValue"] += 1
+            candidate = f"{prefix}{sequence['lastValue']:06d}"
+            if candidate not in taken:
+                row[column] = candidate
+                return
+    return trigger
+
+
+def build_schema():
+    """Tables, defaults and foreign keys mirroring the Supabase project"""
+    line_item_ids = itertools.count(1)
+    return {
+        "companies": {
+            "primary_key": ("id",),
+            "columns": {
+                "id": None,
+                "name": None,
+                "logo": "",
+                "address": "",
+                "phone": "",
+                "email": "",
+                "signature": "",
+                "seal": "",
+                "logoHash": None,
+                "createdAt": None,
+                "updatedAt": None,
+            },
+            "foreign_keys": {},
+            "unique": [],
+            "generated": {
+                "logoHash": lambda row: asset_hash(row.get("logo")),
+            },
+        },
+        "assets": {
+            "primary_key": ("hash",),
+            "columns": {
+                "hash": None,
+                "mimeType": None,
+                "data": None,
+                "size": None,
+                "createdAt": None,
+            },
+            "foreign_keys": {},
+            "unique": [],
+            "generated": {},
+        },
+        "quotes": {
+            "primary_key": ("id",),
+            "columns": {
+                "id": None,
+                "companyId": None,
+                "quoteNumber": None,
+                "poNumber": "",
+                "billTo": "",
+                "billToAddress": "",
+                "billToContact": "",
+                "subtotal": 0,
+                "vatRate": 5,
+                "vatAmount": 0,
+                "totalAmount": 0,
+                "notes": "",
+                "createdAt": None,
+                "updatedAt": None,
+            },
+            "foreign_keys": {
+                "companyId": ("companies", "id", "cascade"),
+            },
+            "unique": [("companyId", "quoteNumber")],
+            "generated": {},
+            "before_insert": [assign_document_number("quoteNumber", "quote", "Q-")],
+        },
+        "purchase_orders": {
+            "primary_key": ("id",),
+            "columns": {
+                "id": None,
+                "companyId": None,
+                "quoteId": None,
+                "poNumber": None,
+                "quoteNumber": "",
+                "billTo": "",
+                "billToAddress": "",
+                "billToContact": "",
+                "subtotal": 0,
+                "vatRate": 5,
+                "vatAmount": 0,
+                "totalAmount": 0,
+                "notes": "",
+                "status": "pending",
+                "createdAt": None,
+                "updatedAt": None,
+            },
+            "foreign_keys": {
+                "companyId": ("companies", "id", "cascade"),
+                "quoteId": ("quotes", "id", "set null"),
+            },
+            "unique": [("companyId", "poNumber")],
+            "generated": {},
+            "before_insert": [assign_document_number("poNumber", "purchase-order", "PO-")],
+        },
+        "quote_conversions": {
+            "primary_key": ("quoteId",),
+            "columns": {
+                "quoteId": None,
+                "purchaseOrderId": None,
+                "createdAt": None,
+            },
+            "foreign_keys": {
+                "quoteId": ("quotes", "id", "cascade"),
+                "purchaseOrderId": ("purchase_orders", "id", "cascade"),
+            },
+            "unique": [("purchaseOrderId",)],
+            "generated": {},
+        },
+        "document_sequences": {
+            "primary_key": ("companyId", "kind"),
+            "columns": {
+                "companyId": None,
+                "kind": None,
+                "lastValue": 0,
+            },
+            "foreign_keys": {
+                "companyId": ("companies", "id", "cascade"),
+            },
+            "unique": [],
+            "generated": {},
+        },
+        "line_items": {
+            "primary_key": ("id",),
+            "columns": {
+                "id": lambda: next(line_item_ids),
+                "quoteId": None,
+                "purchaseOrderId": None,
+                "position": None,
+                "description": "",
+                "quantity": 0,
+                "price": 0,
+                "total": 0,
+                "attributes": dict,
+            },
+            "foreign_keys": {
+                "quoteId": ("quotes", "id", "cascade"),
+                "purchaseOrderId": ("purchase_orders", "id", "cascade"),
+            },
+            "unique": [("quoteId", "position"), ("purchaseOrderId", "position")],
+            "generated": {},
+        },
+    }
+
+
+class PostgrestError(Exception):
+    """Error rendered in PostgREST's JSON error shape"""
+
+    def __init__(self, status, code, message, details=None, hint=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+    def to_json(self):
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": self.hint}
+
+
+# ---------------------------------------------------------------------------
+# Query string parsing
+# ---------------------------------------------------------------------------
+
+def split_top_level(text, separator=","):
+    """Split on `separator` outside of parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == separator and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current or parts:
+        parts.append("".join(current))
+    return parts
+
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def parse_select(text):
+    """Parse a `select=` value into a list of (kind, alias, name, children, modifiers)"""
+    nodes = []
+    for raw in split_top_level(text or "*"):
+        raw = raw.strip()
+        if not raw:
+            continue
+        alias = None
+        paren = raw.find("(")
+        head = raw if paren == -1 else raw[:paren]
+        if ":" in head and "::" not in head:
+            alias, raw = raw.split(":", 1)
+            paren = raw.find("(")
+        if paren != -1 and raw.endswith(")"):
+            name, _, hint = raw[:paren].partition("!")
+            children = parse_select(raw[paren + 1:-1])
+            nodes.append(("embed", alias, name, children, hint))
+        else:
+            name = raw.split("::", 1)[0]
+            nodes.append(("column", alias, name, None, None))
+    return nodes
+
+
+def parse_order(text):
+    """Parse `order=a.desc,b.asc.nullslast` into (column, descending, nulls_first)"""
+    terms = []
+    for raw in split_top_level(text):
+        bits = raw.split(".")
+        column, descending, nulls_first = bits[0], False, None
+        for bit in bits[1:]:
+            if bit == "desc":
+                descending = True
+            elif bit == "asc":
+                descending = False
+            elif bit == "nullsfirst":
+                nulls_first = True
+            elif bit == "nullslast":
+                nulls_first = False
+        if nulls_first is None:
+            nulls_first = descending
+        terms.append((column, descending, nulls_first))
+    return terms
+
+
+def parse_condition(column, expression):
+    """Parse `op.value` (optionally `not.op.value`) for `column`"""
+    negate = False
+    if expression.startswith("not."):
+        negate = True
+        expression = expression[4:]
+    operator, _, value = expression.partition(".")
+    if operator in ("and", "or") and expression.startswith(operator + "("):
+        return ("group", operator, parse_logic(expression[len(operator):]), negate)
+    return ("cond", column, operator, value, negate)
+
+
+def parse_logic(text):
+    """Parse the body of `or=(...)` / `and=(...)` into condition nodes"""
+    text = text.strip()
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    nodes = []
+    for term in split_top_level(text):
+        term = term.strip()
+        negate = False
+        if term.startswith("not."):
+            negate = True
+            term = term[4:]
+        if term.startswith("and(") or term.startswith("or("):
+            operator = term[:term.index("(")]
+            nodes.append(("group", operator, parse_logic(term[len(operator):]), negate))
+            continue
+        column, _, expression = term.partition(".")
+        node = parse_condition(column, expression)
+        if negate:
+            node = node[:-1] + (not node[-1],)
+        nodes.append(node)
+    return nodes
+
+
+def coerce(sample, value):
+    """Coerce a query string value towards the type stored in the row"""
+    if value is None:
+        return None
+    value = unquote(value)
+    if isinstance(sample, bool):
+        return value.lower() == "true"
+    if isinstance(sample, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def like_to_regex(pattern, case_insensitive):
+    pattern = unquote(pattern)
+    regex = "".join(".*" if c in "*%" else "." if c == "_" else re.escape(c) for c in pattern)
+    return re.compile(f"^{regex}$", (re.IGNORECASE | re.DOTALL) if case_insensitive else re.DOTALL)
+
+
+def evaluate_condition(row, node):
+    if node[0] == "group":
+        _, operator, children, negate = node
+        results = (evaluate_condition(row, child) for child in children)
+        outcome = all(results) if operator == "and" else any(results)
+        return not outcome if negate else outcome
+
+    _, column, operator, raw, negate = node
+    actual = row.get(column)
+    if operator == "is":
+        expected = {"null": None, "true": True, "false": False}.get(raw.lower(), raw)
+        outcome = actual is expected if expected is None else actual == expected
+    elif operator == "in":
+        options = [coerce(actual, unquote(v.strip())) for v in split_top_level(raw.strip()[1:-1])]
+        outcome = actual in options
+    elif operator in ("like", "ilike"):
+        outcome = actual is not None and bool(like_to_regex(raw, operator == "ilike").match(str(actual)))
+    else:
+        expected = coerce(actual, raw)
+        if actual is None:
+            outcome = False
+        elif operator == "eq":
+            outcome = actual == expected
+        elif operator == "neq":
+            outcome = actual != expected
+        elif operator in ("gt", "gte", "lt", "lte"):
+            try:
+                outcome = {
+                    "gt": actual > expected,
+                    "gte": actual >= expected,
+                    "lt": actual < expected,
+                    "lte": actual <= expected,
+                }[operator]
+            except TypeError:
+                outcome = False
+        else:
+            raise PostgrestError(400, "PGRST100", f'"failed to parse filter ({operator}.{raw})"')
+    return not outcome if negate else outcome
+
+
+# ---------------------------------------------------------------------------
+# Database functions (supabase/migrations), called via /rest/v1/rpc/<name>
+# ---------------------------------------------------------------------------
+
+def dashboard_summary(db, args):
+    companies = list(db.tables["companies"].values())
+    quotes = list(db.tables["quotes"].values())
+    orders = list(db.tables["purchase_orders"].values())
+
+    def amount(rows, column):
+        return sum(row.get(column) or 0 for row in rows)
+
+    by_status = {}
+    for order in orders:
+        status = order.get("status") or "pending"
+        by_status[status] = by_status.get(status, 0) + 1
+
+    rollups = []
+    for company in sorted(companies, key=lambda row: (row["name"], row["id"])):
+        own_quotes = [row for row in quotes if row.get("companyId") == company["id"]]
+        own_orders = [row for row in orders if row.get("companyId") == company["id"]]
+        rollups.append({
+            "id": company["id"],
+            "name": company["name"],
+            "quoteCount": len(own_quotes),
+            "quoteAmount": amount(own_quotes, "totalAmount"),
+            "purchaseOrderCount": len(own_orders),
+            "purchaseOrderAmount": amount(own_orders, "totalAmount"),
+        })
+
+    return {
+        "totals": {"companies": len(companies), "quotes": len(quotes), "purchaseOrders": len(orders)},
+        "quotes": {"totalAmount": amount(quotes, "totalAmount"), "vatAmount": amount(quotes, "vatAmount")},
+        "purchaseOrders": {
+            "totalAmount": amount(orders, "totalAmount"),
+            "vatAmount": amount(orders, "vatAmount"),
+            "byStatus": by_status,
+        },
+        "companies": rollups,
+    }
+
+
+CONVERTED_COLUMNS = (
+    "companyId", "quoteNumber", "billTo", "billToAddress", "billToContact",
+    "subtotal", "vatRate", "vatAmount", "totalAmount", "notes",
+)
+
+
+def convert_quote(db, args):
+    quote_id, po_id = args.get("quote_id"), args.get("po_id")
+    source = db.tables["quotes"].get((quote_id,))
+    if source is None:
+        return None
+    existing = db.tables["quote_conversions"].get((quote_id,))
+    if existing is not None:
+        return {"created": False, "id": existing["purchaseOrderId"]}
+
+    # One transaction: undo every table if any insert fails
+    snapshot = db.snapshot()
+    try:
+        now = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+        order = {column: source.get(column) for column in CONVERTED_COLUMNS}
+        order.update(id=po_id, quoteId=quote_id, status="pending", createdAt=now, updatedAt=now)
+        db.insert("purchase_orders", [order], {})
+        items = [
+            {key: row[key] for key in ("position", "description", "quantity", "price", "total", "attributes")}
+            | {"purchaseOrderId": po_id}
+            for row in db.tables["line_items"].values() if row.get("quoteId") == quote_id
+        ]
+        if items:
+            db.insert("line_items", items, {})
+        db.insert("quote_conversions", [{"quoteId": quote_id, "purchaseOrderId": po_id, "createdAt": now}], {})
+    except PostgrestError:
+        db.tables = snapshot
+        raise
+    return {"created": True, "id": po_id}
+
+
+LINE_ITEM_COLUMNS = ("position", "description", "quantity", "price", "total", "attributes")
+PARENT_COLUMNS = {"quotes": "quoteId", "purchase_orders": "purchaseOrderId"}
+
+
+def stored_line_items(db, parent, document_id):
+    rows = sorted((row for row in db.tables["line_items"].values() if row.get(parent) == document_id),
+                  key=lambda row: row["position"])
+    return [{column: row[column] for column in LINE_ITEM_COLUMNS} for row in rows]
+
+
+def line_item_rows(parent, document_id, items):
+    return [{column: item[column] for column in LINE_ITEM_COLUMNS if item.get(column) is not None}
+            | {parent: document_id} for item in items]
+
+
+def create_document(db, args):
+    table, document, items = args.get("table_name"), args.get("document") or {}, args.get("items") or []
+    parent = PARENT_COLUMNS.get(table)
+    if parent is None:
+        raise PostgrestError(400, "P0001", f"create_document: unknown table {table}")
+
+    # One transaction: undo every table if any insert fails
+    snapshot = db.snapshot()
+    try:
+        created = db.insert(table, [document], {})[0]
+        if items:
+            db.insert("line_items", line_item_rows(parent, created["id"], items), {})
+    except PostgrestError:
+        db.tables = snapshot
+        raise
+    return created | {"line_items": stored_line_items(db, parent, created["id"])}
+
+
+def update_document(db, args):
+    table, document_id = args.get("table_name"), args.get("document_id")
+    changes, items = args.get("changes") or {}, args.get("items")
+    if table not in ("companies", *PARENT_COLUMNS):
+        raise PostgrestError(400, "P0001", f"update_document: unknown table {table}")
+    parent = PARENT_COLUMNS.get(table)
+    if items is not None and parent is None:
+        raise PostgrestError(400, "P0001", f"update_document: {table} have no line items")
+    if not changes:
+        raise PostgrestError(400, "P0001", "update_document: no changes")
+
+    # One transaction: undo every table if any step fails
+    snapshot = db.snapshot()
+    try:
+        updated = db.update(table, changes, [("id", f"eq.{document_id}")])
+        if not updated or parent is None:
+            return updated[0] if updated else None
+        if items is not None:
+            db.delete("line_items", [(parent, f"eq.{document_id}")])
+            if items:
+                db.insert("line_items", line_item_rows(parent, document_id, items), {})
+    except PostgrestError:
+        db.tables = snapshot
+        raise
+    return updated[0] | {"line_items": stored_line_items(db, parent, document_id)}
+
+
+def update_documents(db, args):
+    table, results = args.get("table_name"), []
+    for entry in args.get("updates") or []:
+        try:
+            updated = update_document(db, {
+                "table_name": table, "document_id": entry.get("id"),
+                "changes": entry.get("changes"), "items": entry.get("items"),
+            })
+        except PostgrestError as error:
+            results.append({"id": entry.get("id"), "error": error.message, "code": error.code})
+        else:
+            results.append({"id": entry.get("id"), "found": updated is not None})
+    return results
+
+
+FUNCTIONS = {
+    "dashboard_summary": dashboard_summary,
+    "convert_quote": convert_quote,
+    "create_document": create_document,
+    "update_document": update_document,
+    "update_documents": update_documents,
+}
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+class FakeDatabase:
+    """Thread-safe in-memory tables with PostgREST query semantics"""
+
+    RESERVED_PARAMS = {"select", "order", "limit", "offset", "columns", "on_conflict"}
+
+    def __init__(self, schema=None):
+        self.schema = schema or build_schema()
+        self.lock = threading.RLock()
+        self.functions = dict(FUNCTIONS)
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tables = {name: {} for name in self.schema}
+
+    # -- helpers ------------------------------------------------------------
+
+    def table_schema(self, table):
+        if table not in self.schema:
+            raise PostgrestError(404, "42P01", f'relation "public.{table}" does not exist')
+        return self.schema[table]
+
+    def key_of(self, table, row):
+        return tuple(row.get(column) for column in self.schema[table]["primary_key"])
+
+    def prepare_row(self, table, values, existing=None):
+        definition = self.table_schema(table)
+        columns = definition["columns"]
+        for column in values:
+            if column not in columns:
+                raise PostgrestError(
+                    400, "PGRST204", f"Could not find the '{column}' column of '{table}' in the schema cache"
+                )
+            if column in definition["generated"]:
+                raise PostgrestError(400, "428C9", f'column "{column}" can only be updated to DEFAULT')
+        if existing is None:
+            row = {}
+            for column, default in columns.items():
+                row[column] = copy.deepcopy(default() if callable(default) else default)
+        else:
+            row = dict(existing)
+        row.update(copy.deepcopy(values))
+        for column, compute in definition["generated"].items():
+            row[column] = compute(row)
+        return row
+
+    def check_constraints(self, table, row, ignore_key=None):
+        definition = self.schema[table]
+        for column, (target, target_column, _) in definition["foreign_keys"].items():
+            value = row.get(column)
+            if value is None:
+                continue
+            if not any(other.get(target_column) == value for other in self.tables[target].values()):
+                raise PostgrestError(
+                    409, "23503",
+                    f'insert or update on table "{table}" violates foreign key constraint "{table}_{column}_fkey"',
+                    f'Key ({column})=({value}) is not present in table "{target}".',
+                )
+        for columns in definition["unique"]:
+            values = tuple(row.get(column) for column in columns)
+            if any(v is None for v in values):
+                continue
+            for key, other in self.tables[table].items():
+                if key != ignore_key and tuple(other.get(column) for column in columns) == values:
+                    raise PostgrestError(
+                        409, "23505",
+                        f'duplicate key value violates unique constraint "{table}_{"_".join(columns)}_key"',
+                    )
+
+    def relation(self, table, name):
+        """Resolve an embedded resource name to (target, local column, remote column, many)"""
+        definition = self.table_schema(table)
+        for column, (target, target_column, _) in definition["foreign_keys"].items():
+            if target == name:
+                return name, column, target_column, False
+        if name in self.schema:
+            for column, (target, target_column, _) in self.schema[name]["foreign_keys"].items():
+                if target == table:
+                    return name, target_column, column, True
+        raise PostgrestError(
+            400, "PGRST200",
+            f"Could not find a relationship between '{table}' and '{name}' in the schema cache",
+        )
+
+    def filter_rows(self, table, params):
+        rows = list(self.tables[table].values())
+        for key, value in params:
+            if key in self.RESERVED_PARAMS or "." in key:
+                continue
+            if key in ("or", "and"):
+                node = ("group", key, parse_logic(value), False)
+            elif key in ("not.or", "not.and"):
+                node = ("group", key[4:], parse_logic(value), True)
+            else:
+                if key not in self.schema[table]["columns"]:
+                    raise PostgrestError(400, "42703", f"column {table}.{key} does not exist")
+                node = parse_condition(key, value)
+            rows = [row for row in rows if evaluate_condition(row, node)]
+        return rows
+
+    def sort_rows(self, rows, order_text):
+        for column, descending, nulls_first in reversed(parse_order(order_text)):
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=descending)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def project(self, table, row, nodes, params, path=""):
+        result = {}
+        for kind, alias, name, children, _ in nodes:
+            if kind == "column":
+                if name == "*":
+                    result.update(copy.deepcopy(row))
+                elif name == "count" and path:
+                    continue
+                else:
+                    if name not in self.schema[table]["columns"]:
+                        raise PostgrestError(400, "42703", f"column {table}.{name} does not exist")
+                    result[alias or name] = copy.deepcopy(row.get(name))
+                continue
+
+            target, local, remote, many = self.relation(table, name)
+            key = row.get(local)
+            related = [other for other in self.tables[target].values() if key is not None and other.get(remote) == key]
+            child_path = f"{path}{name}."
+            if many:
+                if [c for c in children if c[0] == "column" and c[2] == "count"] and len(children) == 1:
+                    result[alias or name] = [{"count": len(related)}]
+                    continue
+                embedded_params = [(k[len(child_path):], v) for k, v in params if k.startswith(child_path)]
+                related = self.apply_modifiers(target, related, embedded_params)
+                result[alias or name] = [self.project(target, other, children, params, child_path) for other in related]
+            else:
+                result[alias or name] = self.project(target, related[0], children, params, child_path) if related else None
+        return result
+
+    def apply_modifiers(self, table, rows, params):
+        filters = [(k, v) for k, v in params if k not in ("order", "limit", "offset")]
+        if filters:
+            keys = {id(row) for row in self.filter_rows_from(table, rows, filters)}
+            rows = [row for row in rows if id(row) in keys]
+        lookup = dict(params)
+        if "order" in lookup:
+            rows = self.sort_rows(rows, lookup["order"])
+        offset = int(lookup.get("offset", 0))
+        rows = rows[offset:]
+        if "limit" in lookup:
+            rows = rows[:int(lookup["limit"])]
+        return rows
+
+    def filter_rows_from(self, table, rows, params):
+        original = self.tables[table]
+        try:
+            self.tables[table] = {i: row for i, row in enumerate(rows)}
+            return self.filter_rows(table, params)
+        finally:
+            self.tables[table] = original
+
+    # -- operations ---------------------------------------------------------
+
+    def select(self, table, params):
+        with self.lock:
+            self.table_schema(table)
+            lookup = dict(params)
+            rows = self.filter_rows(table, params)
+            total = len(rows)
+            rows = self.apply_modifiers(table, rows, [(k, v) for k, v in params if k in ("order", "limit", "offset")])
+            nodes = parse_select(lookup.get("select", "*"))
+            return [self.project(table, row, nodes, params) for row in rows], total
+
+    def insert(self, table, payload, params, upsert=None):
+        with self.lock:
+            definition = self.table_schema(table)
+            records = payload if isinstance(payload, list) else [payload]
+            conflict_columns = tuple(
+                c.strip() for c in dict(params).get("on_conflict", ",".join(definition["primary_key"])).split(",")
+            )
+            staged = dict(self.tables[table])
+            written = []
+            original = self.tables[table]
+            # Triggers advance the sequences; a failed insert rolls them back too
+            triggers = definition.get("before_insert", [])
+            sequences = copy.deepcopy(self.tables["document_sequences"]) if triggers else None
+            try:
+                self.tables[table] = staged
+                for values in records:
+                    match = None
+                    if upsert:
+                        target = tuple(values.get(column) for column in conflict_columns)
+                        match = next(
+                            (key for key, row in staged.items()
+                             if tuple(row.get(column) for column in conflict_columns) == target),
+                            None,
+                        )
+                    if match is not None:
+                        if upsert == "ignore-duplicates":
+                            continue
+                        row = self.prepare_row(table, values, staged[match])
+                        self.check_constraints(table, row, ignore_key=match)
+                        del staged[match]
+                    else:
+                        row = self.prepare_row(table, values)
+                        for trigger in triggers:
+                            trigger(self, table, row)
+                        self.check_constraints(table, row)
+                    key = self.key_of(table, row)
+                    if key in staged:
+                        raise PostgrestError(
+                            409, "23505", f'duplicate key value violates unique constraint "{table}_pkey"'
+                        )
+                    staged[key] = row
+                    written.append(row)
+            except PostgrestError:
+                self.tables[table] = original
+                if triggers:
+                    self.tables["document_sequences"] = sequences
+                raise
+            nodes = parse_select(dict(params).get("select", "*"))
+            return [self.project(table, row, nodes, params) for row in written]
+
+    def update(self, table, values, params):
+        with self.lock:
+            self.table_schema(table)
+            matched = self.filter_rows(table, params)
+            staged = dict(self.tables[table])
+            original = self.tables[table]
+            written = []
+            try:
+                self.tables[table] = staged
+                for current in matched:
+                    key = self.key_of(table, current)
+                    row = self.prepare_row(table, values, current)
+                    self.check_constraints(table, row, ignore_key=key)
+                    del staged[key]
+                    staged[self.key_of(table, row)] = row
+                    written.append(row)
+            except PostgrestError:
+                self.tables[table] = original
+                raise
+            nodes = parse_select(dict(params).get("select", "*"))
+            return [self.project(table, row, nodes, params) for row in written]
+
+    def delete(self, table, params):
+        with self.lock:
+            self.table_schema(table)
+            matched = self.filter_rows(table, params)
+            nodes = parse_select(dict(params).get("select", "*"))
+            deleted = [self.project(table, row, nodes, params) for row in matched]
+            for row in matched:
+                self.tables[table].pop(self.key_of(table, row), None)
+                self.cascade(table, row)
+            return deleted
+
+    def cascade(self, table, row):
+        for other, definition in self.schema.items():
+            for column, (target, target_column, action) in definition["foreign_keys"].items():
+                if target != table:
+                    continue
+                value = row.get(target_column)
+                for key, child in list(self.tables[other].items()):
+                    if child.get(column) != value:
+                        continue
+                    if action == "cascade":
+                        del self.tables[other][key]
+                        self.cascade(other, child)
+                    else:
+                        child[column] = None
+
+    def snapshot(self):
+        """Tables as they are now, for a function to restore if it fails;
+        triggers update sequence rows in place, so those are copied too"""
+        tables = {name: dict(rows) for name, rows in self.tables.items()}
+        tables["document_sequences"] = copy.deepcopy(self.tables["document_sequences"])
+        return tables
+
+    def call(self, name, args):
+        with self.lock:
+            if name not in self.functions:
+                raise PostgrestError(
+                    404, "PGRST202", f"Could not find the function public.{name} in the schema cache"
+                )
+            return self.functions[name](self, args or {})
+
+    def seed(self, table, rows):
+        """Bulk-load rows directly, bypassing constraint checks"""
+        with self.lock:
+            for values in rows:
+                row = self.prepare_row(table, values)
+                self.tables[table][self.key_of(table, row)] = row
+
+
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakePostgREST/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_HEAD(self):
+        self.dispatch("HEAD")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def prefer(self):
+        preferences = {}
+        for part in (self.headers.get("Prefer") or "").split(","):
+            key, _, value = part.strip().partition("=")
+            if key:
+                preferences[key] = value
+        return preferences
+
+    def send_json(self, status, payload, headers=None):
+        body = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD" and body:
+            self.wfile.write(body)
+
+    def dispatch(self, method):
+        self.server.apply_latency()
+        if len(self.path) > MAX_URL_LENGTH:
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            error = PostgrestError(414, "PGRST000", "Request-URI Too Long")
+            self.send_json(error.status, error.to_json())
+            return
+        try:
+            body = self.read_body() if method in ("POST", "PATCH") else None
+            status, payload, headers = self.handle_rest(method, body)
+        except PostgrestError as error:
+            status, payload, headers = error.status, error.to_json(), {}
+        except (ValueError, json.JSONDecodeError) as error:
+            status, payload, headers = 400, PostgrestError(400, "PGRST102", str(error)).to_json(), {}
+        self.send_json(status, payload, headers)
+
+    def handle_rest(self, method, body):
+        parts = urlsplit(self.path)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        segments = [s for s in parts.path.split("/") if s]
+        if segments[:2] != ["rest", "v1"] or len(segments) < 3:
+            raise PostgrestError(404, "PGRST125", f"Invalid path specified in request URL: {parts.path}")
+
+        database = self.server.database
+        prefer = self.prefer()
+        single = OBJECT_MEDIA_TYPE in (self.headers.get("Accept") or "")
+
+        if segments[2] == "rpc" and len(segments) == 4:
+            args = body if method == "POST" else dict(params)
+            return 200, database.call(segments[3], args), {}
+
+        table = segments[2]
+        headers = {}
+        if method in ("GET", "HEAD"):
+            rows, total = database.select(table, params)
+            if "count" in prefer:
+                end = len(rows) - 1
+                headers["Content-Range"] = f"0-{end}/{total}" if rows else f"*/{total}"
+            status = 200
+        elif method == "POST":
+            resolution = prefer.get("resolution")
+            rows = database.insert(table, body, params, upsert=resolution)
+            status = 201
+        elif method == "PATCH":
+            rows = database.update(table, body or {}, params)
+            status = 200
+        else:
+            rows = database.delete(table, params)
+            status = 200
+
+        if method not in ("GET", "HEAD") and prefer.get("return") != "representation":
+            return (201 if method == "POST" else 204), None, headers
+
+        if single:
+            if len(rows) != 1:
+                raise PostgrestError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(rows)} rows",
+                )
+            return status, rows[0], headers
+        return status, rows, headers
+
+
+class FakePostgrestServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, database, latency=0.0, jitter=0.0, verbose=False):
+        super().__init__(address, PostgrestHandler)
+        self.database = database
+        self.latency = latency
+        self.jitter = jitter
+        self.verbose = verbose
+
+    def apply_latency(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FakePostgrest:
+    """Runs the fake backend on a background thread
+
+    >>> with FakePostgrest(latency=0.005) as backend:
+    ...     os.environ["NEXT_PUBLIC_SUPABASE_URL"] = backend.url
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, verbose=False):
+        self.database = FakeDatabase()
+        self.server = FakePostgrestServer((host, port), self.database, latency, jitter, verbose)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def latency(self):
+        return self.server.latency
+
+    @latency.setter
+    def latency(self, seconds):
+        self.server.latency = seconds
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake-postgrest", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake Supabase REST backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="injected latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency per request")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    backend = FakePostgrest(args.host, args.port, args.latency_ms / 1000.0, args.jitter_ms / 1000.0, args.verbose)
+    print(f"🧪 Fake PostgREST listening on {backend.url} (latency={args.latency_ms}ms, jitter={args.jitter_ms}ms)")
+    try:
+        backend.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
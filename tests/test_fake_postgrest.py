@@ -0,0 +1,357 @@
+"""
+Checks that the fake PostgREST backend answers the request shapes supabase-js
+produces for the queries in app/api/[[...path]]/route.js
+"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+
+import pytest
+
+from tests.fake_postgrest import OBJECT_MEDIA_TYPE, FakePostgrest
+
+COMPANY = {
+    "id": "c1",
+    "name": "Acme Corporation Ltd",
+    "logo": "data:image/png;base64,AAAA",
+    "createdAt": "2025-01-01T00:00:00.000Z",
+    "updatedAt": "2025-01-01T00:00:00.000Z",
+}
+
+
+@pytest.fixture
+def backend():
+    with FakePostgrest() as server:
+        yield server
+
+
+def call(backend, method, table, params=None, body=None, headers=None):
+    url = f"{backend.url}/rest/v1/{table}"
+    if params:
+        url += "?" + urlencode(params)
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+    if data is not None:
+        request.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(request) as response:
+            raw = response.read()
+            return response.status, json.loads(raw) if raw else None, response.headers
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read()), error.headers
+
+
+def insert(backend, table, rows):
+    return call(backend, "POST", table, {"select": "*"}, rows, {"Prefer": "return=representation"})
+
+
+def quote(quote_id, created_at, **extra):
+    row = {
+        "id": quote_id,
+        "companyId": "c1",
+        "quoteNumber": f"Q-{quote_id}",
+        "createdAt": created_at,
+        "updatedAt": created_at,
+    }
+    row.update(extra)
+    return row
+
+
+def test_insert_returns_representation_with_defaults(backend):
+    status, rows, _ = insert(backend, "companies", [COMPANY])
+    assert status == 201
+    assert rows[0]["name"] == "Acme Corporation Ltd"
+    assert rows[0]["address"] == ""
+
+
+def test_single_object_and_missing_row(backend):
+    insert(backend, "companies", [COMPANY])
+    accept = {"Accept": OBJECT_MEDIA_TYPE}
+    status, row, _ = call(backend, "GET", "companies", {"select": "*", "id": "eq.c1"}, headers=accept)
+    assert status == 200 and row["id"] == "c1"
+
+    status, error, _ = call(backend, "GET", "companies", {"select": "*", "id": "eq.nope"}, headers=accept)
+    assert status == 406 and error["code"] == "PGRST116"
+
+
+def test_embedded_join_and_order(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [
+        quote("q1", "2025-01-01T00:00:00.000Z"),
+        quote("q2", "2025-01-02T00:00:00.000Z"),
+    ])
+    status, rows, _ = call(backend, "GET", "quotes", {
+        "select": "*,companies(id,name,logo)",
+        "order": "createdAt.desc",
+    })
+    assert status == 200
+    assert [row["id"] for row in rows] == ["q2", "q1"]
+    assert rows[0]["companies"] == {"id": "c1", "name": "Acme Corporation Ltd", "logo": COMPANY["logo"]}
+
+
+def test_or_filter_for_keyset_cursor(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [
+        quote("a", "2025-01-01T00:00:00.000Z"),
+        quote("b", "2025-01-02T00:00:00.000Z"),
+        quote("c", "2025-01-02T00:00:00.000Z"),
+    ])
+    status, rows, _ = call(backend, "GET", "quotes", {
+        "select": "id",
+        "or": '(createdAt.lt."2025-01-02T00:00:00.000Z",and(createdAt.eq."2025-01-02T00:00:00.000Z",id.lt.c))',
+        "order": "createdAt.desc,id.desc",
+        "limit": "5",
+    })
+    assert status == 200
+    assert [row["id"] for row in rows] == ["b", "a"]
+
+
+def test_list_filters_and_counts(backend):
+    insert(backend, "companies", [COMPANY, dict(COMPANY, id="c2", name="Other")])
+    insert(backend, "quotes", [
+        quote("a", "2025-01-01T00:00:00.000Z", billTo="Acme Trading", totalAmount=50),
+        quote("b", "2025-01-02T00:00:00.000Z", billTo="Globex", totalAmount=500),
+        quote("c", "2025-01-03T00:00:00.000Z", billTo="acme labs", totalAmount=900),
+    ])
+    _, rows, _ = call(backend, "GET", "quotes", {
+        "select": "id",
+        "or": '(billTo.ilike."*ACME*",quoteNumber.ilike."*ACME*")',
+        "totalAmount": "gte.100",
+        "createdAt": "lt.2025-01-04T00:00:00.000Z",
+    })
+    assert [row["id"] for row in rows] == ["c"]
+
+    _, rows, _ = call(backend, "GET", "companies", {
+        "select": "id,quotes(count),purchase_orders(count)",
+        "order": "id.asc",
+    })
+    assert rows == [
+        {"id": "c1", "quotes": [{"count": 3}], "purchase_orders": [{"count": 0}]},
+        {"id": "c2", "quotes": [{"count": 0}], "purchase_orders": [{"count": 0}]},
+    ]
+
+
+def test_update_and_delete(backend):
+    insert(backend, "companies", [COMPANY])
+    status, rows, _ = call(backend, "PATCH", "companies", {"id": "eq.c1", "select": "*"},
+                           {"phone": "+1-555-987-6543"}, {"Prefer": "return=representation"})
+    assert status == 200 and rows[0]["phone"] == "+1-555-987-6543"
+
+    status, body, _ = call(backend, "DELETE", "companies", {"id": "eq.c1"})
+    assert status == 204 and body is None
+    assert call(backend, "GET", "companies", {"select": "*"})[1] == []
+
+
+def test_unknown_column_and_foreign_key_errors(backend):
+    status, error, _ = insert(backend, "companies", [dict(COMPANY, companies={"id": "x"})])
+    assert status == 400 and error["code"] == "PGRST204"
+
+    status, error, _ = insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z", companyId="missing")])
+    assert status == 409 and error["code"] == "23503"
+
+
+def test_delete_company_cascades(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z")])
+    call(backend, "DELETE", "companies", {"id": "eq.c1"})
+    assert call(backend, "GET", "quotes", {"select": "id"})[1] == []
+
+
+def test_document_numbers_per_company_sequence(backend):
+    insert(backend, "companies", [COMPANY, dict(COMPANY, id="c2")])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z", quoteNumber="Q-000002")])
+    status, rows, _ = insert(backend, "quotes", [
+        quote("q2", "2025-01-02T00:00:00.000Z", quoteNumber=None),
+        quote("q3", "2025-01-03T00:00:00.000Z", quoteNumber=""),
+        quote("q4", "2025-01-04T00:00:00.000Z", quoteNumber=None, companyId="c2"),
+    ])
+    assert status == 201
+    # Numbers taken by hand are skipped; each company has its own sequence
+    assert [row["quoteNumber"] for row in rows] == ["Q-000001", "Q-000003", "Q-000001"]
+
+    # A failed insert rolls the sequence back, so numbering stays gapless
+    status, error, _ = insert(backend, "quotes", [
+        quote("q5", "2025-01-05T00:00:00.000Z", quoteNumber=None),
+        quote("q1", "2025-01-05T00:00:00.000Z", quoteNumber=None),
+    ])
+    assert status == 409 and error["code"] == "23505"
+    status, rows, _ = insert(backend, "quotes", [quote("q5", "2025-01-05T00:00:00.000Z", quoteNumber=None)])
+    assert rows[0]["quoteNumber"] == "Q-000004"
+
+    status, error, _ = insert(backend, "quotes", [quote("q6", "2025-01-06T00:00:00.000Z", quoteNumber="Q-000004")])
+    assert status == 409 and error["code"] == "23505"
+
+
+def test_convert_quote_rpc_is_idempotent(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z", totalAmount=105, billTo="Globex")])
+    insert(backend, "line_items", [
+        {"quoteId": "q1", "position": 0, "description": "Widget", "quantity": 2, "price": 50, "total": 100},
+    ])
+
+    status, result, _ = call(backend, "POST", "rpc/convert_quote", body={"quote_id": "q1", "po_id": "po1"})
+    assert status == 200 and result == {"created": True, "id": "po1"}
+    status, result, _ = call(backend, "POST", "rpc/convert_quote", body={"quote_id": "q1", "po_id": "po2"})
+    assert result == {"created": False, "id": "po1"}
+
+    rows = call(backend, "GET", "purchase_orders", {"select": "id,quoteId,poNumber,billTo,totalAmount,line_items(description)"})[1]
+    assert rows == [{
+        "id": "po1", "quoteId": "q1", "poNumber": "PO-000001", "billTo": "Globex", "totalAmount": 105,
+        "line_items": [{"description": "Widget"}],
+    }]
+    assert call(backend, "POST", "rpc/convert_quote", body={"quote_id": "missing", "po_id": "po3"})[1] is None
+
+    # Deleting the purchase order frees the quote to be converted again
+    call(backend, "DELETE", "purchase_orders", {"id": "eq.po1"})
+    assert call(backend, "POST", "rpc/convert_quote", body={"quote_id": "q1", "po_id": "po4"})[1]["created"] is True
+
+
+def test_create_document_rpc_is_atomic(backend):
+    insert(backend, "companies", [COMPANY])
+    item = {"position": 0, "description": "Widget", "quantity": 2, "price": 50, "total": 100, "attributes": {}}
+    document = {"id": "q1", "companyId": "c1", "quoteNumber": None, "createdAt": "2025-01-01T00:00:00.000Z"}
+
+    status, row, _ = call(backend, "POST", "rpc/create_document", body={
+        "table_name": "quotes", "document": document, "items": [item],
+    })
+    assert status == 200
+    assert row["quoteNumber"] == "Q-000001" and row["line_items"] == [item]
+
+    # Two items in one position fail the insert, and the document with them
+    status, error, _ = call(backend, "POST", "rpc/create_document", body={
+        "table_name": "quotes", "document": dict(document, id="q2"), "items": [item, item],
+    })
+    assert status == 409 and error["code"] == "23505"
+    assert call(backend, "GET", "quotes", {"select": "id"})[1] == [{"id": "q1"}]
+    assert len(call(backend, "GET", "line_items", {"select": "position"})[1]) == 1
+    # The failed insert gave its number back
+    status, row, _ = call(backend, "POST", "rpc/create_document", body={
+        "table_name": "quotes", "document": dict(document, id="q3"), "items": [],
+    })
+    assert row["quoteNumber"] == "Q-000002" and row["line_items"] == []
+
+
+def test_update_document_rpc_is_atomic(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z"), quote("q2", "2025-01-02T00:00:00.000Z")])
+    insert(backend, "line_items", [
+        {"quoteId": "q1", "position": 0, "description": "Widget", "quantity": 2, "price": 50, "total": 100},
+    ])
+    item = {"position": 0, "description": "Gadget", "quantity": 1, "price": 10, "total": 10, "attributes": {}}
+
+    status, row, _ = call(backend, "POST", "rpc/update_document", body={
+        "table_name": "quotes", "document_id": "q1", "changes": {"billTo": "Globex"}, "items": [item],
+    })
+    assert status == 200 and row["billTo"] == "Globex" and row["line_items"] == [item]
+
+    # A duplicate number fails the update and keeps the old items
+    status, error, _ = call(backend, "POST", "rpc/update_document", body={
+        "table_name": "quotes", "document_id": "q1", "changes": {"quoteNumber": "Q-q2"},
+        "items": [dict(item, description="Lost")],
+    })
+    assert status == 409 and error["code"] == "23505"
+    rows = call(backend, "GET", "quotes", {"id": "eq.q1", "select": "quoteNumber,line_items(description)"})[1]
+    assert rows == [{"quoteNumber": "Q-q1", "line_items": [{"description": "Gadget"}]}]
+
+    # Without items only the row changes
+    status, row, _ = call(backend, "POST", "rpc/update_document", body={
+        "table_name": "quotes", "document_id": "q1", "changes": {"notes": "Rush"},
+    })
+    assert row["notes"] == "Rush" and row["line_items"] == [item]
+    assert call(backend, "POST", "rpc/update_document", body={
+        "table_name": "quotes", "document_id": "missing", "changes": {"notes": "Rush"}, "items": [],
+    })[1] is None
+
+
+def test_update_documents_rpc_reports_each_row(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z"), quote("q2", "2025-01-02T00:00:00.000Z")])
+
+    status, results, _ = call(backend, "POST", "rpc/update_documents", body={"table_name": "quotes", "updates": [
+        {"id": "q1", "changes": {"quoteNumber": "Q-q2"}},
+        {"id": "q2", "changes": {"notes": "Rush"}},
+        {"id": "missing", "changes": {"notes": "Rush"}},
+    ]})
+    assert status == 200
+    assert results[0]["id"] == "q1" and results[0]["code"] == "23505"
+    assert results[1:] == [{"id": "q2", "found": True}, {"id": "missing", "found": False}]
+    rows = call(backend, "GET", "quotes", {"select": "id,quoteNumber,notes", "order": "id"})[1]
+    assert [(row["quoteNumber"], row["notes"]) for row in rows] == [("Q-q1", ""), ("Q-q2", "Rush")]
+
+
+def test_upsert_ignore_duplicates(backend):
+    asset = {"hash": "ab" * 32, "mimeType": "image/png", "data": "AAAA", "size": 3}
+    headers = {"Prefer": "resolution=ignore-duplicates,return=representation"}
+    params = {"on_conflict": "hash", "select": "*"}
+    assert call(backend, "POST", "assets", params, [asset], headers)[1] == [asset | {"createdAt": None}]
+    status, rows, _ = call(backend, "POST", "assets", params, [dict(asset, size=99)], headers)
+    assert status == 201 and rows == []
+    assert call(backend, "GET", "assets", {"select": "size"})[1] == [{"size": 3}]
+
+
+def test_dashboard_summary_rpc(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z", totalAmount=105, vatAmount=5)])
+    insert(backend, "purchase_orders", [
+        {"id": "p1", "companyId": "c1", "poNumber": "PO-1", "totalAmount": 40, "status": "approved"},
+        {"id": "p2", "companyId": "c1", "poNumber": "PO-2", "totalAmount": 60},
+    ])
+    status, summary, _ = call(backend, "POST", "rpc/dashboard_summary", body={})
+    assert status == 200
+    assert summary["totals"] == {"companies": 1, "quotes": 1, "purchaseOrders": 2}
+    assert summary["quotes"] == {"totalAmount": 105, "vatAmount": 5}
+    assert summary["purchaseOrders"]["byStatus"] == {"approved": 1, "pending": 1}
+    assert summary["companies"][0]["purchaseOrderAmount"] == 100
+
+
+def test_long_urls_rejected(backend):
+    ids = ",".join(f"01HZXQ{index:020d}" for index in range(1000))
+    assert call(backend, "GET", "quotes", {"id": f"in.({ids})", "select": "id"})[0] == 414
+
+
+def test_injected_latency(backend):
+    backend.latency = 0.05
+    started = time.perf_counter()
+    call(backend, "GET", "companies", {"select": "*"})
+    assert time.perf_counter() - started >= 0.05
+
+
+def test_line_items_embed_and_cascade(backend):
+    insert(backend, "companies", [COMPANY])
+    insert(backend, "quotes", [quote("q1", "2025-01-01T00:00:00.000Z")])
+    status, rows, _ = insert(backend, "line_items", [
+        {"quoteId": "q1", "position": 1, "description": "Second", "quantity": 2},
+        {"quoteId": "q1", "position": 0, "description": "First", "quantity": 1},
+    ])
+    assert status == 201 and rows[0]["id"] != rows[1]["id"] and rows[0]["attributes"] == {}
+
+    status, error, _ = insert(backend, "line_items", [{"quoteId": "q1", "position": 0}])
+    assert status == 409 and error["code"] == "23505"
+
+    _, rows, _ = call(backend, "GET", "quotes", {
+        "select": "id,line_items(position,description)",
+        "line_items.order": "position.asc",
+    })
+    assert rows[0]["line_items"] == [
+        {"position": 0, "description": "First"},
+        {"position": 1, "description": "Second"},
+    ]
+
+    call(backend, "DELETE", "quotes", {"id": "eq.q1"})
+    assert call(backend, "GET", "line_items", {"select": "id"})[1] == []
+
+
+def test_generated_logo_hash(backend):
+    _, rows, _ = insert(backend, "companies", [COMPANY])
+    assert rows[0]["logoHash"] is None
+
+    asset = "/api/assets/" + "ab" * 32
+    _, rows, _ = call(backend, "PATCH", "companies", {"id": "eq.c1", "select": "*"},
+                      {"logo": asset}, {"Prefer": "return=representation"})
+    assert rows[0]["logoHash"] == "ab" * 32
+
+    status, error, _ = call(backend, "PATCH", "companies", {"id": "eq.c1"}, {"logoHash": "x"})
+    assert status == 400 and error["code"] == "428C9"